@@ -1,10 +1,25 @@
+import time
+
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from app.db.session import get_db
+from app.db.session import get_async_db
 
 router = APIRouter(prefix="/health", tags=["Health"])
 
+# Liveness probes within this window reuse the last database check
+HEALTH_CACHE_TTL_SECONDS = 2.0
+_LAST_CHECK = {"ts": 0.0, "database": "ok"}
+
+
+async def _check_database(db: AsyncSession) -> str:
+    try:
+        await db.execute(text("SELECT 1"))
+        return "ok"
+    except Exception:
+        return "error"
+
 
 @router.get(
     "",
@@ -12,22 +27,38 @@ router = APIRouter(prefix="/health", tags=["Health"])
     description="Veritabanı bağlantısı dahil sistem durumunu kontrol eder",
     response_description="Sistem ve veritabanı durum bilgisi"
 )
-def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_async_db)):
     """
     Sistem sağlık kontrolü endpoint'i.
     
-    Veritabanı bağlantısını test eder ve sistem durumunu döndürür.
+    Veritabanı durumu en fazla HEALTH_CACHE_TTL_SECONDS saniye önbellekte tutulur;
+    sık gelen probe istekleri veritabanına yük bindirmez.
     """
-    try:
-        # Check database connection
-        db.execute(text("SELECT 1"))
-        db_status = "ok"
-    except Exception:
-        db_status = "error"
+    now = time.monotonic()
+    if now - _LAST_CHECK["ts"] >= HEALTH_CACHE_TTL_SECONDS:
+        _LAST_CHECK["database"] = await _check_database(db)
+        _LAST_CHECK["ts"] = now
     
     return {
         "status": "ok",
-        "database": db_status
+        "database": _LAST_CHECK["database"]
     }
 
 
+@router.get(
+    "/readyz",
+    summary="Hazırlık Kontrolü",
+    description="Her çağrıda veritabanını kontrol eder (Kubernetes readiness probe)",
+    response_description="Veritabanı erişilemezse 503 döner"
+)
+async def readiness_check(db: AsyncSession = Depends(get_async_db)):
+    """
+    Hazırlık (readiness) kontrolü endpoint'i.
+    
+    Önbellek kullanmaz; veritabanına erişilemiyorsa 503 döndürür.
+    """
+    db_status = await _check_database(db)
+    return ORJSONResponse(
+        status_code=200 if db_status == "ok" else 503,
+        content={"status": "ok" if db_status == "ok" else "unavailable", "database": db_status},
+    )
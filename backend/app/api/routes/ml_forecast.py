@@ -1,146 +1,279 @@
 """ML-based forecast endpoints"""
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import bindparam, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
+import time
 from typing import Optional
 from pathlib import Path
+import json
 
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal, get_async_db
 from app.models.crime_event import CrimeEvent
 from app.services.ml.sarimax_service import forecast_timeseries
 from app.services.ml.spatial_service import forecast_spatial_temporal
-from app.services.ml.spatial_features import create_spatial_features, temporal_feature_vector
+from app.services.ml.spatial_features import create_spatial_features, temporal_feature_rows
 from app.services.forecast.ensemble import ensemble_forecast
 from app.services.forecast.features import temporal_features
+from app.services.forecast.forecast_cache import get_forecast_cache, hour_floor, single_flight, time_bucket
+from app.services.ml.model_store import load_model, model_version
 import numpy as np
 
 router = APIRouter(prefix="/ml-forecast", tags=["ML Forecast"])
 
+SARIMAX_MODEL_PATH = Path("ml/models/sarimax_model.pkl")
+SPATIAL_MODEL_PATH = Path("ml/models/spatial_model.pkl")
+
+# Built once at import; asyncpg additionally caches the prepared statements
+# per connection, so the server-side plan is reused across requests.
+_NEARBY_EVENTS_SQL = text("""
+    SELECT
+        severity::real / 5.0 AS risk,
+        ST_Y(geom::geometry) AS lat,
+        ST_X(geom::geometry) AS lng
+    FROM crime_event
+    WHERE ST_DWithin(
+        geom,
+        ST_SetSRID(ST_MakePoint(:lng, :lat), 4326)::geography,
+        1000
+    )
+    ORDER BY event_time DESC
+    LIMIT 100
+""").bindparams(bindparam("lat"), bindparam("lng"))
+
+_NEARBY_EVENTS_BEFORE_SQL = text("""
+    SELECT
+        severity::real / 5.0 AS risk,
+        ST_Y(geom::geometry) AS lat,
+        ST_X(geom::geometry) AS lng
+    FROM crime_event
+    WHERE ST_DWithin(
+        geom,
+        ST_SetSRID(ST_MakePoint(:lng, :lat), 4326)::geography,
+        1000
+    )
+    AND event_time <= :start_time
+    ORDER BY event_time DESC
+    LIMIT 200
+""").bindparams(bindparam("lat"), bindparam("lng"), bindparam("start_time"))
+
+
+def _nearby_event_arrays(rows):
+    """Convert (risk, lat, lng) rows to coordinate (Nx2) and risk (N) arrays."""
+    n = len(rows)
+    coordinates = np.empty((n, 2), dtype=np.float64)
+    risk = np.empty(n, dtype=np.float32)
+    if n:
+        # Transpose once at C level, then fill the preallocated column buffers
+        risk_col, lat_col, lng_col = zip(*rows)
+        risk[:] = risk_col
+        coordinates[:, 0] = lat_col
+        coordinates[:, 1] = lng_col
+    return coordinates, risk
+
+
+def _summarize_forecast(forecast: np.ndarray, n_events: int):
+    """Return (mean forecast, confidence) using array methods, no ufunc dispatch."""
+    mean = float(forecast.sum()) / forecast.size if forecast.size else 0.0
+    return mean, min(1.0, n_events / 10.0)
+
+
+# model path -> ((mtime, size), (grid_size, bounds))
+_META_CACHE: dict = {}
+
+
 def _load_spatial_model_metadata(model_path: Path):
-    if not model_path.exists():
+    """Return (grid_size, bounds) for the spatial model, cached until the file changes."""
+    try:
+        stat = model_path.stat()
+    except OSError:
         return None, None
+    file_key = (stat.st_mtime, stat.st_size)
+    cached = _META_CACHE.get(model_path)
+    if cached is not None and cached[0] == file_key:
+        return cached[1]
+
     try:
-        import pickle
-        with open(model_path, 'rb') as f:
-            model_dict = pickle.load(f)
+        # Prefer the small JSON sidecar written at training time
+        meta_path = model_path.with_suffix('.meta.json')
+        if meta_path.exists():
+            model_dict = json.loads(meta_path.read_bytes())
+        else:
+            model_dict = load_model(model_path)
         grid_size = model_dict.get('grid_size')
         bounds = model_dict.get('spatial_bounds')
         if bounds and len(bounds) == 4:
             bounds = tuple(float(x) for x in bounds)
         else:
             bounds = None
-        return grid_size, bounds
+        metadata = (grid_size, bounds)
     except Exception:
         return None, None
 
+    _META_CACHE[model_path] = (file_key, metadata)
+    return metadata
+
 
 @router.get("/timeseries")
-def get_timeseries_forecast(
-    db: Session = Depends(get_db),
+async def get_timeseries_forecast(
+    db: AsyncSession = Depends(get_async_db),
     forecast_horizon: int = Query(24, ge=1, le=168, description="Hours to forecast ahead"),
     crime_type: Optional[str] = Query(None, description="Filter by crime type"),
 ):
     """Get time-series forecast using SARIMAX model"""
     
-    # Get historical data
-    query = db.query(CrimeEvent).order_by(CrimeEvent.event_time.desc()).limit(1000)
+    cache = get_forecast_cache()
+    cache_key = cache.make_key(
+        "timeseries",
+        crime_type,
+        forecast_horizon,
+        time_bucket(time.time()),
+        model_version(SARIMAX_MODEL_PATH),
+    )
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Get historical data (severity column only, no ORM hydration)
+    stmt = select(CrimeEvent.severity).order_by(CrimeEvent.event_time.desc()).limit(1000)
     if crime_type:
-        query = query.filter(CrimeEvent.crime_type == crime_type)
+        stmt = stmt.where(CrimeEvent.crime_type == crime_type)
     
-    events = query.all()
+    severities = (await db.execute(stmt)).scalars().all()
     
-    if not events:
+    if not severities:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No historical data available for forecasting"
         )
     
-    # Prepare historical data
-    historical_data = [
-        {
-            'risk_score': float(event.severity) / 5.0,  # Normalize to 0-1
-            'timestamp': event.event_time
-        }
-        for event in events
-    ]
+    # Risk scores normalized to 0-1 in a single vectorized divide
+    risk_scores = np.fromiter(severities, dtype=np.float32, count=len(severities)) / 5.0
     
-    # Forecast
-    model_path = Path("ml/models/sarimax_model.pkl")
-    forecast = forecast_timeseries(historical_data, forecast_horizon, model_path)
+    # Forecast (SARIMAX inference and first-call unpickle are CPU-bound: keep them off the event loop)
+    forecast = await run_in_threadpool(
+        forecast_timeseries, risk_scores, forecast_horizon, SARIMAX_MODEL_PATH
+    )
     
-    return {
+    result = {
         "forecast": forecast,
         "horizon_hours": forecast_horizon,
-        "historical_points": len(historical_data)
+        "historical_points": len(risk_scores)
     }
+    await cache.set(cache_key, result)
+    return result
+
+
+def _spatial_model_features(coordinates: np.ndarray, event_counts: np.ndarray, at_time: datetime):
+    """Spatial + temporal feature arrays for the spatial model (CPU-bound, call off the event loop)."""
+    grid_size, bounds = _load_spatial_model_metadata(SPATIAL_MODEL_PATH)
+    spatial_features = create_spatial_features(
+        coordinates,
+        event_counts,
+        grid_size=int(grid_size) if grid_size else 10,
+        bounds=bounds
+    )
+    temporal_features_array = temporal_feature_rows(at_time, len(spatial_features))
+    return spatial_features, temporal_features_array
+
+
+def _spatial_temporal_compute(coordinates: np.ndarray, event_counts: np.ndarray, forecast_time: datetime):
+    """Spatial-temporal model forecast for the given nearby events (sync, threadpool)."""
+    spatial_features, temporal_features_array = _spatial_model_features(
+        coordinates, event_counts, forecast_time
+    )
+    return forecast_spatial_temporal(
+        spatial_features,
+        temporal_features_array,
+        SPATIAL_MODEL_PATH
+    )
+
+
+def _ensemble_compute(
+    risk_scores: np.ndarray,
+    nearby_events,
+    lat: Optional[float],
+    lng: Optional[float],
+    start_time: datetime,
+):
+    """Ensemble forecast from already-fetched DB rows (sync, threadpool)."""
+    # KDE scores (simplified - would use actual KDE service)
+    kde_scores = risk_scores[:24].tolist()
+    
+    # Spatial features
+    if lat and lng:
+        if nearby_events:
+            coordinates, event_counts = _nearby_event_arrays(nearby_events)
+        else:
+            coordinates = np.array([[lat, lng]])
+            event_counts = np.array([0.0])
+        
+        spatial_features, temporal_features_array = _spatial_model_features(
+            coordinates, event_counts, start_time
+        )
+    else:
+        spatial_features = np.array([[0.0, 0.0]])
+        temporal_features_array = np.array([[0.0, 0.0, 0.0, 0.0]])
+    
+    return ensemble_forecast(
+        kde_scores,
+        risk_scores,
+        spatial_features,
+        temporal_features_array
+    )
 
 
 @router.get("/spatial-temporal")
-def get_spatial_temporal_forecast(
-    db: Session = Depends(get_db),
+async def get_spatial_temporal_forecast(
+    db: AsyncSession = Depends(get_async_db),
     lat: float = Query(..., description="Latitude"),
     lng: float = Query(..., description="Longitude"),
     forecast_time: datetime = Query(..., description="Time to forecast for"),
 ):
     """Get spatial-temporal forecast for a specific location and time"""
     
+    # Model only sees hour/day-of-week, so hourly key granularity is exact
+    cache = get_forecast_cache()
+    cache_key = cache.make_key(
+        "spatial_temporal",
+        round(lat, 4),
+        round(lng, 4),
+        hour_floor(forecast_time).isoformat(),
+        model_version(SPATIAL_MODEL_PATH),
+    )
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     # Get nearby events
-    from sqlalchemy import text
-    events = db.execute(
-        text("""
-            SELECT
-                severity,
-                event_time,
-                ST_Y(geom::geometry) AS lat,
-                ST_X(geom::geometry) AS lng
-            FROM crime_event
-            WHERE ST_DWithin(
-                geom,
-                ST_GeogFromText('POINT(:lng :lat)'),
-                1000
-            )
-            ORDER BY event_time DESC
-            LIMIT 100
-        """),
+    events = (await db.execute(
+        _NEARBY_EVENTS_SQL,
         {"lat": lat, "lng": lng}
-    ).fetchall()
+    )).all()
     
     if not events:
         return {"forecast": 0.0, "confidence": 0.0}
     
-    coordinates = np.array([[row.lat, row.lng] for row in events])
-    event_counts = np.array([float(row.severity) / 5.0 for row in events])
-    
-    model_path = Path("ml/models/spatial_model.pkl")
-    grid_size, bounds = _load_spatial_model_metadata(model_path)
-    spatial_features = create_spatial_features(
-        coordinates,
-        event_counts,
-        grid_size=int(grid_size) if grid_size else 10,
-        bounds=bounds
-    )
-    
-    temporal_features_array = temporal_feature_vector(forecast_time)
-    if len(spatial_features) > 1:
-        temporal_features_array = np.repeat(temporal_features_array, len(spatial_features), axis=0)
+    coordinates, event_counts = _nearby_event_arrays(events)
     
-    # Forecast
-    forecast = forecast_spatial_temporal(
-        spatial_features,
-        temporal_features_array,
-        model_path
+    # Feature building and model inference run in the threadpool
+    forecast = await run_in_threadpool(
+        _spatial_temporal_compute, coordinates, event_counts, forecast_time
     )
     
-    return {
-        "forecast": float(np.mean(forecast)) if len(forecast) > 0 else 0.0,
-        "confidence": min(1.0, len(events) / 10.0),
+    forecast_mean, confidence = _summarize_forecast(forecast, len(events))
+    result = {
+        "forecast": forecast_mean,
+        "confidence": confidence,
         "nearby_events": len(events)
     }
+    await cache.set(cache_key, result)
+    return result
 
 
 @router.get("/ensemble")
-def get_ensemble_forecast(
-    db: Session = Depends(get_db),
+async def get_ensemble_forecast(
     start_time: datetime = Query(..., description="Start of forecast window"),
     end_time: datetime = Query(..., description="End of forecast window"),
     lat: Optional[float] = Query(None, description="Latitude (optional)"),
@@ -148,83 +281,80 @@ def get_ensemble_forecast(
 ):
     """Get ensemble forecast combining KDE, SARIMAX, and spatial models"""
     
-    # Get historical data
-    events = db.query(CrimeEvent).filter(
-        CrimeEvent.event_time <= start_time
-    ).order_by(CrimeEvent.event_time.desc()).limit(1000).all()
+    cache = get_forecast_cache()
+    cache_key = cache.make_key(
+        "ensemble",
+        start_time.isoformat(),
+        end_time.isoformat(),
+        round(lat, 4) if lat is not None else None,
+        round(lng, 4) if lng is not None else None,
+        # The ensemble runs both models; retraining either must invalidate the entry
+        model_version(SARIMAX_MODEL_PATH),
+        model_version(SPATIAL_MODEL_PATH),
+    )
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        return cached
     
-    if not events:
+    # Concurrent identical requests share one computation
+    return await single_flight(
+        cache_key,
+        lambda: _compute_ensemble_forecast(cache_key, start_time, end_time, lat, lng),
+    )
+
+
+async def _compute_ensemble_forecast(
+    cache_key: str,
+    start_time: datetime,
+    end_time: datetime,
+    lat: Optional[float],
+    lng: Optional[float],
+):
+    # Shared by all waiting requests, so it owns its session instead of
+    # borrowing the session of whichever request started it
+    async with AsyncSessionLocal() as db:
+        return await _ensemble_forecast_with_session(db, cache_key, start_time, end_time, lat, lng)
+
+
+async def _ensemble_forecast_with_session(
+    db: AsyncSession,
+    cache_key: str,
+    start_time: datetime,
+    end_time: datetime,
+    lat: Optional[float],
+    lng: Optional[float],
+):
+    # Get historical data (severity column only, no ORM hydration)
+    severities = (await db.execute(
+        select(CrimeEvent.severity)
+        .where(CrimeEvent.event_time <= start_time)
+        .order_by(CrimeEvent.event_time.desc())
+        .limit(1000)
+    )).scalars().all()
+    
+    if not severities:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No historical data available"
         )
     
     # Prepare data
-    historical_data = [
-        {
-            'risk_score': float(event.severity) / 5.0,
-            'timestamp': event.event_time
-        }
-        for event in events
-    ]
+    risk_scores = np.fromiter(severities, dtype=np.float32, count=len(severities)) / 5.0
     
-    # KDE scores (simplified - would use actual KDE service)
-    kde_scores = [d['risk_score'] for d in historical_data[:24]]
-    
-    # Spatial features
+    # Only the DB I/O stays on the event loop
+    nearby_events = []
     if lat and lng:
-        from sqlalchemy import text
-        nearby_events = db.execute(
-            text("""
-                SELECT
-                    severity,
-                    ST_Y(geom::geometry) AS lat,
-                    ST_X(geom::geometry) AS lng
-                FROM crime_event
-                WHERE ST_DWithin(
-                    geom,
-                    ST_GeogFromText('POINT(:lng :lat)'),
-                    1000
-                )
-                AND event_time <= :start_time
-                ORDER BY event_time DESC
-                LIMIT 200
-            """),
+        nearby_events = (await db.execute(
+            _NEARBY_EVENTS_BEFORE_SQL,
             {"lat": lat, "lng": lng, "start_time": start_time}
-        ).fetchall()
-        
-        if nearby_events:
-            coordinates = np.array([[row.lat, row.lng] for row in nearby_events])
-            event_counts = np.array([float(row.severity) / 5.0 for row in nearby_events])
-        else:
-            coordinates = np.array([[lat, lng]])
-            event_counts = np.array([0.0])
-        
-        model_path = Path("ml/models/spatial_model.pkl")
-        grid_size, bounds = _load_spatial_model_metadata(model_path)
-        spatial_features = create_spatial_features(
-            coordinates,
-            event_counts,
-            grid_size=int(grid_size) if grid_size else 10,
-            bounds=bounds
-        )
-        
-        temporal_features_array = temporal_feature_vector(start_time)
-        if len(spatial_features) > 1:
-            temporal_features_array = np.repeat(temporal_features_array, len(spatial_features), axis=0)
-    else:
-        spatial_features = np.array([[0.0, 0.0]])
-        temporal_features_array = np.array([[0.0, 0.0, 0.0, 0.0]])
+        )).all()
     
-    # Ensemble forecast
-    forecast = ensemble_forecast(
-        kde_scores,
-        historical_data,
-        spatial_features,
-        temporal_features_array
+    # Ensemble forecast (model inference in the threadpool)
+    forecast = await run_in_threadpool(
+        _ensemble_compute, risk_scores, nearby_events, lat, lng, start_time
     )
     
-    return {
+    result = {
         "forecast": forecast,
         "time_window": {
             "start": start_time.isoformat(),
@@ -232,4 +362,6 @@ def get_ensemble_forecast(
         },
         "models_used": ["kde", "sarimax", "spatial"]
     }
+    await get_forecast_cache().set(cache_key, result)
+    return result
 
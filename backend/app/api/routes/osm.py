@@ -2,15 +2,17 @@
 
 import logging
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status as http_status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
-from app.db.session import get_db
+from app.db.session import get_db, SessionLocal
 from app.services.osm.osm_service import import_osm_data, get_osm_import_status
 from app.services.osm.routing_topology import RoutingTopology
 from app.services.osm.boundary_service import BoundaryService
 from app.services.osm.boundary_importer import BoundaryImporter
+from app.services.osm import job_store
 from app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
@@ -21,6 +23,8 @@ router = APIRouter(prefix="/osm", tags=["OSM"])
 class OSMImportRequest(BaseModel):
     """Request model for OSM import."""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     clear_existing: bool = False
     create_topology: bool = True
     highway_tags: Optional[List[str]] = None
@@ -42,89 +46,110 @@ def get_status(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to get status: {str(e)}")
 
 
-@router.post("/import")
-def import_osm(
+def _run_job(job_id: str, job_func, **kwargs):
+    """
+    Run a background job with its own database session and record the outcome.
+
+    job_func(db, **kwargs) must return a result dict with a "success" flag.
+    """
+    job_store.update_job(job_id, status="running")
+    db = SessionLocal()
+    try:
+        result = job_func(db, **kwargs)
+        job_store.update_job(
+            job_id,
+            status="completed" if result.get("success") else "failed",
+            result=result,
+        )
+    except Exception as e:
+        logger.error(f"OSM job {job_id} failed: {str(e)}", exc_info=True)
+        job_store.update_job(job_id, status="failed", error=str(e))
+    finally:
+        db.close()
+
+
+async def _create_job(job_type: str, params: dict) -> str:
+    """Persist a new job record, or fail the request with 503."""
+    try:
+        return await job_store.create_job(job_type, params)
+    except job_store.JobStoreUnavailable:
+        raise HTTPException(
+            status_code=http_status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Job status store unavailable, job not started",
+        )
+
+
+def _accepted(job_id: str, message: str) -> dict:
+    return {
+        "job_id": job_id,
+        "status": "accepted",
+        "message": message,
+        "status_url": f"{get_settings().api_v1_prefix}/osm/jobs/{job_id}",
+    }
+
+
+def _import_osm_job(
+    db: Session,
+    clear_existing: bool,
+    create_topology: bool,
+    highway_tags: Optional[List[str]],
+) -> dict:
+    logger.info(f"Starting OSM import (clear_existing={clear_existing})")
+    return import_osm_data(
+        db=db,
+        clear_existing=clear_existing,
+        create_topology=create_topology,
+        highway_tags=highway_tags,
+    )
+
+
+@router.post("/import", status_code=http_status.HTTP_202_ACCEPTED)
+async def import_osm(
     request: OSMImportRequest,
-    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
 ):
     """
-    Import OSM data and create routing topology.
+    Start OSM data import and routing topology creation in the background.
 
     Args:
         request: OSM import request parameters
-        db: Database session
+        background_tasks: FastAPI background task queue
 
     Returns:
-        Dictionary with import results
+        Job ID; poll GET /osm/jobs/{job_id} for the import results
     """
-    try:
-        logger.info(f"Starting OSM import (clear_existing={request.clear_existing})")
+    params = request.model_dump()
+    job_id = await _create_job("import", params)
+    background_tasks.add_task(_run_job, job_id, _import_osm_job, **params)
+    return _accepted(job_id, "OSM import started")
 
-        result = import_osm_data(
-            db=db,
-            clear_existing=request.clear_existing,
-            create_topology=request.create_topology,
-            highway_tags=request.highway_tags,
-        )
 
-        if result["success"]:
-            return {
-                "success": True,
-                "message": "OSM import completed successfully",
-                **result,
-            }
-        else:
-            raise HTTPException(
-                status_code=500,
-                detail=f"OSM import failed: {', '.join(result.get('errors', []))}",
-            )
+def _refresh_topology_job(db: Session, force: bool) -> dict:
+    settings = get_settings()
+    topology_tolerance = getattr(settings, "osm_topology_tolerance", 0.0001)
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to import OSM data: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Import failed: {str(e)}")
+    topology_service = RoutingTopology(db, tolerance=topology_tolerance)
+    return topology_service.create_topology(force_recreate=force)
 
 
-@router.post("/refresh-topology")
-def refresh_topology(
+@router.post("/refresh-topology", status_code=http_status.HTTP_202_ACCEPTED)
+async def refresh_topology(
+    background_tasks: BackgroundTasks,
     force: bool = Query(False, description="Force recreation of topology"),
-    db: Session = Depends(get_db),
 ):
     """
-    Refresh pgRouting topology.
+    Refresh pgRouting topology in the background.
 
     Args:
         force: If True, drop existing topology before creating
-        db: Database session
+        background_tasks: FastAPI background task queue
 
     Returns:
-        Dictionary with topology creation results
+        Job ID; poll GET /osm/jobs/{job_id} for the topology results
     """
-    try:
-        settings = get_settings()
-        topology_tolerance = getattr(settings, "osm_topology_tolerance", 0.0001)
-
-        topology_service = RoutingTopology(db, tolerance=topology_tolerance)
-        result = topology_service.create_topology(force_recreate=force)
-
-        if result.get("success"):
-            return {
-                "success": True,
-                "message": "Topology refreshed successfully",
-                **result,
-            }
-        else:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Topology refresh failed: {result.get('error', 'Unknown error')}",
-            )
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to refresh topology: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Topology refresh failed: {str(e)}")
+    job_id = await _create_job("refresh_topology", {"force": force})
+    background_tasks.add_task(_run_job, job_id, _refresh_topology_job, force=force)
+    return _accepted(job_id, "Topology refresh started")
 
 
 @router.post("/clean-boundary")
@@ -278,77 +303,99 @@ def get_topology_status(db: Session = Depends(get_db)):
         )
 
 
-@router.post("/import-boundary")
-def import_boundary(
+def _import_boundary_job(db: Session, force: bool) -> dict:
+    settings = get_settings()
+    importer = BoundaryImporter(db)
+
+    # Fetch boundary from OSM
+    logger.info("Fetching Küçükçekmece boundary from OSM...")
+    boundary_service = BoundaryService(
+        api_url=getattr(settings, "overpass_api_url", "https://overpass-api.de/api/interpreter")
+    )
+
+    # Use fallback bbox to limit search area
+    bbox = settings.kucukcekmece_fallback_bbox
+    xml_data = boundary_service.fetch_boundary_by_name(
+        name=settings.kucukcekmece_boundary_name,
+        admin_level=settings.kucukcekmece_boundary_admin_level,
+        bbox=bbox,
+    )
+
+    # Import boundary
+    return importer.import_boundary(
+        name=settings.kucukcekmece_boundary_name,
+        admin_level=settings.kucukcekmece_boundary_admin_level,
+        xml_data=xml_data,
+        update_existing=force,
+    )
+
+
+@router.post("/import-boundary", status_code=http_status.HTTP_202_ACCEPTED)
+async def import_boundary(
+    background_tasks: BackgroundTasks,
+    response: Response,
     force: bool = Query(False, description="Force re-import even if boundary exists"),
     db: Session = Depends(get_db),
 ):
     """
-    Import Küçükçekmece boundary from OSM.
+    Import Küçükçekmece boundary from OSM in the background.
 
     Args:
         force: If True, re-import even if boundary already exists
+        background_tasks: FastAPI background task queue
+        response: Response (status set to 200 when nothing is started)
         db: Database session
 
     Returns:
-        Dictionary with import results
+        Job ID (poll GET /osm/jobs/{job_id}), or a notice if the boundary
+        already exists and force is not set
     """
     try:
         settings = get_settings()
 
         # Check if boundary already exists
         importer = BoundaryImporter(db)
-        boundary_exists = importer.boundary_exists(
+        boundary_exists = await run_in_threadpool(
+            importer.boundary_exists,
             settings.kucukcekmece_boundary_name,
-            settings.kucukcekmece_boundary_admin_level
+            settings.kucukcekmece_boundary_admin_level,
         )
+    except Exception as e:
+        logger.error(f"Failed to check boundary: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Boundary import failed: {str(e)}")
 
-        if boundary_exists and not force:
-            return {
-                "success": True,
-                "message": "Boundary already exists. Use force=true to re-import",
-                "boundary_exists": True,
-            }
-
-        # Fetch boundary from OSM
-        logger.info("Fetching Küçükçekmece boundary from OSM...")
-        boundary_service = BoundaryService(
-            api_url=getattr(settings, "overpass_api_url", "https://overpass-api.de/api/interpreter")
-        )
+    if boundary_exists and not force:
+        response.status_code = http_status.HTTP_200_OK
+        return {
+            "success": True,
+            "message": "Boundary already exists. Use force=true to re-import",
+            "boundary_exists": True,
+        }
 
-        # Use fallback bbox to limit search area
-        bbox = settings.kucukcekmece_fallback_bbox
-        xml_data = boundary_service.fetch_boundary_by_name(
-            name=settings.kucukcekmece_boundary_name,
-            admin_level=settings.kucukcekmece_boundary_admin_level,
-            bbox=bbox,
-        )
+    job_id = await _create_job("import_boundary", {"force": force})
+    background_tasks.add_task(_run_job, job_id, _import_boundary_job, force=force)
+    return _accepted(job_id, "Boundary import started")
 
-        # Import boundary
-        result = importer.import_boundary(
-            name=settings.kucukcekmece_boundary_name,
-            admin_level=settings.kucukcekmece_boundary_admin_level,
-            xml_data=xml_data,
-            update_existing=force,
-        )
 
-        if result["success"]:
-            return {
-                "success": True,
-                "message": "Boundary imported successfully",
-                **result,
-            }
-        else:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Boundary import failed: {result.get('error', 'Unknown error')}",
-            )
+@router.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """
+    Get the status of a background OSM job.
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to import boundary: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Boundary import failed: {str(e)}")
+    Returns:
+        Job record: status is one of pending, running, completed, failed;
+        result holds the job output once finished
+    """
+    try:
+        job = await job_store.get_job(job_id)
+    except job_store.JobStoreUnavailable:
+        raise HTTPException(
+            status_code=http_status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Job status store unavailable",
+        )
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
 
 
 @router.get("/boundary-status")
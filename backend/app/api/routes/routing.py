@@ -99,23 +99,8 @@ def optimize_route(
         
         logger.info(f"Route optimization result: {len(result.waypoints)} waypoints, {result.total_distance:.0f}m, {result.total_time:.1f}min, path_coords={len(result.path.get('coordinates', [])) if result.path else 0}")
         
-        # Convert to response format
-        waypoints = [
-            RouteWaypoint(
-                lat=wp.lat,
-                lng=wp.lng,
-                risk_score=wp.risk_score
-            )
-            for wp in result.waypoints
-        ]
-        
-        return RouteResponse(
-            waypoints=waypoints,
-            total_distance=result.total_distance,
-            total_time=result.total_time,
-            risk_coverage=result.risk_coverage,
-            path=result.path
-        )
+        # RouteResult dataclass maps field-for-field onto RouteResponse
+        return RouteResponse.model_validate(result)
         
     except ValueError as e:
         logger.warning(f"Route optimization validation error: {str(e)}")
@@ -151,33 +136,30 @@ def optimize_multi_station_route(
         
         # Validate station IDs if provided
         if body.station_ids:
-            from app.models.police_station import PoliceStation
-            from app.services.utils import validate_within_boundary
-            from app.services.routing.route_optimizer import get_station_coordinates
+            from app.services.utils import validate_stations_within_boundary
             
-            valid_stations = []
-            for station_id in body.station_ids:
-                station = db.query(PoliceStation).filter(
-                    PoliceStation.id == station_id,
-                    PoliceStation.active == True
-                ).first()
-                
-                if not station:
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail=f"Station {station_id} not found or inactive"
-                    )
-                
-                # Validate station is within Küçükçekmece boundary
-                lat, lng = get_station_coordinates(db, station_id)
-                is_valid, error_message = validate_within_boundary(db, lat, lng)
-                if not is_valid:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Station {station.name} is outside Küçükçekmece boundary: {error_message}"
-                    )
-                
-                valid_stations.append(station_id)
+            # One query for the stations, one vectorized boundary test
+            station_checks = validate_stations_within_boundary(db, body.station_ids)
+            
+            missing = [str(station_id) for station_id in body.station_ids if str(station_id) not in station_checks]
+            if missing:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Stations not found or inactive: {', '.join(missing)}"
+                )
+            
+            outside = [
+                f"{name}: {error_message}"
+                for name, is_valid, error_message in station_checks.values()
+                if not is_valid
+            ]
+            if outside:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Stations outside Küçükçekmece boundary: {'; '.join(outside)}"
+                )
+            
+            valid_stations = list(body.station_ids)
             
             if not valid_stations:
                 raise HTTPException(
@@ -199,12 +181,7 @@ def optimize_multi_station_route(
         station_routes = []
         for station_id, station_name, route_result in result.station_routes:
             waypoints = [
-                RouteWaypoint(
-                    lat=wp.lat,
-                    lng=wp.lng,
-                    risk_score=wp.risk_score,
-                )
-                for wp in route_result.waypoints
+                RouteWaypoint.model_validate(wp) for wp in route_result.waypoints
             ]
             
             station_routes.append(
@@ -227,6 +204,8 @@ def optimize_multi_station_route(
             coordination_score=result.coordination_score,
         )
         
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
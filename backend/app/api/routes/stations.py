@@ -24,19 +24,19 @@ def list_stations(
     
     stations = query.all()
     
+    # Plain dicts: FastAPI validates the whole list once against response_model,
+    # so building PoliceStationRead instances here would validate every row twice
     results = []
     for station in stations:
         lat, lng = get_point_coordinates(db, station.geom)
-        results.append(
-            PoliceStationRead(
-                id=station.id,
-                name=station.name,
-                lat=lat,
-                lng=lng,
-                capacity=station.capacity,
-                active=station.active,
-            )
-        )
+        results.append({
+            "id": station.id,
+            "name": station.name,
+            "lat": lat,
+            "lng": lng,
+            "capacity": station.capacity,
+            "active": station.active,
+        })
     
     return results
 
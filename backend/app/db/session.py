@@ -1,19 +1,63 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from app.core.config import get_settings
 
 settings = get_settings()
 
+
+def _engine_kwargs(connections: int) -> dict:
+    """Pool settings for an engine allowed to open at most `connections` connections."""
+    if settings.db_use_pgbouncer:
+        # PgBouncer already pools server connections; avoid double pooling.
+        return {"poolclass": NullPool, "pool_pre_ping": True}
+    # Half kept open, half as overflow opened on bursts
+    pool_size = max(1, connections // 2)
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max(0, connections - pool_size),
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": True,
+    }
+
+
+# Split this worker's share of db_max_connections between the two engines;
+# the sync engine only serves routing/OSM work, so it gets the smaller part.
+_worker_connections = settings.db_connections_per_worker
+_sync_connections = max(1, int(_worker_connections * settings.db_sync_pool_share))
+_async_connections = max(1, _worker_connections - _sync_connections)
+
 engine = create_engine(
     settings.database_url,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
     echo=False,
+    **_engine_kwargs(_sync_connections),
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine (asyncpg) for endpoints that only talk to the database directly.
+# Service-layer code (routing, OSM import) still runs on the sync engine above.
+async_engine = create_async_engine(
+    settings.async_database_url,
+    echo=False,
+    # PgBouncer in transaction mode cannot keep asyncpg's prepared statements
+    connect_args=(
+        {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+        if settings.db_use_pgbouncer
+        else {}
+    ),
+    **_engine_kwargs(_async_connections),
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 
 def get_db():
     """Dependency for getting database session"""
@@ -24,6 +68,7 @@ def get_db():
         db.close()
 
 
-
-
-
+async def get_async_db():
+    """Dependency for getting async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
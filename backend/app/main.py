@@ -1,10 +1,15 @@
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.openapi.utils import get_openapi
 
 from app.core.config import get_settings
 from app.api import api_router
+from app.api.routes.ml_forecast import SARIMAX_MODEL_PATH, SPATIAL_MODEL_PATH
+from app.services.ml.model_store import warm_up
 
 # Configure logging
 logging.basicConfig(
@@ -14,6 +19,14 @@ logging.basicConfig(
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load ML models before serving so the first forecast request does not pay for it
+    warm_up(SARIMAX_MODEL_PATH, SPATIAL_MODEL_PATH)
+    yield
+
+
 app = FastAPI(
     title="Predictive Patrol Routing System",
     description="""
@@ -85,6 +98,9 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    # orjson: faster serialization of large forecast/route payloads
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -96,6 +112,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON payloads (route paths, forecast arrays)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include API router
 app.include_router(api_router, prefix=settings.api_v1_prefix)
 
@@ -106,7 +125,7 @@ app.include_router(api_router, prefix=settings.api_v1_prefix)
     description="API hakkında temel bilgileri döndürür",
     tags=["Health"]
 )
-def root():
+async def root():
     """
     API kök endpoint'i.
     
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Boolean, BigInteger, Float, TIMESTAMP
+from sqlalchemy import Column, Computed, String, Integer, Boolean, BigInteger, Float, TIMESTAMP
 from geoalchemy2 import Geography
 from sqlalchemy.sql import func
 
@@ -13,6 +13,8 @@ class RoadSegment(Base):
     road_type = Column(String(50))
     speed_limit = Column(Integer)
     one_way = Column(Boolean, nullable=False, default=False)
+    # Geodesic length in meters (stored generated column), used as routing cost
+    length_m = Column(Float, Computed("ST_Length(geom)", persisted=True))
     source = Column(BigInteger)
     target = Column(BigInteger)
     cost = Column(Float)
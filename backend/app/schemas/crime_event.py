@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from uuid import UUID
 from datetime import datetime
 from typing import Optional
@@ -19,12 +19,11 @@ class CrimeEventCreate(CrimeEventBase):
 
 
 class CrimeEventRead(CrimeEventBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: UUID
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 class CrimeEventUpdate(BaseModel):
     crime_type: Optional[str] = Field(None, min_length=1, max_length=100)
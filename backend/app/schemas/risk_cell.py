@@ -1,10 +1,12 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from uuid import UUID
 from datetime import datetime
 from typing import Any, Optional
 
 
 class RiskCellRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: UUID
     geom: Any  # GeoJSON
     risk_score: float
@@ -12,9 +14,6 @@ class RiskCellRead(BaseModel):
     time_window_start: datetime
     time_window_end: datetime
 
-    class Config:
-        from_attributes = True
-
 
 class RiskMapResponse(BaseModel):
     time_window: dict[str, str]
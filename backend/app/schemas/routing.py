@@ -1,15 +1,19 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from uuid import UUID
 from typing import Optional, List, Any
 
 
 class RouteWaypoint(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     lat: float
     lng: float
     risk_score: Optional[float] = None
 
 
 class RouteResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     waypoints: List[RouteWaypoint]
     total_distance: float
     total_time: float
@@ -18,6 +22,8 @@ class RouteResponse(BaseModel):
 
 
 class RouteOptimizeRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     station_id: UUID
     risk_threshold: float = Field(default=0.7, ge=0.0, le=1.0)
     max_minutes: int = Field(default=90, ge=1, le=180)
@@ -29,6 +35,8 @@ class RouteOptimizeRequest(BaseModel):
 class StationRoute(BaseModel):
     """Route information for a single station."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     station_id: UUID
     station_name: str
     waypoints: List[RouteWaypoint]
@@ -41,6 +49,8 @@ class StationRoute(BaseModel):
 class MultiStationRouteRequest(BaseModel):
     """Request for multi-station route optimization."""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     station_ids: Optional[List[UUID]] = Field(
         default=None, description="List of station IDs (None = all active stations)"
     )
@@ -55,6 +65,8 @@ class MultiStationRouteRequest(BaseModel):
 class MultiStationRouteResponse(BaseModel):
     """Response for multi-station route optimization."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     routes: List[StationRoute]
     total_stations: int
     total_risk_coverage: float
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from uuid import UUID
 from typing import Optional
 
@@ -16,10 +16,9 @@ class PoliceStationCreate(PoliceStationBase):
 
 
 class PoliceStationRead(PoliceStationBase):
-    id: UUID
+    model_config = ConfigDict(from_attributes=True)
 
-    class Config:
-        from_attributes = True
+    id: UUID
 
 
 class PoliceStationUpdate(BaseModel):
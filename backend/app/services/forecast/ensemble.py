@@ -1,32 +1,39 @@
 """Model ensemble service - combines KDE, SARIMAX, and spatial models"""
-from typing import List, Dict
+from types import MappingProxyType
+from typing import List, Dict, Mapping, Optional, Union
 import numpy as np
 
 from app.services.ml.sarimax_service import forecast_timeseries
 from app.services.ml.spatial_service import forecast_spatial_temporal
 
+_DEFAULT_WEIGHTS: Mapping[str, float] = MappingProxyType({"kde": 0.4, "sarimax": 0.3, "spatial": 0.3})
+
 def ensemble_forecast(
     kde_scores: List[float],
-    historical_data: List[Dict],
+    historical_data: Union[List[Dict], np.ndarray],
     spatial_features: np.ndarray,
     temporal_features: np.ndarray,
-    weights: Dict[str, float] = None
+    weights: Optional[Dict[str, float]] = None
 ) -> List[float]:
     """
     Combine forecasts from multiple models using weighted voting.
     
     Args:
         kde_scores: Risk scores from KDE
-        historical_data: Historical data for SARIMAX
+        historical_data: Historical data (or risk score array) for SARIMAX
         spatial_features: Spatial features for spatial model
         temporal_features: Temporal features for spatial model
-        weights: Model weights (default: equal weights)
+        weights: Model weights, normalized to sum to 1 (default: kde 0.4, sarimax 0.3, spatial 0.3)
     
     Returns:
         Ensemble forecasted risk scores
     """
+    # Nothing to forecast from: every model would return zeros
+    if not kde_scores and len(historical_data) == 0 and spatial_features.size == 0:
+        return [0.0]
+
     if weights is None:
-        weights = {"kde": 0.4, "sarimax": 0.3, "spatial": 0.3}
+        weights = _DEFAULT_WEIGHTS
     
     # Get forecasts from each model
     kde_forecast = np.array(kde_scores) if kde_scores else np.array([0.0])
@@ -36,16 +43,20 @@ def ensemble_forecast(
     )
     
     spatial_forecast = forecast_spatial_temporal(spatial_features, temporal_features)
-    if len(spatial_forecast) < len(kde_forecast):
-        spatial_forecast = np.tile(spatial_forecast, len(kde_forecast))
-    spatial_forecast = spatial_forecast[:len(kde_forecast)]
+    if spatial_forecast.size == 1:
+        # Zero-copy view of the scalar forecast
+        spatial_forecast = np.broadcast_to(spatial_forecast, kde_forecast.shape)
+    elif spatial_forecast.size < kde_forecast.size:
+        reps = -(-kde_forecast.size // spatial_forecast.size)
+        spatial_forecast = np.tile(spatial_forecast, reps)[:kde_forecast.size]
+    else:
+        spatial_forecast = spatial_forecast[:kde_forecast.size]
     
-    # Weighted combination
-    ensemble = (
-        weights["kde"] * kde_forecast +
-        weights["sarimax"] * sarimax_forecast +
-        weights["spatial"] * spatial_forecast
-    )
+    # Weighted combination: one BLAS matrix-vector product over the stacked
+    # forecasts (fused multiply-add, no per-model temporaries)
+    forecasts = np.stack([kde_forecast, sarimax_forecast, spatial_forecast])
+    w = np.array([weights["kde"], weights["sarimax"], weights["spatial"]], dtype=np.float64)
+    ensemble = (w / w.sum()) @ forecasts
     
     return ensemble.tolist()
 
@@ -65,7 +65,7 @@ def calculate_local_density(
                 FROM crime_event
                 WHERE ST_DWithin(
                     geom,
-                    ST_GeogFromText('POINT(:lng :lat)'),
+                    ST_SetSRID(ST_MakePoint(:lng, :lat), 4326)::geography,
                     :radius
                 )
             """),
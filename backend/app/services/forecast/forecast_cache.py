@@ -0,0 +1,156 @@
+"""Response cache for ML forecast endpoints.
+
+Redis (async client) is used when available; otherwise results are kept in
+an in-process TTL cache so repeated requests still avoid DB + model work.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import redis.asyncio as aioredis
+from cachetools import TTLCache
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+FORECAST_CACHE_TTL_SECONDS = 300
+# How long to stay on the local cache after a Redis error before retrying
+REDIS_RETRY_SECONDS = 60
+
+
+def time_bucket(ts: float, size_seconds: int = FORECAST_CACHE_TTL_SECONDS) -> int:
+    """Return the index of the fixed-size time bucket containing ts."""
+    return int(ts // size_seconds)
+
+
+class ForecastCache:
+    """Two-level (Redis, then in-process) cache for forecast responses."""
+
+    def __init__(
+        self,
+        redis_client: Optional[aioredis.Redis] = None,
+        ttl_seconds: int = FORECAST_CACHE_TTL_SECONDS,
+        maxsize: int = 1024,
+    ):
+        """
+        Initialize the forecast cache.
+
+        Args:
+            redis_client: Optional async Redis client (creates new if not provided)
+            ttl_seconds: Time-to-live for cached responses
+            maxsize: Maximum number of entries in the local fallback cache
+        """
+        self.ttl_seconds = ttl_seconds
+        self._local: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+        self._redis_retry_at = 0.0
+
+        if redis_client is None:
+            try:
+                redis_client = aioredis.from_url(
+                    settings.redis_url,
+                    decode_responses=True,
+                    socket_connect_timeout=1,
+                    socket_timeout=1,
+                )
+            except Exception as e:
+                logger.warning(f"Async Redis client unavailable, using local cache: {str(e)}")
+                redis_client = None
+        self.redis_client = redis_client
+
+    @staticmethod
+    def make_key(namespace: str, *parts: Any) -> str:
+        """Build a cache key from a namespace and hashable parts."""
+        key_string = ":".join(str(p) for p in parts)
+        key_hash = hashlib.md5(key_string.encode()).hexdigest()
+        return f"ml_forecast:{namespace}:{key_hash}"
+
+    def _redis_available(self) -> bool:
+        return self.redis_client is not None and time.monotonic() >= self._redis_retry_at
+
+    def _redis_failed(self, e: Exception):
+        logger.warning(f"Forecast cache Redis error, falling back to local cache: {str(e)}")
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+
+    async def get(self, key: str) -> Optional[Dict]:
+        """Return the cached response for key, or None on a miss."""
+        if self._redis_available():
+            try:
+                cached = await self.redis_client.get(key)
+                if cached is not None:
+                    return json.loads(cached)
+                return None
+            except Exception as e:
+                self._redis_failed(e)
+        return self._local.get(key)
+
+    async def set(self, key: str, value: Dict):
+        """Store a response under key for the configured TTL."""
+        if self._redis_available():
+            try:
+                await self.redis_client.setex(
+                    key, self.ttl_seconds, json.dumps(value, default=str)
+                )
+                return
+            except Exception as e:
+                self._redis_failed(e)
+        self._local[key] = value
+
+
+# Singleton instance
+_forecast_cache: Optional[ForecastCache] = None
+
+
+def get_forecast_cache() -> ForecastCache:
+    """
+    Get the singleton forecast cache instance.
+
+    Returns:
+        ForecastCache instance
+    """
+    global _forecast_cache
+    if _forecast_cache is None:
+        _forecast_cache = ForecastCache()
+    return _forecast_cache
+
+
+# In-flight computations by cache key (per event loop / worker process)
+_inflight: Dict[str, asyncio.Task] = {}
+
+
+def _inflight_done(key: str, task: asyncio.Task):
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    # Mark the exception retrieved so a failure nobody awaited does not log a warning
+    if not task.cancelled():
+        task.exception()
+
+
+async def single_flight(key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run compute() once per key among concurrent callers.
+
+    The computation runs as its own task, so it does not depend on the
+    request that started it: if that caller is cancelled (client
+    disconnect), the others still get its result (or exception). compute
+    must therefore not use resources owned by a single request, such as
+    the request's DB session.
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(compute())
+        _inflight[key] = task
+        task.add_done_callback(lambda t: _inflight_done(key, t))
+    return await asyncio.shield(task)
+
+
+def hour_floor(dt: datetime) -> datetime:
+    """Truncate a datetime to the start of its hour (cache key granularity)."""
+    return dt.replace(minute=0, second=0, microsecond=0)
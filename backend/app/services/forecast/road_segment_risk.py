@@ -52,12 +52,12 @@ def snap_crime_to_road_segment(
                             ST_SetSRID(ST_MakePoint(:crime_lng, :crime_lat), 4326)
                         )::geography as snapped_point,
                         ST_Distance(
-                            ST_GeogFromText('POINT(:crime_lng :crime_lat)'),
+                            ST_SetSRID(ST_MakePoint(:crime_lng, :crime_lat), 4326)::geography,
                             rs.geom
                         ) as distance_m
                     FROM road_segment rs
                     WHERE ST_DWithin(
-                        ST_GeogFromText('POINT(:crime_lng :crime_lat)'),
+                        ST_SetSRID(ST_MakePoint(:crime_lng, :crime_lat), 4326)::geography,
                         rs.geom,
                         :max_distance_m
                     )
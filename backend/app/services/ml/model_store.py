@@ -0,0 +1,82 @@
+"""Process-wide cache for pickled ML models (plain pickle or joblib files).
+
+Models are loaded once per (path, mtime, size); retraining replaces the file,
+which changes the key and triggers a reload on the next request.
+"""
+import hashlib
+import logging
+import pickle
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+# joblib (installed with scikit-learn) reads both plain pickles and the
+# compressed files written by the SARIMAX training script
+try:
+    import joblib
+    JOBLIB_AVAILABLE = True
+except ImportError:
+    JOBLIB_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+# Large read buffer: statsmodels results unpickle through many small reads
+_READ_BUFFER_SIZE = 1 << 20
+
+
+@lru_cache(maxsize=4)
+def _load_pickle(path: str, mtime_ns: int, size: int) -> Any:
+    with open(path, 'rb', buffering=_READ_BUFFER_SIZE) as f:
+        if JOBLIB_AVAILABLE:
+            return joblib.load(f)
+        return pickle.load(f)
+
+
+def load_model(model_path: Path) -> Any:
+    """
+    Load a pickled model, reusing the cached object while the file is unchanged.
+
+    Args:
+        model_path: Path to the pickled model
+
+    Returns:
+        Unpickled model object (shared, treat as read-only)
+
+    Raises:
+        OSError / pickle errors if the file is missing or unreadable
+    """
+    stat = model_path.stat()
+    return _load_pickle(str(model_path), stat.st_mtime_ns, stat.st_size)
+
+
+def model_version(model_path: Optional[Path]) -> Optional[str]:
+    """Short hash identifying the current model file, or None if it does not exist."""
+    if not model_path:
+        return None
+    try:
+        stat = model_path.stat()
+    except OSError:
+        return None
+    key = f"{model_path}:{stat.st_mtime_ns}:{stat.st_size}"
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+
+def warm_up(*model_paths: Path):
+    """
+    Load models into the cache ahead of the first request.
+
+    Models exposing ``forecast`` (statsmodels results) are also run for one
+    step so their one-time filter initialization happens here rather than on
+    the request path. Missing or unreadable files are skipped.
+    """
+    for model_path in model_paths:
+        if not model_path.exists():
+            continue
+        try:
+            model = load_model(model_path)
+            if hasattr(model, "forecast"):
+                model.forecast(steps=1)
+            logger.info(f"Warmed up model {model_path}")
+        except Exception as e:
+            logger.warning(f"Model warm-up failed for {model_path}: {str(e)}")
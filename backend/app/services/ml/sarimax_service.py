@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 from pathlib import Path
 import numpy as np
 import pandas as pd
@@ -11,9 +11,22 @@ try:
 except ImportError:
     STATSMODELS_AVAILABLE = False
 
+from app.services.ml.model_store import load_model
+
+
+def _risk_score_array(historical_data: Union[List[Dict], np.ndarray]) -> np.ndarray:
+    """Return risk scores as a float array (accepts dict rows or a ready array)."""
+    if isinstance(historical_data, np.ndarray):
+        return historical_data.astype(np.float64, copy=False)
+    return np.fromiter(
+        (d.get('risk_score', 0.0) for d in historical_data),
+        dtype=np.float64,
+        count=len(historical_data),
+    )
+
 
 def forecast_timeseries(
-    historical_data: List[Dict],
+    historical_data: Union[List[Dict], np.ndarray],
     forecast_horizon: int = 24,
     model_path: Optional[Path] = None
 ) -> List[float]:
@@ -21,20 +34,21 @@ def forecast_timeseries(
     Forecast future risk using SARIMAX model.
     
     Args:
-        historical_data: List of historical risk scores with timestamps
+        historical_data: List of historical risk scores with timestamps,
+            or a 1-D array of risk scores
         forecast_horizon: Number of hours to forecast ahead
         model_path: Path to pre-trained model (optional)
     
     Returns:
         List of forecasted risk scores
     """
-    if not historical_data:
+    if len(historical_data) == 0:
         return [0.0] * forecast_horizon
     
     # If statsmodels not available or no model, use simple average
     if not STATSMODELS_AVAILABLE or not model_path or not model_path.exists():
         # Fallback: weighted moving average with trend
-        risk_scores = [d.get('risk_score', 0.0) for d in historical_data]
+        risk_scores = _risk_score_array(historical_data)
         if len(risk_scores) < 2:
             return [float(np.mean(risk_scores))] * forecast_horizon
         
@@ -49,24 +63,20 @@ def forecast_timeseries(
             trend = 0.0
         
         # Forecast with trend
-        forecast = []
-        for i in range(forecast_horizon):
-            forecast.append(max(0.0, min(1.0, avg_recent + trend * i)))
+        forecast = np.clip(avg_recent + trend * np.arange(forecast_horizon), 0.0, 1.0)
         
-        return [float(f) for f in forecast]
+        return forecast.tolist()
     
     # Use trained SARIMAX model
     try:
-        import pickle
-        with open(model_path, 'rb') as f:
-            model = pickle.load(f)
+        model = load_model(model_path)
         
         # Make forecast
         forecast = model.forecast(steps=forecast_horizon)
-        return [float(max(0.0, min(1.0, f))) for f in forecast]
+        return np.clip(np.asarray(forecast, dtype=np.float64), 0.0, 1.0).tolist()
     
     except Exception as e:
         # Fallback on error
-        risk_scores = [d.get('risk_score', 0.0) for d in historical_data]
+        risk_scores = _risk_score_array(historical_data)
         avg_risk = np.mean(risk_scores)
         return [float(avg_risk)] * forecast_horizon
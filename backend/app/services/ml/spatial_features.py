@@ -42,12 +42,11 @@ def create_spatial_features(
     coords_norm = (coordinates - mins) / (maxs - mins + 1e-8)
     coords_norm = np.clip(coords_norm, 0.0, 1.0 - 1e-8)
 
+    # One-hot grid cell per event, weighted by its count (vectorized binning)
+    grid_xy = (coords_norm * grid_size).astype(np.intp)
+    grid_idx = np.minimum(grid_xy[:, 0] * grid_size + grid_xy[:, 1], grid_size * grid_size - 1)
     features = np.zeros((len(coordinates), grid_size * grid_size))
-    for i, (lat, lng) in enumerate(coords_norm):
-        grid_x = int(lat * grid_size)
-        grid_y = int(lng * grid_size)
-        grid_idx = min(grid_x * grid_size + grid_y, grid_size * grid_size - 1)
-        features[i, grid_idx] = event_counts[i]
+    features[np.arange(len(coordinates)), grid_idx] = event_counts
 
     return features
 
@@ -83,6 +82,28 @@ def create_temporal_features(timestamps: np.ndarray) -> np.ndarray:
     return np.array(features)
 
 
+def _build_temporal_lut() -> np.ndarray:
+    """(day_of_week, hour) -> [hour_sin, hour_cos, day_sin, day_cos] lookup table."""
+    hours = np.arange(24)
+    days = np.arange(7)
+    lut = np.empty((7, 24, 4), dtype=np.float32)
+    lut[:, :, 0] = np.sin(2 * np.pi * hours / 24)
+    lut[:, :, 1] = np.cos(2 * np.pi * hours / 24)
+    lut[:, :, 2] = np.sin(2 * np.pi * days / 7)[:, None]
+    lut[:, :, 3] = np.cos(2 * np.pi * days / 7)[:, None]
+    lut.flags.writeable = False
+    return lut
+
+
+# Only 7 * 24 distinct temporal states exist; computed once at import
+_TEMPORAL_LUT = _build_temporal_lut()
+
+
 def temporal_feature_vector(dt: datetime) -> np.ndarray:
     """Return a single-row temporal feature vector compatible with the model."""
-    return create_temporal_features(np.array([dt]))
+    return _TEMPORAL_LUT[dt.weekday(), dt.hour][None, :]
+
+
+def temporal_feature_rows(dt: datetime, n_rows: int) -> np.ndarray:
+    """Return the temporal features of dt repeated for n_rows (read-only view)."""
+    return np.broadcast_to(_TEMPORAL_LUT[dt.weekday(), dt.hour], (max(n_rows, 1), 4))
@@ -8,16 +8,19 @@ try:
 except ImportError:
     SKLEARN_AVAILABLE = False
 
+from app.services.ml.model_store import load_model
 from app.services.ml.spatial_features import create_spatial_features
 
 
+# Night hours (22-6) get higher weight
+_NIGHT_WEIGHT_BY_HOUR = np.array([1.2] * 7 + [1.0] * 15 + [1.2] * 2)
+
+
 def _load_spatial_model(model_path: Optional[Path]) -> Optional[dict]:
     if not model_path or not model_path.exists():
         return None
     try:
-        import pickle
-        with open(model_path, 'rb') as f:
-            return pickle.load(f)
+        return load_model(model_path)
     except Exception:
         return None
 
@@ -54,21 +57,26 @@ def forecast_spatial_temporal(
     
     model_dict = _load_spatial_model(model_path)
 
+    # Simple spatial average of the input features, shared by both fallbacks
+    spatial_avg = float(spatial_features.mean())
+
     # If no model available, use simple spatial average
     if not SKLEARN_AVAILABLE or not model_dict:
         # Simple spatial average with temporal weighting
-        spatial_avg = float(np.mean(spatial_features))
-        
         # Apply temporal weighting if available
         if temporal_features.size > 0:
             # Use hour of day as weight (higher risk at night)
             if len(temporal_features.shape) > 1:
-                hour_sin = temporal_features[:, 0] if temporal_features.shape[1] > 0 else np.array([0.5])
-                # Convert sin back to approximate hour (0-23)
-                hour_approx = np.arcsin(np.clip(hour_sin, -1, 1)) * 24 / (2 * np.pi)
-                # Night hours (22-6) get higher weight
-                night_weight = np.where((hour_approx >= 22) | (hour_approx <= 6), 1.2, 1.0)
-                return np.array([spatial_avg * np.mean(night_weight)])
+                if temporal_features.shape[1] >= 2:
+                    # Recover hour (0-23) from the (hour_sin, hour_cos) pair
+                    hour_approx = np.arctan2(temporal_features[:, 0], temporal_features[:, 1]) * 24 / (2 * np.pi)
+                else:
+                    hour_sin = temporal_features[:, 0] if temporal_features.shape[1] > 0 else np.array([0.5])
+                    # Only sin available: approximate hour
+                    hour_approx = np.arcsin(np.clip(hour_sin, -1, 1)) * 24 / (2 * np.pi)
+                hour_idx = np.rint(hour_approx).astype(np.int64) % 24
+                night_weight = _NIGHT_WEIGHT_BY_HOUR[hour_idx]
+                return np.array([spatial_avg * float(night_weight.mean())])
         
         return np.array([spatial_avg])
     
@@ -100,4 +108,4 @@ def forecast_spatial_temporal(
 
     except Exception:
         # Fallback on error
-        return np.array([float(np.mean(spatial_features))])
+        return np.array([spatial_avg])
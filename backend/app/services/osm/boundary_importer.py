@@ -1,12 +1,13 @@
 """Boundary importer service for importing OSM boundaries into database."""
 
 import logging
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
 from app.models.administrative_boundary import AdministrativeBoundary
-from app.services.osm.boundary_parser import BoundaryParser
+from app.services.osm.boundary_parser import BoundaryParser, XMLSource
+from app.services.utils import clear_boundary_shape_cache
 
 logger = logging.getLogger(__name__)
 
@@ -23,12 +24,14 @@ class BoundaryImporter:
         """
         self.db = db
         self.parser = BoundaryParser()
+        # (name, admin_level) -> boundary, for the lifetime of this importer/session
+        self._boundary_cache: Dict[Tuple[str, int], Optional[AdministrativeBoundary]] = {}
 
     def import_boundary(
         self,
         name: str,
         admin_level: int,
-        xml_data: str,
+        xml_data: XMLSource,
         update_existing: bool = True,
     ) -> dict:
         """
@@ -37,28 +40,15 @@ class BoundaryImporter:
         Args:
             name: Name of the administrative boundary
             admin_level: Administrative level
-            xml_data: OSM XML data
+            xml_data: OSM XML data (string, bytes or path to an .osm file)
             update_existing: If True, update existing boundary; if False, skip if exists
 
         Returns:
             Dictionary with import results
         """
         try:
-            # Parse boundary and extract relation ID
-            import xml.etree.ElementTree as ET
-            root = ET.fromstring(xml_data)
-            
-            # Extract relation ID from XML
-            osm_id = None
-            relations = root.findall("relation")
-            for relation in relations:
-                tags = {tag.get("k"): tag.get("v") for tag in relation.findall("tag")}
-                if tags.get("boundary") == "administrative":
-                    osm_id = int(relation.get("id"))
-                    break
-            
-            # Parse boundary
-            polygon_rings = self.parser.parse_boundary_xml(xml_data)
+            # Parse boundary and extract relation ID (single streaming pass)
+            osm_id, polygon_rings = self.parser.parse_boundary_relation(xml_data)
             if not polygon_rings or len(polygon_rings) == 0:
                 return {
                     "success": False,
@@ -77,14 +67,7 @@ class BoundaryImporter:
             wkt = self.parser.coordinates_to_wkt(outer_ring)
 
             # Check if boundary already exists
-            existing = (
-                self.db.query(AdministrativeBoundary)
-                .filter(
-                    AdministrativeBoundary.name == name,
-                    AdministrativeBoundary.admin_level == admin_level,
-                )
-                .first()
-            )
+            existing = self.get_boundary(name, admin_level)
 
             if existing:
                 if not update_existing:
@@ -131,6 +114,8 @@ class BoundaryImporter:
                 boundary_id = str(result.scalar())
 
             self.db.commit()
+            self._boundary_cache.clear()
+            clear_boundary_shape_cache()
 
             return {
                 "success": True,
@@ -141,6 +126,7 @@ class BoundaryImporter:
 
         except Exception as e:
             self.db.rollback()
+            self._boundary_cache.clear()
             logger.error(f"Failed to import boundary: {str(e)}")
             return {
                 "success": False,
@@ -151,6 +137,9 @@ class BoundaryImporter:
         """
         Get boundary from database.
 
+        The result (including "not found") is cached on this importer until
+        the next import_boundary call.
+
         Args:
             name: Name of the boundary
             admin_level: Administrative level
@@ -158,14 +147,17 @@ class BoundaryImporter:
         Returns:
             AdministrativeBoundary or None
         """
-        return (
-            self.db.query(AdministrativeBoundary)
-            .filter(
-                AdministrativeBoundary.name == name,
-                AdministrativeBoundary.admin_level == admin_level,
+        key = (name, admin_level)
+        if key not in self._boundary_cache:
+            self._boundary_cache[key] = (
+                self.db.query(AdministrativeBoundary)
+                .filter(
+                    AdministrativeBoundary.name == name,
+                    AdministrativeBoundary.admin_level == admin_level,
+                )
+                .first()
             )
-            .first()
-        )
+        return self._boundary_cache[key]
 
     def boundary_exists(self, name: str, admin_level: int) -> bool:
         """
@@ -1,72 +1,93 @@
 """OSM boundary parser for extracting polygon from OSM relation data."""
 
+import io
 import logging
+import os
 import xml.etree.ElementTree as ET
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    from lxml import etree as LET
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+_OSM_ELEMENT_TAGS = ("node", "way", "relation")
+_XML_PARSE_ERRORS = (ET.ParseError, LET.XMLSyntaxError) if LXML_AVAILABLE else (ET.ParseError,)
+
+# (member type, ref, role) of a relation member
+RelationMember = Tuple[str, int, Optional[str]]
+
+# OSM XML as text, raw bytes, or a path to an .osm file
+XMLSource = Union[str, bytes, os.PathLike]
+PolygonRings = List[List[Tuple[float, float]]]
+
 
 class BoundaryParser:
     """Parser for OSM boundary/relation data."""
 
-    def parse_boundary_xml(self, xml_data: str) -> Optional[List[List[Tuple[float, float]]]]:
+    def parse_boundary_xml(self, xml_data: XMLSource) -> Optional[PolygonRings]:
         """
         Parse OSM XML and extract boundary polygon coordinates.
 
         Args:
-            xml_data: OSM XML data as string
+            xml_data: OSM XML data as string, bytes or a file path
 
         Returns:
             List of polygon rings (outer ring + holes), each ring is a list of (lat, lng) tuples
             Returns None if parsing fails
         """
+        return self.parse_boundary_relation(xml_data)[1]
+
+    def parse_boundary_relation(
+        self, xml_data: XMLSource
+    ) -> Tuple[Optional[int], Optional[PolygonRings]]:
+        """
+        Parse OSM XML in a single streaming pass.
+
+        Args:
+            xml_data: OSM XML data as string, bytes or a file path
+
+        Returns:
+            (OSM id of the administrative boundary relation, polygon rings as in
+            parse_boundary_xml); either item is None if not found or parsing fails
+        """
+        relation_id = None
         try:
-            root = ET.fromstring(xml_data)
-            logger.info(f"Parsing OSM boundary XML with {len(root)} elements")
-
-            # Extract nodes first
-            nodes: Dict[int, Tuple[float, float]] = {}
-            for node in root.findall("node"):
-                node_id = int(node.get("id"))
-                lat = float(node.get("lat"))
-                lon = float(node.get("lon"))
-                nodes[node_id] = (lat, lon)
-
-            # Find relation with boundary=administrative
-            relations = root.findall("relation")
-            boundary_relation = None
-            for relation in relations:
-                tags = {tag.get("k"): tag.get("v") for tag in relation.findall("tag")}
-                if tags.get("boundary") == "administrative":
-                    boundary_relation = relation
-                    break
+            (
+                node_index, lats, lons, way_node_refs, relation_id, boundary_members
+            ) = self._scan_osm_xml(xml_data)
+            logger.info(
+                f"Parsing OSM boundary XML with {len(node_index)} nodes and {len(way_node_refs)} ways"
+            )
 
-            if not boundary_relation:
+            if boundary_members is None:
                 logger.warning("No administrative boundary relation found")
-                return None
+                return None, None
+
+            # Node arrays sorted by id, so way refs resolve with one searchsorted
+            node_ids = np.fromiter(node_index.keys(), dtype=np.int64, count=len(node_index))
+            order = np.argsort(node_ids)
+            sorted_ids, sorted_lats, sorted_lons = node_ids[order], lats[order], lons[order]
 
             # Extract outer way (main boundary)
             outer_ways = []
             inner_ways = []  # Holes in the polygon
 
-            for member in boundary_relation.findall("member"):
-                role = member.get("role")
-                member_type = member.get("type")
-                member_ref = int(member.get("ref"))
-
+            for member_type, member_ref, role in boundary_members:
                 if member_type == "way":
-                    # Find the way element
-                    way = root.find(f"way[@id='{member_ref}']")
-                    if way is None:
+                    node_refs = way_node_refs.get(member_ref)
+                    if node_refs is None:
                         continue
 
-                    # Extract coordinates
-                    coordinates = []
-                    for nd in way.findall("nd"):
-                        node_id = int(nd.get("ref"))
-                        if node_id in nodes:
-                            coordinates.append(nodes[node_id])
+                    # Extract coordinates (refs to unknown nodes are dropped)
+                    coordinates = self._gather_coordinates(
+                        node_refs, sorted_ids, sorted_lats, sorted_lons
+                    )
 
                     if len(coordinates) >= 3:  # At least 3 points for a polygon
                         if role == "outer" or role is None:
@@ -76,7 +97,7 @@ class BoundaryParser:
 
             if not outer_ways:
                 logger.warning("No outer ways found in boundary relation")
-                return None
+                return relation_id, None
 
             # Combine outer ways into a single polygon
             # OSM relations can have multiple outer ways that need to be connected
@@ -88,7 +109,7 @@ class BoundaryParser:
                 # Fallback: use first way if merge fails
                 merged_outer_ring = outer_ways[0] if outer_ways else None
                 if not merged_outer_ring or len(merged_outer_ring) < 3:
-                    return None
+                    return relation_id, None
 
             polygon_rings = [merged_outer_ring]
 
@@ -96,14 +117,111 @@ class BoundaryParser:
             polygon_rings.extend(inner_ways)
 
             logger.info(f"Parsed boundary with {len(polygon_rings)} rings ({len(outer_ways)} outer ways merged, {len(inner_ways)} inner)")
-            return polygon_rings
+            return relation_id, polygon_rings
 
-        except ET.ParseError as e:
+        except _XML_PARSE_ERRORS as e:
             logger.error(f"Failed to parse OSM XML: {str(e)}")
-            return None
+            return relation_id, None
         except Exception as e:
             logger.error(f"Unexpected error parsing boundary: {str(e)}")
-            return None
+            return relation_id, None
+
+    @staticmethod
+    def _gather_coordinates(
+        node_refs: List[int],
+        sorted_ids: np.ndarray,
+        sorted_lats: np.ndarray,
+        sorted_lons: np.ndarray,
+    ) -> List[Tuple[float, float]]:
+        """Resolve node refs to (lat, lon) tuples against id-sorted node arrays."""
+        if not node_refs or not sorted_ids.size:
+            return []
+        refs = np.array(node_refs, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(sorted_ids, refs), sorted_ids.size - 1)
+        pos = pos[sorted_ids[pos] == refs]
+        return list(zip(sorted_lats[pos].tolist(), sorted_lons[pos].tolist()))
+
+    def _iter_osm_elements(self, xml_data: XMLSource):
+        """
+        Stream top-level node/way/relation elements from OSM XML.
+
+        Uses lxml's iterparse when available and falls back to the stdlib
+        parser. Callers must read each element before advancing; it is
+        cleared afterwards so the document is never held in memory whole.
+        """
+        if isinstance(xml_data, os.PathLike):
+            source = os.fspath(xml_data)
+        elif isinstance(xml_data, str):
+            source = io.BytesIO(xml_data.encode("utf-8"))
+        else:
+            source = io.BytesIO(xml_data)
+
+        if LXML_AVAILABLE:
+            for _, elem in LET.iterparse(source, events=("end",), tag=_OSM_ELEMENT_TAGS):
+                yield elem
+                elem.clear()
+                # Drop already-processed siblings still referenced by the root
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+            return
+
+        for _, elem in ET.iterparse(source, events=("end",)):
+            if elem.tag in _OSM_ELEMENT_TAGS:
+                yield elem
+                elem.clear()
+
+    def _scan_osm_xml(
+        self, xml_data: XMLSource
+    ) -> Tuple[
+        Dict[int, int],
+        np.ndarray,
+        np.ndarray,
+        Dict[int, List[int]],
+        Optional[int],
+        Optional[List[RelationMember]],
+    ]:
+        """
+        Collect node coordinates, way node refs and the first administrative relation.
+
+        Returns:
+            (node id -> row index into lats/lons, lats, lons, way node refs by way id,
+             boundary relation id, members of the boundary relation or None if there is none)
+        """
+        node_index: Dict[int, int] = {}
+        lats_list: List[float] = []
+        lons_list: List[float] = []
+        way_node_refs: Dict[int, List[int]] = {}
+        relation_id: Optional[int] = None
+        boundary_members: Optional[List[RelationMember]] = None
+
+        for elem in self._iter_osm_elements(xml_data):
+            tag = elem.tag
+            if tag == "node":
+                node_id = int(elem.get("id"))
+                row = node_index.get(node_id)
+                if row is None:
+                    node_index[node_id] = len(lats_list)
+                    lats_list.append(float(elem.get("lat")))
+                    lons_list.append(float(elem.get("lon")))
+                else:
+                    # Duplicate node id: last occurrence wins
+                    lats_list[row] = float(elem.get("lat"))
+                    lons_list[row] = float(elem.get("lon"))
+            elif tag == "way":
+                # Ways are kept (as node refs only) until the relation is processed
+                way_node_refs[int(elem.get("id"))] = [int(nd.get("ref")) for nd in elem.iter("nd")]
+            elif tag == "relation" and boundary_members is None:
+                tags = {t.get("k"): t.get("v") for t in elem.iter("tag")}
+                if tags.get("boundary") == "administrative":
+                    relation_id = int(elem.get("id"))
+                    boundary_members = [
+                        (m.get("type"), int(m.get("ref")), m.get("role"))
+                        for m in elem.iter("member")
+                    ]
+
+        lats = np.array(lats_list, dtype=np.float64)
+        lons = np.array(lons_list, dtype=np.float64)
+        return node_index, lats, lons, way_node_refs, relation_id, boundary_members
 
     def _merge_outer_ways(self, outer_ways: List[List[Tuple[float, float]]]) -> Optional[List[Tuple[float, float]]]:
         """
@@ -218,27 +336,29 @@ class BoundaryParser:
         return merged
 
     def coordinates_to_wkt(
-        self, coordinates: List[Tuple[float, float]], close_ring: bool = True
+        self, coordinates: Union[List[Tuple[float, float]], np.ndarray], close_ring: bool = True
     ) -> str:
         """
         Convert coordinates to WKT format.
 
         Args:
-            coordinates: List of (lon, lat) tuples - standard GeoJSON/PostGIS order
+            coordinates: List of (lon, lat) tuples or an (N, 2) array - standard GeoJSON/PostGIS order
             close_ring: If True, ensure ring is closed (first point = last point)
 
         Returns:
-            WKT string for POLYGON
+            WKT string for POLYGON (7 decimal places, OSM's coordinate precision)
         """
         if len(coordinates) < 3:
             raise ValueError("Polygon must have at least 3 points")
 
+        coords = np.asarray(coordinates, dtype=np.float64)
+
         # Close ring if needed
-        if close_ring and coordinates[0] != coordinates[-1]:
-            coordinates = coordinates + [coordinates[0]]
+        if close_ring and not np.array_equal(coords[0], coords[-1]):
+            coords = np.vstack((coords, coords[:1]))
 
         # Convert to WKT format: (lng lat, lng lat, ...)
-        # coordinates already in (lon, lat) order
-        coords_str = ", ".join([f"{lon} {lat}" for lon, lat in coordinates])
+        # coordinates already in (lon, lat) order; one format call for the whole ring
+        coords_str = ", ".join(["%.7f %.7f"] * len(coords)) % tuple(coords.ravel().tolist())
         return f"POLYGON(({coords_str}))"
 
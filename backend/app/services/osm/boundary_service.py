@@ -41,13 +41,18 @@ class BoundaryService:
         adapter = HTTPAdapter(max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
+        # Sent with every request; Overpass compresses responses when asked
+        self.session.headers.update({
+            "User-Agent": "PolicePatrol-Boundary-Importer/1.0",
+            "Accept-Encoding": "gzip, deflate",
+        })
 
     def fetch_boundary_by_name(
         self,
         name: str,
         admin_level: int = 6,
         bbox: Optional[Tuple[float, float, float, float]] = None,
-    ) -> str:
+    ) -> bytes:
         """
         Fetch administrative boundary from OSM by name and admin level.
 
@@ -57,7 +62,7 @@ class BoundaryService:
             bbox: Optional bounding box to limit search (min_lat, min_lng, max_lat, max_lng)
 
         Returns:
-            OSM XML data as string
+            OSM XML data as bytes
 
         Raises:
             requests.RequestException: If request fails
@@ -97,18 +102,18 @@ out geom;
                 self.api_url,
                 data={"data": query},
                 timeout=self.timeout,
-                headers={"User-Agent": "PolicePatrol-Boundary-Importer/1.0"},
             )
             response.raise_for_status()
 
-            logger.info(f"Successfully fetched boundary data ({len(response.text)} bytes)")
-            return response.text
+            logger.info(f"Successfully fetched boundary data ({len(response.content)} bytes)")
+            # Raw bytes: the parser streams them without a decode/re-encode round trip
+            return response.content
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to fetch boundary: {str(e)}")
             raise
 
-    def fetch_boundary_by_relation_id(self, relation_id: int) -> str:
+    def fetch_boundary_by_relation_id(self, relation_id: int) -> bytes:
         """
         Fetch administrative boundary from OSM by relation ID.
 
@@ -116,7 +121,7 @@ out geom;
             relation_id: OSM relation ID
 
         Returns:
-            OSM XML data as string
+            OSM XML data as bytes
 
         Raises:
             requests.RequestException: If request fails
@@ -137,12 +142,12 @@ out geom;
                 self.api_url,
                 data={"data": query},
                 timeout=self.timeout,
-                headers={"User-Agent": "PolicePatrol-Boundary-Importer/1.0"},
             )
             response.raise_for_status()
 
-            logger.info(f"Successfully fetched boundary data ({len(response.text)} bytes)")
-            return response.text
+            logger.info(f"Successfully fetched boundary data ({len(response.content)} bytes)")
+            # Raw bytes: the parser streams them without a decode/re-encode round trip
+            return response.content
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to fetch boundary: {str(e)}")
@@ -0,0 +1,101 @@
+"""Status tracking for long-running OSM background jobs.
+
+Job records live in Redis only, so every API worker sees the same status.
+The request path (create/get) uses the async client with short timeouts;
+the background runner updates records through the sync client.
+"""
+
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import Dict, Optional
+
+import redis.asyncio as aioredis
+
+from app.core.config import get_settings
+from app.db.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+JOB_KEY_PREFIX = "osm:job:"
+JOB_TTL_SECONDS = 24 * 3600
+
+_async_redis = aioredis.from_url(
+    settings.redis_url,
+    decode_responses=True,
+    socket_connect_timeout=1,
+    socket_timeout=1,
+)
+
+
+class JobStoreUnavailable(Exception):
+    """Raised when job status cannot be read from or written to Redis."""
+
+
+def _job_key(job_id: str) -> str:
+    return f"{JOB_KEY_PREFIX}{job_id}"
+
+
+async def create_job(job_type: str, params: Optional[Dict] = None) -> str:
+    """
+    Register a new pending job.
+
+    Args:
+        job_type: Job kind (e.g. "import", "refresh_topology", "import_boundary")
+        params: Request parameters, stored for reference
+
+    Returns:
+        New job ID
+
+    Raises:
+        JobStoreUnavailable: If the job record could not be persisted
+    """
+    job_id = uuid.uuid4().hex
+    job = {
+        "job_id": job_id,
+        "type": job_type,
+        "status": "pending",
+        "params": params or {},
+        "created_at": datetime.utcnow().isoformat(),
+    }
+    try:
+        await _async_redis.setex(_job_key(job_id), JOB_TTL_SECONDS, json.dumps(job, default=str))
+    except Exception as e:
+        logger.error(f"Failed to store OSM job {job_id} in Redis: {str(e)}")
+        raise JobStoreUnavailable(str(e)) from e
+    return job_id
+
+
+async def get_job(job_id: str) -> Optional[Dict]:
+    """
+    Return the job record, or None if unknown or expired.
+
+    Raises:
+        JobStoreUnavailable: If Redis cannot be reached
+    """
+    try:
+        data = await _async_redis.get(_job_key(job_id))
+    except Exception as e:
+        logger.error(f"Failed to read OSM job {job_id} from Redis: {str(e)}")
+        raise JobStoreUnavailable(str(e)) from e
+    return json.loads(data) if data else None
+
+
+def update_job(job_id: str, **fields):
+    """
+    Merge fields into the stored job record (called from the background runner).
+
+    Failures are logged and swallowed so the job itself keeps running.
+    """
+    key = _job_key(job_id)
+    try:
+        data = redis_client.get(key)
+        job = json.loads(data) if data else {"job_id": job_id}
+        job.update(fields)
+        job["updated_at"] = datetime.utcnow().isoformat()
+        redis_client.setex(key, JOB_TTL_SECONDS, json.dumps(job, default=str))
+    except Exception as e:
+        logger.warning(f"Failed to update OSM job {job_id} in Redis: {str(e)}")
@@ -1,7 +1,12 @@
 """Database import service for OSM road segments."""
 
+import csv
+import io
 import logging
+import struct
 from typing import List, Optional
+
+import numpy as np
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from geoalchemy2 import Geography
@@ -11,6 +16,82 @@ from app.services.osm.osm_parser import RoadSegmentData
 
 logger = logging.getLogger(__name__)
 
+# EWKB LINESTRING header: little-endian, type 2 with the SRID flag, SRID 4326
+_EWKB_LINESTRING_SRID = 0x20000002
+# followed by the point count
+_EWKB_HEADER = struct.Struct("<BIII")
+
+
+def linestring_ewkb(coords: np.ndarray, srid: int = 4326) -> bytes:
+    """
+    Encode (lon, lat) rows as a little-endian EWKB LINESTRING.
+
+    The coordinate doubles are copied straight from the array, so PostGIS
+    receives exact values without float -> text -> float round trips.
+    """
+    points = np.ascontiguousarray(coords, dtype="<f8")
+    return (
+        _EWKB_HEADER.pack(1, _EWKB_LINESTRING_SRID, srid, points.shape[0])
+        + points.tobytes()
+    )
+
+
+def road_rows_csv(rows) -> io.StringIO:
+    """
+    Serialize (id, ewkb, road_type, speed_limit, one_way) rows for COPY ... (FORMAT csv).
+
+    None is written as an empty unquoted field, which COPY reads as NULL;
+    geometry goes in bytea hex input format.
+    """
+    buf = io.StringIO()
+    csv.writer(buf).writerows(
+        (osm_id, "\\x" + ewkb.hex(), road_type, speed_limit, one_way)
+        for osm_id, ewkb, road_type, speed_limit, one_way in rows
+    )
+    buf.seek(0)
+    return buf
+
+
+# Per-session staging table for bulk loads (dropped at commit)
+_STAGE_TABLE_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS road_segment_stage (
+        id BIGINT,
+        geom BYTEA,
+        road_type VARCHAR(50),
+        speed_limit INT,
+        one_way BOOLEAN
+    ) ON COMMIT DROP
+"""
+
+_COPY_TO_STAGE_SQL = (
+    "COPY road_segment_stage (id, geom, road_type, speed_limit, one_way) FROM STDIN WITH (FORMAT csv)"
+)
+
+_UPSERT_FROM_STAGE_SQL = """
+    INSERT INTO road_segment (id, geom, road_type, speed_limit, one_way)
+    SELECT DISTINCT ON (s.id)
+        s.id, ST_GeogFromWKB(s.geom), s.road_type, s.speed_limit, s.one_way
+    FROM road_segment_stage s
+    ORDER BY s.id
+    ON CONFLICT (id) DO UPDATE SET
+        geom = EXCLUDED.geom,
+        road_type = EXCLUDED.road_type,
+        speed_limit = EXCLUDED.speed_limit,
+        one_way = EXCLUDED.one_way
+"""
+
+
+# Per-row upsert, used only to salvage a batch whose bulk load failed
+_UPSERT_ROW_SQL = text("""
+    INSERT INTO road_segment (id, geom, road_type, speed_limit, one_way)
+    VALUES (:id, ST_GeogFromWKB(:geom), :road_type, :speed_limit, :one_way)
+    ON CONFLICT (id) DO UPDATE SET
+        geom = EXCLUDED.geom,
+        road_type = EXCLUDED.road_type,
+        speed_limit = EXCLUDED.speed_limit,
+        one_way = EXCLUDED.one_way
+""")
+
 
 class OSMImporter:
     """Service for importing OSM road segments into database."""
@@ -86,6 +167,9 @@ class OSMImporter:
         """
         Import a batch of road segments.
 
+        The batch is streamed into a temporary staging table with COPY and
+        merged into road_segment with a single INSERT ... ON CONFLICT statement.
+
         Args:
             road_segments: List of RoadSegmentData objects
 
@@ -94,66 +178,77 @@ class OSMImporter:
         """
         stats = {"imported": 0, "skipped": 0, "errors": 0}
 
+        rows = []
         for segment_data in road_segments:
-            try:
-                # Convert coordinates to LineString WKT
-                # RoadSegmentData.geom_coordinates already uses (lon, lat) order - standard GeoJSON/PostGIS format
-                coords_wkt = ", ".join(
-                    [f"{lon} {lat}" for lon, lat in segment_data.geom_coordinates]
-                )
-                linestring_wkt = f"LINESTRING({coords_wkt})"
+            if len(segment_data.geom_coordinates) < 2:
+                logger.warning(f"Failed to import segment {segment_data.osm_id}: LineString needs at least 2 points")
+                stats["errors"] += 1
+                continue
+            # RoadSegmentData.geom_coordinates is an (N, 2) array already in (lon, lat) order - standard GeoJSON/PostGIS format
+            rows.append((
+                segment_data.osm_id,
+                linestring_ewkb(segment_data.geom_coordinates),
+                segment_data.road_type,
+                segment_data.speed_limit,
+                segment_data.one_way,
+            ))
+
+        if not rows:
+            return stats
 
-                # No boundary filtering here - Overpass API already filters by relation/polygon/bbox
-                # The data fetched from Overpass API is already filtered, so we trust it and import directly
+        buf = road_rows_csv(rows)
 
-                # Check if segment already exists
-                existing = self.db.query(RoadSegment).filter(RoadSegment.id == segment_data.osm_id).first()
+        # No boundary filtering here - Overpass API already filters by relation/polygon/bbox
+        try:
+            # Savepoint: a failed batch must not abort the surrounding import transaction
+            with self.db.begin_nested():
+                cursor = self.db.connection().connection.cursor()
+                try:
+                    cursor.execute(_STAGE_TABLE_SQL)
+                    cursor.execute("TRUNCATE road_segment_stage")
+                    cursor.copy_expert(_COPY_TO_STAGE_SQL, buf)
+                    cursor.execute(_UPSERT_FROM_STAGE_SQL)
+                    stats["imported"] += cursor.rowcount
+                finally:
+                    cursor.close()
+        except Exception as e:
+            logger.warning(
+                f"Bulk import of {len(rows)} segments failed, retrying row by row: {str(e)}"
+            )
+            row_stats = self._import_rows_individually(rows)
+            stats["imported"] += row_stats["imported"]
+            stats["errors"] += row_stats["errors"]
 
-                # Use raw SQL to insert geometry properly
-                geom_sql = text(f"ST_GeogFromText('SRID=4326;{linestring_wkt}')")
+        return stats
 
-                if existing:
-                    # Update existing segment using raw SQL
-                    self.db.execute(
-                        text("""
-                            UPDATE road_segment 
-                            SET geom = ST_GeogFromText(:wkt),
-                                road_type = :road_type,
-                                speed_limit = :speed_limit,
-                                one_way = :one_way
-                            WHERE id = :id
-                        """),
-                        {
-                            "wkt": f"SRID=4326;{linestring_wkt}",
-                            "road_type": segment_data.road_type,
-                            "speed_limit": segment_data.speed_limit,
-                            "one_way": segment_data.one_way,
-                            "id": segment_data.osm_id,
-                        },
-                    )
-                    stats["imported"] += 1
-                else:
-                    # Insert new segment using raw SQL
+    def _import_rows_individually(self, rows: List[tuple]) -> dict:
+        """
+        Upsert rows one statement each, isolating the ones that fail.
+
+        Args:
+            rows: (id, ewkb, road_type, speed_limit, one_way) tuples
+
+        Returns:
+            Dictionary with imported/errors counts
+        """
+        stats = {"imported": 0, "errors": 0}
+        for osm_id, ewkb, road_type, speed_limit, one_way in rows:
+            try:
+                with self.db.begin_nested():
                     self.db.execute(
-                        text("""
-                            INSERT INTO road_segment (id, geom, road_type, speed_limit, one_way)
-                            VALUES (:id, ST_GeogFromText(:wkt), :road_type, :speed_limit, :one_way)
-                        """),
+                        _UPSERT_ROW_SQL,
                         {
-                            "id": segment_data.osm_id,
-                            "wkt": f"SRID=4326;{linestring_wkt}",
-                            "road_type": segment_data.road_type,
-                            "speed_limit": segment_data.speed_limit,
-                            "one_way": segment_data.one_way,
+                            "id": osm_id,
+                            "geom": ewkb,
+                            "road_type": road_type,
+                            "speed_limit": speed_limit,
+                            "one_way": one_way,
                         },
                     )
-                    stats["imported"] += 1
-
+                stats["imported"] += 1
             except Exception as e:
-                logger.warning(f"Failed to import segment {segment_data.osm_id}: {str(e)}")
+                logger.warning(f"Failed to import segment {osm_id}: {str(e)}")
                 stats["errors"] += 1
-                continue
-
         return stats
 
     def get_import_statistics(self) -> dict:
@@ -237,33 +332,38 @@ class OSMImporter:
             deleted_count = self.db.execute(
                 text("""
                     WITH boundary_geom AS (
-                        SELECT geom FROM administrative_boundary 
+                        SELECT geom::geometry AS geom FROM administrative_boundary 
                         WHERE name = 'Küçükçekmece' AND admin_level = 6 LIMIT 1
                     )
                     DELETE FROM road_segment rs
                     WHERE NOT (
-                        -- Motorway/trunk: only check intersection (they often cross boundaries)
-                        (rs.road_type IN ('motorway', 'trunk') AND ST_Intersects(
-                            rs.geom::geometry,
-                            (SELECT geom::geometry FROM boundary_geom)
-                        ))
-                        OR
-                        -- Other roads: center within OR at least 30% length within
-                        (rs.road_type NOT IN ('motorway', 'trunk') AND (
-                            ST_Within(
-                                ST_Centroid(rs.geom::geometry),
-                                (SELECT geom::geometry FROM boundary_geom)
-                            )
+                        -- Cheap 2D bbox overlap first: segments whose bbox misses the
+                        -- boundary are deleted without the exact geometry tests below
+                        rs.geom::geometry && (SELECT geom FROM boundary_geom)
+                        AND (
+                            -- Motorway/trunk: only check intersection (they often cross boundaries)
+                            (rs.road_type IN ('motorway', 'trunk') AND ST_Intersects(
+                                rs.geom::geometry,
+                                (SELECT geom FROM boundary_geom)
+                            ))
                             OR
-                            (
-                                ST_Length(
-                                    ST_Intersection(
-                                        rs.geom::geometry,
-                                        (SELECT geom::geometry FROM boundary_geom)
-                                    )
-                                ) / NULLIF(ST_Length(rs.geom::geometry), 0)
-                            ) >= 0.3
-                        ))
+                            -- Other roads: center within OR at least 30% length within
+                            (rs.road_type NOT IN ('motorway', 'trunk') AND (
+                                ST_Within(
+                                    ST_Centroid(rs.geom::geometry),
+                                    (SELECT geom FROM boundary_geom)
+                                )
+                                OR
+                                (
+                                    ST_Length(
+                                        ST_Intersection(
+                                            rs.geom::geometry,
+                                            (SELECT geom FROM boundary_geom)
+                                        )
+                                    ) / NULLIF(ST_Length(rs.geom::geometry), 0)
+                                ) >= 0.3
+                            ))
+                        )
                     )
                 """)
             ).rowcount
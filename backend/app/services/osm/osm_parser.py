@@ -1,29 +1,53 @@
 """OSM XML/JSON parser and transformer."""
 
+import io
 import logging
+import re
 import xml.etree.ElementTree as ET
-from typing import Dict, List, Optional, Tuple
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 
+import numpy as np
+import orjson
+
+try:
+    from lxml import etree as LET
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+_XML_PARSE_ERRORS = (ET.ParseError, LET.XMLSyntaxError) if LXML_AVAILABLE else (ET.ParseError,)
+
+# First run of digits in a maxspeed tag ("50", "50 km/h", "50kph", ...)
+_MAXSPEED_RE = re.compile(r"\d+")
 
-@dataclass
+# oneway tag values: travel along the way's node order, or against it
+_ONEWAY_FORWARD = frozenset({"yes", "true", "1"})
+_ONEWAY_REVERSE = frozenset({"-1", "reverse"})
+
+
+@dataclass(slots=True)
 class RoadSegmentData:
-    """Road segment data structure."""
+    """Road segment data structure (slotted: imports hold 100k+ instances)."""
 
     osm_id: int
-    geom_coordinates: List[Tuple[float, float]]  # List of (lon, lat) tuples - standard GeoJSON/PostGIS order
+    # (N, 2) float64 array of (lon, lat) rows - standard GeoJSON/PostGIS order.
+    # One packed array per segment instead of N tuples of boxed floats.
+    geom_coordinates: np.ndarray
     road_type: Optional[str] = None
     speed_limit: Optional[int] = None
     one_way: bool = False
 
 
 class OSMParser:
-    """Parser for OSM XML data."""
+    """Parser for OSM XML and Overpass JSON data."""
 
     # Highway type to road_type mapping
     # Only driveable roads - exclude pedestrian, footway, cycleway, path, etc.
+    # Segments store these value objects directly, so every segment of a type
+    # shares one str; never build road_type from the (per-element) tag string.
     HIGHWAY_TYPE_MAPPING = {
         "motorway": "motorway",
         "trunk": "trunk",
@@ -49,67 +73,175 @@ class OSMParser:
         "unclassified": 50,
     }
 
-    def __init__(self):
+    def __init__(
+        self,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        server_filtered: bool = False,
+    ):
         """
         Initialize OSM parser.
-        No bbox filtering - Overpass API already filters the data.
+
+        Args:
+            bbox: Optional (min_lat, min_lng, max_lat, max_lng); when given, only ways
+                with at least one point inside are kept
+            server_filtered: True when the data comes from an Overpass query built
+                for this area, so every way is already inside it and the bbox
+                filter is skipped. Leave False for third-party dumps.
         """
-        pass
+        self.bbox = bbox
+        self.server_filtered = server_filtered
 
-    def parse_xml(self, xml_data: str) -> List[RoadSegmentData]:
+    def parse_xml(self, xml_data: Union[str, bytes, BinaryIO]) -> List[RoadSegmentData]:
         """
         Parse OSM XML data and extract road segments.
         Supports both standard OSM format (with separate nodes) and 'out geom' format (with coordinates in nd elements).
 
+        The document is streamed in a single pass (Overpass emits nodes before
+        ways), so each element is released as soon as it has been read.
+
         Args:
-            xml_data: OSM XML data as string
+            xml_data: OSM XML data as bytes (as returned by OverpassClient) or a
+                binary file-like object (e.g. a streamed HTTP response, parsed as
+                it is read); str input is accepted but costs an extra encode pass
 
         Returns:
             List of RoadSegmentData objects
         """
         try:
-            root = ET.fromstring(xml_data)
-            logger.info(f"Parsing OSM XML with {len(root)} elements")
-
-            # Extract nodes first (for way coordinates) - standard OSM format
+            # Nodes (for way coordinates) - standard OSM format
             nodes: Dict[int, Tuple[float, float]] = {}
-            for node in root.findall("node"):
-                node_id = int(node.get("id"))
-                lat = float(node.get("lat"))
-                lon = float(node.get("lon"))
-                nodes[node_id] = (lat, lon)
-            
-            logger.info(f"Found {len(nodes)} nodes in XML")
-
-            # Extract ways (road segments)
             road_segments: List[RoadSegmentData] = []
             ways_count = 0
-            for way in root.findall("way"):
-                ways_count += 1
-                way_id = int(way.get("id"))
-                road_segment = self._parse_way(way, way_id, nodes)
-                if road_segment:
-                    road_segments.append(road_segment)
-            
+
+            for elem in self._iter_elements(xml_data):
+                if elem.tag == "node":
+                    nodes[int(elem.get("id"))] = (float(elem.get("lat")), float(elem.get("lon")))
+                else:
+                    ways_count += 1
+                    road_segment = self._parse_way(elem, int(elem.get("id")), nodes)
+                    if road_segment:
+                        road_segments.append(road_segment)
+
+            road_segments = self._filter_by_bbox(road_segments)
+            logger.info(f"Found {len(nodes)} nodes in XML")
             logger.info(f"Processed {ways_count} ways, found {len(road_segments)} valid road segments")
             logger.info(f"Parsed {len(road_segments)} road segments from OSM data")
             return road_segments
 
-        except ET.ParseError as e:
+        except _XML_PARSE_ERRORS as e:
             logger.error(f"Failed to parse OSM XML: {str(e)}")
             raise ValueError(f"Invalid OSM XML data: {str(e)}")
         except Exception as e:
             logger.error(f"Unexpected error parsing OSM data: {str(e)}")
             raise
 
+    def parse_json(self, json_data: Union[str, bytes]) -> List[RoadSegmentData]:
+        """
+        Parse Overpass JSON output ([out:json]) and extract road segments.
+        With 'out geom' each way carries its own coordinates, so no node lookup is needed.
+
+        Args:
+            json_data: Overpass JSON response body
+
+        Returns:
+            List of RoadSegmentData objects
+        """
+        try:
+            doc = orjson.loads(json_data)
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Failed to parse OSM JSON: {str(e)}")
+            raise ValueError(f"Invalid OSM JSON data: {str(e)}")
+
+        # Overpass reports runtime errors (e.g. timeouts) as a remark with HTTP 200
+        if doc.get("remark"):
+            logger.warning(f"Overpass remark: {doc['remark']}")
+
+        elements = doc.get("elements", [])
+        nodes: Dict[int, Tuple[float, float]] = {
+            el["id"]: (el["lat"], el["lon"]) for el in elements if el.get("type") == "node"
+        }
+
+        road_segments: List[RoadSegmentData] = []
+        ways_count = 0
+        for element in elements:
+            if element.get("type") != "way":
+                continue
+            ways_count += 1
+            road_segment = self._parse_json_way(element, nodes)
+            if road_segment:
+                road_segments.append(road_segment)
+
+        road_segments = self._filter_by_bbox(road_segments)
+        logger.info(f"Processed {ways_count} ways, found {len(road_segments)} valid road segments")
+        logger.info(f"Parsed {len(road_segments)} road segments from OSM data")
+        return road_segments
+
+    def _filter_by_bbox(self, road_segments: List[RoadSegmentData]) -> List[RoadSegmentData]:
+        """
+        Keep segments with at least one point inside self.bbox.
+
+        All coordinates are tested in one vectorized pass and reduced per
+        segment with np.logical_or.reduceat over the segment offsets.
+        """
+        if not self.bbox or self.server_filtered or not road_segments:
+            return road_segments
+
+        min_lat, min_lng, max_lat, max_lng = self.bbox
+        lengths = np.fromiter(
+            (seg.geom_coordinates.shape[0] for seg in road_segments),
+            dtype=np.int64,
+            count=len(road_segments),
+        )
+        offsets = np.zeros(len(road_segments), dtype=np.int64)
+        np.cumsum(lengths[:-1], out=offsets[1:])
+
+        # geom_coordinates are (lon, lat)
+        coords = np.concatenate([seg.geom_coordinates for seg in road_segments])
+        lons, lats = coords[:, 0], coords[:, 1]
+        inside = (lats >= min_lat) & (lats <= max_lat) & (lons >= min_lng) & (lons <= max_lng)
+        keep = np.logical_or.reduceat(inside, offsets)
+
+        kept = [seg for seg, k in zip(road_segments, keep.tolist()) if k]
+        if len(kept) < len(road_segments):
+            logger.info(f"Bbox filter dropped {len(road_segments) - len(kept)} road segments")
+        return kept
+
+    def _iter_elements(self, xml_data: Union[str, bytes, BinaryIO]):
+        """
+        Stream top-level node and way elements, clearing each after use.
+
+        Uses lxml's iterparse when available, the stdlib parser otherwise.
+        """
+        if hasattr(xml_data, "read"):
+            source = xml_data
+        elif isinstance(xml_data, str):
+            # Parsers consume bytes; prefer passing response.content to avoid this copy
+            source = io.BytesIO(xml_data.encode("utf-8"))
+        else:
+            source = io.BytesIO(xml_data)
+
+        if LXML_AVAILABLE:
+            for _, elem in LET.iterparse(source, events=("end",), tag=("node", "way")):
+                yield elem
+                elem.clear()
+                # Drop already-processed siblings still referenced by the root
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+            return
+
+        for _, elem in ET.iterparse(source, events=("end",)):
+            if elem.tag in ("node", "way"):
+                yield elem
+                elem.clear()
+
     def _parse_way(
-        self, way: ET.Element, way_id: int, nodes: Dict[int, Tuple[float, float]]
+        self, way, way_id: int, nodes: Dict[int, Tuple[float, float]]
     ) -> Optional[RoadSegmentData]:
         """
         Parse a single OSM way element.
 
         Args:
-            way: OSM way element
+            way: OSM way element (lxml or ElementTree)
             way_id: Way ID
             nodes: Dictionary of node_id -> (lat, lon) - OSM format
 
@@ -117,14 +249,86 @@ class OSMParser:
             RoadSegmentData or None if invalid
             Note: RoadSegmentData.geom_coordinates uses (lon, lat) order - standard GeoJSON/PostGIS format
         """
-        # Extract tags
+        # Extract tags and coordinates in a single pass over the children
+        # Support both standard format (nd has ref attribute) and 'out geom' format (nd has lat/lon attributes)
+        # Store as (lon, lat) - standard GeoJSON/PostGIS order
         tags = {}
-        for tag in way.findall("tag"):
-            key = tag.get("k")
-            value = tag.get("v")
-            if key and value:
-                tags[key] = value
+        coordinates: List[Tuple[float, float]] = []
+        missing_nodes = []
+        for child in way:
+            child_tag = child.tag
+            if child_tag == "nd":
+                lat = child.get("lat")
+                lon = child.get("lon")
+                # Check if nd has lat/lon attributes (out geom format)
+                if lat is not None and lon is not None:
+                    coordinates.append((float(lon), float(lat)))
+                else:
+                    # Standard format: use node reference
+                    # nodes dict stores (lat, lon), convert to (lon, lat)
+                    node_id = int(child.get("ref"))
+                    node = nodes.get(node_id)
+                    if node is not None:
+                        coordinates.append((node[1], node[0]))
+                    else:
+                        missing_nodes.append(node_id)
+            elif child_tag == "tag":
+                key = child.get("k")
+                value = child.get("v")
+                if key and value:
+                    tags[key] = value
+
+        road_type = self._driveable_road_type(tags)
+        if not road_type:
+            return None
+
+        # Log warning if many nodes are missing (might indicate incomplete data)
+        if missing_nodes and len(missing_nodes) > len(coordinates):
+            logger.debug(f"Way {way_id} has {len(missing_nodes)} missing nodes out of {len(missing_nodes) + len(coordinates)} total")
+
+        return self._build_segment(way_id, tags, road_type, coordinates)
 
+    def _parse_json_way(
+        self, element: dict, nodes: Dict[int, Tuple[float, float]]
+    ) -> Optional[RoadSegmentData]:
+        """
+        Parse a single way from Overpass JSON output.
+
+        Args:
+            element: Way element ('out geom' adds a 'geometry' list of {lat, lon})
+            nodes: Dictionary of node_id -> (lat, lon), used when geometry is absent
+
+        Returns:
+            RoadSegmentData or None if invalid
+        """
+        tags = element.get("tags") or {}
+        road_type = self._driveable_road_type(tags)
+        if not road_type:
+            return None
+
+        geometry = element.get("geometry")
+        if geometry is not None:
+            # Overpass emits null for nodes it could not resolve
+            coordinates = [(pt["lon"], pt["lat"]) for pt in geometry if pt]
+        else:
+            coordinates = []
+            for node_id in element.get("nodes", ()):
+                if node_id in nodes:
+                    lat, lon = nodes[node_id]
+                    coordinates.append((lon, lat))
+
+        return self._build_segment(element["id"], tags, road_type, coordinates)
+
+    def _driveable_road_type(self, tags: Dict[str, str]) -> Optional[str]:
+        """
+        Map highway tags to a driveable road_type.
+
+        Args:
+            tags: OSM tags dictionary
+
+        Returns:
+            road_type, or None if the way is not a driveable road
+        """
         # Check if it's a highway
         highway_type = tags.get("highway")
         if not highway_type:
@@ -148,56 +352,51 @@ class OSMParser:
             if access in ["no", "private", "permit", "delivery", "agricultural", "forestry"]:
                 return None
 
-        # Map highway type (only driveable roads)
-        road_type = self.HIGHWAY_TYPE_MAPPING.get(highway_type)
-        if not road_type:
-            # Unknown highway type, skip it
-            return None
+        # Map highway type (only driveable roads); unknown highway types are skipped
+        return self.HIGHWAY_TYPE_MAPPING.get(highway_type)
 
-        # Extract coordinates from nd (node) references
-        # Support both standard format (nd has ref attribute) and 'out geom' format (nd has lat/lon attributes)
-        # Store as (lon, lat) - standard GeoJSON/PostGIS order
-        coordinates: List[Tuple[float, float]] = []
-        missing_nodes = []
-        for nd in way.findall("nd"):
-            # Check if nd has lat/lon attributes (out geom format)
-            if nd.get("lat") is not None and nd.get("lon") is not None:
-                lat = float(nd.get("lat"))
-                lon = float(nd.get("lon"))
-                # Store as (lon, lat) - standard GeoJSON/PostGIS order
-                coordinates.append((lon, lat))
-            else:
-                # Standard format: use node reference
-                # nodes dict stores (lat, lon), convert to (lon, lat)
-                node_id = int(nd.get("ref"))
-                if node_id in nodes:
-                    lat, lon = nodes[node_id]
-                    coordinates.append((lon, lat))
-                else:
-                    missing_nodes.append(node_id)
-        
-        # Log warning if many nodes are missing (might indicate incomplete data)
-        if missing_nodes and len(missing_nodes) > len(coordinates):
-            logger.debug(f"Way {way_id} has {len(missing_nodes)} missing nodes out of {len(missing_nodes) + len(coordinates)} total")
+    def _build_segment(
+        self,
+        way_id: int,
+        tags: Dict[str, str],
+        road_type: str,
+        coordinates: List[Tuple[float, float]],
+    ) -> Optional[RoadSegmentData]:
+        """
+        Build a RoadSegmentData from parsed way data.
+
+        Args:
+            way_id: Way ID
+            tags: OSM tags dictionary
+            road_type: Driveable road type
+            coordinates: (lon, lat) tuples
 
+        Returns:
+            RoadSegmentData or None if the geometry is too short
+        """
         # Validate coordinates
         if len(coordinates) < 2:
             logger.debug(f"Way {way_id} has less than 2 coordinates, skipping")
             return None
 
-        # No bbox filtering in parser - Overpass API already filtered by relation/polygon/bbox
-        # Parser just processes the data that Overpass API returned
-        # bbox parameter kept for backward compatibility but not used for filtering
+        # Optional bbox filtering runs once over all segments (see _filter_by_bbox);
+        # Overpass responses are already filtered by relation/polygon/bbox
 
         # Extract speed limit
         speed_limit = self._extract_speed_limit(tags, road_type)
 
         # Extract one-way information
-        one_way = self._extract_one_way(tags)
+        direction = self._extract_one_way(tags)
+        geom_coordinates = np.array(coordinates, dtype=np.float64)
+        if direction < 0:
+            # oneway=-1: store the geometry in travel direction so routing
+            # costs (forward open, reverse blocked) apply the right way round
+            geom_coordinates = geom_coordinates[::-1].copy()
+        one_way = direction != 0
 
         return RoadSegmentData(
             osm_id=way_id,
-            geom_coordinates=coordinates,
+            geom_coordinates=geom_coordinates,
             road_type=road_type,
             speed_limit=speed_limit,
             one_way=one_way,
@@ -217,22 +416,15 @@ class OSMParser:
         # Try maxspeed tag first
         maxspeed = tags.get("maxspeed")
         if maxspeed:
-            try:
-                # Handle various formats: "50", "50 km/h", "50kph", etc.
-                maxspeed_clean = maxspeed.lower().replace("km/h", "").replace("kph", "").strip()
-                # Extract numbers
-                import re
-
-                numbers = re.findall(r"\d+", maxspeed_clean)
-                if numbers:
-                    return int(numbers[0])
-            except (ValueError, AttributeError):
-                pass
+            # Handle various formats: "50", "50 km/h", "50kph", etc. - first number wins
+            match = _MAXSPEED_RE.search(maxspeed)
+            if match:
+                return int(match.group(0))
 
         # Fallback to default based on road type
         return self.SPEED_LIMIT_MAPPING.get(road_type)
 
-    def _extract_one_way(self, tags: Dict[str, str]) -> bool:
+    def _extract_one_way(self, tags: Dict[str, str]) -> int:
         """
         Extract one-way information from tags.
 
@@ -240,10 +432,21 @@ class OSMParser:
             tags: OSM tags dictionary
 
         Returns:
-            True if one-way, False otherwise
+            1 if one-way along the node order, -1 if one-way against it, 0 otherwise
         """
-        oneway = tags.get("oneway", "no").lower()
-        return oneway in ("yes", "true", "1", "-1")
+        oneway = tags.get("oneway")
+        if oneway is None:
+            return 0
+        if oneway in _ONEWAY_FORWARD:
+            return 1
+        if oneway in _ONEWAY_REVERSE:
+            return -1
+        oneway = oneway.lower()
+        if oneway in _ONEWAY_FORWARD:
+            return 1
+        if oneway in _ONEWAY_REVERSE:
+            return -1
+        return 0
 
     def validate_geometry(self, coordinates: List[Tuple[float, float]]) -> bool:
         """
@@ -258,15 +461,17 @@ class OSMParser:
         if len(coordinates) < 2:
             return False
 
-        # Check coordinate ranges
-        for lat, lng in coordinates:
-            if not (-90 <= lat <= 90) or not (-180 <= lng <= 180):
-                return False
+        coords = np.asarray(coordinates, dtype=np.float64)
+        lats, lngs = coords[:, 0], coords[:, 1]
+
+        # Check coordinate ranges (written so NaN fails the check)
+        in_range = (lats >= -90) & (lats <= 90) & (lngs >= -180) & (lngs <= 180)
+        if not in_range.all():
+            return False
 
         # Check for duplicate consecutive points
-        for i in range(len(coordinates) - 1):
-            if coordinates[i] == coordinates[i + 1]:
-                return False
+        if (coords[1:] == coords[:-1]).all(axis=1).any():
+            return False
 
         return True
 
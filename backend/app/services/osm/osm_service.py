@@ -1,12 +1,12 @@
 """Main OSM import service orchestrator."""
 
 import logging
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
 from app.services.osm.overpass_client import OverpassClient
-from app.services.osm.osm_parser import OSMParser
+from app.services.osm.osm_parser import OSMParser, RoadSegmentData
 from app.services.osm.osm_importer import OSMImporter
 from app.services.osm.routing_topology import RoutingTopology
 
@@ -18,6 +18,8 @@ def import_osm_data(
     clear_existing: bool = False,
     create_topology: bool = True,
     highway_tags: Optional[list] = None,
+    bbox: Optional[Tuple[float, float, float, float]] = None,
+    shard_grid: Tuple[int, int] = (2, 2),
 ) -> Dict[str, any]:
     """
     Main function to import OSM data and create routing topology.
@@ -28,47 +30,51 @@ def import_osm_data(
         clear_existing: If True, clear existing road segments before import
         create_topology: If True, create pgRouting topology after import
         highway_tags: List of highway tag values to filter. If None, uses defaults
+        bbox: Optional (min_lat, min_lng, max_lat, max_lng). When given, the area
+            is fetched as a shard_grid of concurrent bbox queries instead of by
+            boundary relation
+        shard_grid: (rows, columns) used to split bbox
 
     Returns:
         Dictionary with import results and statistics
     """
     settings = get_settings()
 
-    # Get OSM relation ID from Küçükçekmece boundary - only method supported
-    from app.services.utils import get_kucukcekmece_boundary
+    # Get OSM relation ID from Küçükçekmece boundary (unless an explicit bbox is given)
+    # Single lookup of the boundary row; the polygon itself is not needed here
     from app.models.administrative_boundary import AdministrativeBoundary
     
-    boundary_geom = get_kucukcekmece_boundary(db)
     relation_id = None
-    
-    # Get OSM relation ID from database
-    if boundary_geom:
-        boundary_record = db.query(AdministrativeBoundary).filter(
+    if bbox is None:
+        boundary_record = db.query(AdministrativeBoundary.osm_id).filter(
             AdministrativeBoundary.name == settings.kucukcekmece_boundary_name,
             AdministrativeBoundary.admin_level == settings.kucukcekmece_boundary_admin_level
         ).first()
-        
-        if boundary_record and boundary_record.osm_id:
-            relation_id = boundary_record.osm_id
-            logger.info(f"Using OSM relation ID: {relation_id} for Küçükçekmece boundary")
+    
+        if boundary_record is not None:
+            if boundary_record.osm_id:
+                relation_id = boundary_record.osm_id
+                logger.info(f"Using OSM relation ID: {relation_id} for Küçükçekmece boundary")
+            else:
+                logger.warning("Küçükçekmece boundary found but no OSM relation ID. Import will fail.")
+                return {
+                    "success": False,
+                    "relation_id": None,
+                    "steps": {},
+                    "errors": ["Küçükçekmece boundary must have OSM relation ID. Please import boundary first."],
+                }
         else:
-            logger.warning("Küçükçekmece boundary found but no OSM relation ID. Import will fail.")
+            logger.warning("Küçükçekmece boundary not found. Please import boundary first.")
             return {
                 "success": False,
                 "relation_id": None,
                 "steps": {},
-                "errors": ["Küçükçekmece boundary must have OSM relation ID. Please import boundary first."],
+                "errors": ["Küçükçekmece boundary not found. Please import boundary first using POST /api/v1/osm/import-boundary"],
             }
-    else:
-        logger.warning("Küçükçekmece boundary not found. Please import boundary first.")
-        return {
-            "success": False,
-            "relation_id": None,
-            "steps": {},
-            "errors": ["Küçükçekmece boundary not found. Please import boundary first using POST /api/v1/osm/import-boundary"],
-        }
 
-    logger.info(f"Starting OSM import for Küçükçekmece (relation_id={relation_id})")
+        logger.info(f"Starting OSM import for Küçükçekmece (relation_id={relation_id})")
+    else:
+        logger.info(f"Starting sharded OSM import for bbox {bbox} (grid={shard_grid})")
 
     result = {
         "success": False,
@@ -95,44 +101,80 @@ def import_osm_data(
         result["steps"]["api_status"] = api_status
         logger.info(f"Overpass API is available (response time: {api_status.get('response_time_ms', 0):.2f}ms)")
 
-        # Step 2: Fetch OSM data - Overpass API filters by relation_id
-        logger.info("Step 2: Fetching OSM data from Overpass API using relation_id...")
-        logger.info(f"Using relation_id: {relation_id}")
-        try:
-            # Overpass API filters by relation_id - no manual filtering needed
-            xml_data = client.fetch_osm_data(
-                bbox=None,
-                highway_tags=highway_tags,
-                alternative_urls=alternative_urls,
-                relation_id=relation_id,
-                polygon_coords=None
-            )
-            result["steps"]["osm_data_fetched"] = {
-                "size_bytes": len(xml_data),
-                "success": True,
-            }
-            logger.info(f"Fetched {len(xml_data)} bytes of OSM data")
-        except Exception as e:
-            error_msg = f"Failed to fetch OSM data: {str(e)}"
-            logger.error(error_msg)
-            result["errors"].append(error_msg)
-            return result
+        if bbox is not None:
+            # Steps 2-3: Fetch bbox shards concurrently, parsing each as it arrives
+            logger.info("Steps 2-3: Fetching and parsing sharded OSM data from Overpass API...")
+            try:
+                road_segments, shard_bytes = _fetch_sharded_segments(
+                    client, bbox, highway_tags, alternative_urls, shard_grid
+                )
+                result["steps"]["osm_data_fetched"] = {
+                    "size_bytes": shard_bytes,
+                    "shards": shard_grid[0] * shard_grid[1],
+                    "streamed": False,
+                    "success": True,
+                }
+                result["steps"]["osm_parsed"] = {
+                    "segments_found": len(road_segments),
+                    "success": True,
+                }
+                logger.info(f"Parsed {len(road_segments)} road segments from {shard_bytes} bytes")
+            except Exception as e:
+                error_msg = f"Failed to fetch sharded OSM data: {str(e)}"
+                logger.error(error_msg)
+                result["errors"].append(error_msg)
+                return result
+        else:
+            # Step 2: Fetch OSM data - Overpass API filters by relation_id
+            logger.info("Step 2: Fetching OSM data from Overpass API using relation_id...")
+            logger.info(f"Using relation_id: {relation_id}")
+            # XML is parsed incrementally, so stream it; JSON needs the whole body anyway
+            stream = client.output_format == "xml"
+            try:
+                # Overpass API filters by relation_id - no manual filtering needed
+                osm_data = client.fetch_osm_data(
+                    bbox=None,
+                    highway_tags=highway_tags,
+                    alternative_urls=alternative_urls,
+                    relation_id=relation_id,
+                    polygon_coords=None,
+                    stream=stream,
+                )
+                result["steps"]["osm_data_fetched"] = {
+                    "size_bytes": None if stream else len(osm_data),
+                    "streamed": stream,
+                    "success": True,
+                }
+                if not stream:
+                    logger.info(f"Fetched {len(osm_data)} bytes of OSM data")
+            except Exception as e:
+                error_msg = f"Failed to fetch OSM data: {str(e)}"
+                logger.error(error_msg)
+                result["errors"].append(error_msg)
+                return result
 
-        # Step 3: Parse OSM data
-        logger.info("Step 3: Parsing OSM XML data...")
-        try:
-            parser = OSMParser()
-            road_segments = parser.parse_xml(xml_data)
-            result["steps"]["osm_parsed"] = {
-                "segments_found": len(road_segments),
-                "success": True,
-            }
-            logger.info(f"Parsed {len(road_segments)} road segments")
-        except Exception as e:
-            error_msg = f"Failed to parse OSM data: {str(e)}"
-            logger.error(error_msg)
-            result["errors"].append(error_msg)
-            return result
+            # Step 3: Parse OSM data
+            logger.info(f"Step 3: Parsing OSM {client.output_format.upper()} data...")
+            try:
+                # Overpass already restricted the ways to the relation area
+                parser = OSMParser(server_filtered=True)
+                if client.output_format == "json":
+                    road_segments = parser.parse_json(osm_data)
+                else:
+                    road_segments = parser.parse_xml(osm_data)
+                result["steps"]["osm_parsed"] = {
+                    "segments_found": len(road_segments),
+                    "success": True,
+                }
+                logger.info(f"Parsed {len(road_segments)} road segments")
+            except Exception as e:
+                error_msg = f"Failed to parse OSM data: {str(e)}"
+                logger.error(error_msg)
+                result["errors"].append(error_msg)
+                return result
+            finally:
+                if stream:
+                    osm_data.close()
 
         if len(road_segments) == 0:
             logger.warning("No road segments found in OSM data")
@@ -198,6 +240,45 @@ def import_osm_data(
         return result
 
 
+def _fetch_sharded_segments(
+    client: OverpassClient,
+    bbox: Tuple[float, float, float, float],
+    highway_tags: Optional[list],
+    alternative_urls: Optional[list],
+    shard_grid: Tuple[int, int],
+) -> Tuple[List[RoadSegmentData], int]:
+    """
+    Fetch a bbox as concurrent Overpass shards and parse them as they complete.
+
+    Ways crossing shard edges are returned by several shards; only the first
+    copy of each way ID is kept.
+
+    Returns:
+        (road segments, total response size in bytes)
+    """
+    # Each shard query is itself a bbox filter
+    parser = OSMParser(bbox=bbox, server_filtered=True)
+    seen_ids = set()
+    road_segments: List[RoadSegmentData] = []
+    total_bytes = 0
+    for chunk in client.fetch_osm_data_sharded(
+        bbox,
+        highway_tags=highway_tags,
+        alternative_urls=alternative_urls,
+        grid=shard_grid,
+    ):
+        total_bytes += len(chunk)
+        if client.output_format == "json":
+            shard_segments = parser.parse_json(chunk)
+        else:
+            shard_segments = parser.parse_xml(chunk)
+        for segment in shard_segments:
+            if segment.osm_id not in seen_ids:
+                seen_ids.add(segment.osm_id)
+                road_segments.append(segment)
+    return road_segments, total_bytes
+
+
 def get_osm_import_status(db: Session) -> Dict[str, any]:
     """
     Get status of OSM import and routing topology.
@@ -1,14 +1,24 @@
 """Overpass API client for fetching OSM data."""
 
+import gzip
+import hashlib
 import logging
+import os
+import tempfile
 import time
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# On-disk cache of Overpass responses (gzip), keyed by a hash of the query
+OVERPASS_CACHE_DIR = Path(tempfile.gettempdir()) / "osm_cache"
+OVERPASS_CACHE_TTL_SECONDS = 3600
+
 
 class OverpassClient:
     """Client for interacting with Overpass API."""
@@ -19,6 +29,8 @@ class OverpassClient:
         timeout: int = 300,
         max_retries: int = 3,
         retry_delay: float = 2.0,
+        output_format: str = "json",
+        cache_ttl_seconds: int = OVERPASS_CACHE_TTL_SECONDS,
     ):
         """
         Initialize Overpass API client.
@@ -28,11 +40,17 @@ class OverpassClient:
             timeout: Request timeout in seconds
             max_retries: Maximum number of retry attempts
             retry_delay: Delay between retries in seconds
+            output_format: Overpass output format, "json" (default) or "xml"
+            cache_ttl_seconds: How long a cached response is reused; 0 disables the cache
         """
+        if output_format not in ("json", "xml"):
+            raise ValueError(f"Unsupported Overpass output format: {output_format}")
         self.api_url = api_url
+        self.output_format = output_format
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.cache_ttl_seconds = cache_ttl_seconds
 
         # Configure session with retry strategy
         self.session = requests.Session()
@@ -42,9 +60,22 @@ class OverpassClient:
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["GET", "POST"],
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Pooled keep-alive connections: the status check and the fetch (or
+        # concurrent fetches) reuse TLS connections instead of reconnecting
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=4,
+            pool_maxsize=8,
+            pool_block=False,
+        )
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
+        # Sent with every request; Overpass compresses responses when asked
+        self.session.headers.update({
+            "User-Agent": "PolicePatrol-OSM-Importer/1.0",
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        })
 
     def build_bbox_query(
         self,
@@ -82,7 +113,7 @@ class OverpassClient:
 
         # Overpass QL query
         query = f"""
-[out:xml][timeout:300];
+[out:{self.output_format}][timeout:300];
 (
   way{highway_condition}({min_lat},{min_lng},{max_lat},{max_lng});
 );
@@ -127,7 +158,7 @@ out geom;
         # Overpass QL query using relation
         # First get relation, expand it, then convert to area and query ways
         query = f"""
-[out:xml][timeout:300];
+[out:{self.output_format}][timeout:300];
 (
   relation({relation_id});
 );
@@ -186,7 +217,7 @@ out geom;
 
         # Overpass QL query using polygon
         query = f"""
-[out:xml][timeout:300];
+[out:{self.output_format}][timeout:300];
 (
   way{highway_condition}(poly:"{poly_string}");
 );
@@ -202,7 +233,9 @@ out geom;
         alternative_urls: Optional[List[str]] = None,
         relation_id: Optional[int] = None,
         polygon_coords: Optional[List[Tuple[float, float]]] = None,
-    ) -> str:
+        stream: bool = False,
+        no_cache: bool = False,
+    ) -> Union[bytes, BinaryIO]:
         """
         Fetch OSM data from Overpass API, trying alternative endpoints if primary fails.
         Can use relation ID, polygon coordinates, or bounding box.
@@ -213,9 +246,13 @@ out geom;
             alternative_urls: List of alternative Overpass API URLs to try
             relation_id: OSM relation ID for administrative boundary (preferred method)
             polygon_coords: List of (lat, lng) tuples forming polygon boundary
+            stream: If True, return the undecoded response stream instead of
+                buffering the body; the caller must close it
+            no_cache: If True, bypass the on-disk response cache
 
         Returns:
-            OSM XML data as string
+            Raw response body (JSON or XML, see output_format), or a file-like
+            stream of it when stream=True
 
         Raises:
             requests.RequestException: If all endpoints fail after retries
@@ -229,6 +266,92 @@ out geom;
         else:
             raise ValueError("Must provide relation_id. Boundary must be imported first.")
 
+        return self._execute_query(query, alternative_urls, stream=stream, no_cache=no_cache)
+
+    def fetch_osm_data_sharded(
+        self,
+        bbox: Tuple[float, float, float, float],
+        highway_tags: Optional[List[str]] = None,
+        alternative_urls: Optional[List[str]] = None,
+        grid: Tuple[int, int] = (2, 2),
+        max_workers: int = 4,
+        no_cache: bool = False,
+    ) -> Iterator[bytes]:
+        """
+        Fetch a large bounding box as a grid of concurrent Overpass sub-queries.
+
+        Sub-queries run in a thread pool (network bound) and response bodies
+        are yielded as they complete, so parsing can start before the
+        slowest shard finishes. Ways crossing a shard edge appear in every
+        shard they touch; callers should de-duplicate by way ID.
+
+        Args:
+            bbox: Bounding box as (min_lat, min_lng, max_lat, max_lng)
+            highway_tags: List of highway tag values to filter (only driveable roads)
+            alternative_urls: List of alternative Overpass API URLs to try
+            grid: Number of (rows, columns) to split the bbox into
+            max_workers: Maximum number of concurrent requests
+            no_cache: If True, bypass the on-disk response cache
+
+        Yields:
+            Raw response body of each shard, in completion order
+
+        Raises:
+            requests.RequestException: If a shard fails on all endpoints
+            ValueError: If the grid is invalid
+        """
+        rows, cols = grid
+        if rows < 1 or cols < 1:
+            raise ValueError(f"Invalid shard grid: {grid}")
+
+        min_lat, min_lng, max_lat, max_lng = bbox
+        lat_step = (max_lat - min_lat) / rows
+        lng_step = (max_lng - min_lng) / cols
+        queries = [
+            self.build_bbox_query(
+                (
+                    min_lat + r * lat_step,
+                    min_lng + c * lng_step,
+                    max_lat if r == rows - 1 else min_lat + (r + 1) * lat_step,
+                    max_lng if c == cols - 1 else min_lng + (c + 1) * lng_step,
+                ),
+                highway_tags,
+            )
+            for r in range(rows)
+            for c in range(cols)
+        ]
+        logger.info(f"Fetching OSM data for bbox {bbox} in {len(queries)} shards")
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._execute_query, query, alternative_urls, False, no_cache)
+                for query in queries
+            ]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                # Consumer stopped early or a shard failed: drop pending shards
+                for future in futures:
+                    future.cancel()
+
+    def _execute_query(
+        self,
+        query: str,
+        alternative_urls: Optional[List[str]] = None,
+        stream: bool = False,
+        no_cache: bool = False,
+    ) -> Union[bytes, BinaryIO]:
+        """Run an Overpass query against the primary and alternative endpoints."""
+        # The query string covers area/bbox, highway tags and output format
+        cache_path = None
+        if not no_cache and self.cache_ttl_seconds > 0:
+            cache_path = self._cache_path(query)
+            cached = self._read_cache(cache_path, stream)
+            if cached is not None:
+                logger.info(f"Using cached OSM data from {cache_path}")
+                return cached
+
         # Try primary URL first, then alternatives
         urls_to_try = [self.api_url]
         if alternative_urls:
@@ -242,7 +365,7 @@ out geom;
                     api_url,
                     data={"data": query},
                     timeout=self.timeout,
-                    headers={"User-Agent": "PolicePatrol-OSM-Importer/1.0"},
+                    stream=stream,
                 )
                 response.raise_for_status()
 
@@ -256,12 +379,20 @@ out geom;
                         api_url,
                         data={"data": query},
                         timeout=self.timeout,
-                        headers={"User-Agent": "PolicePatrol-OSM-Importer/1.0"},
+                        stream=stream,
                     )
                     response.raise_for_status()
 
-                logger.info(f"Successfully fetched OSM data from {api_url} ({len(response.text)} bytes)")
-                return response.text
+                if stream:
+                    # Parsing consumes the body as it arrives; undo any gzip transfer encoding
+                    response.raw.decode_content = True
+                    logger.info(f"Streaming OSM data from {api_url}")
+                    return response.raw
+
+                logger.info(f"Successfully fetched OSM data from {api_url} ({len(response.content)} bytes)")
+                if cache_path is not None:
+                    self._write_cache(cache_path, response.content)
+                return response.content
 
             except requests.exceptions.Timeout as e:
                 logger.warning(f"Timeout from {api_url}: {str(e)}")
@@ -278,6 +409,42 @@ out geom;
             f"Failed to fetch OSM data from all endpoints. Last error: {str(last_error)}"
         )
 
+    def _cache_path(self, query: str) -> Path:
+        key = hashlib.blake2b(query.encode(), digest_size=16).hexdigest()
+        return OVERPASS_CACHE_DIR / f"{key}.{self.output_format}.gz"
+
+    def _read_cache(self, path: Path, stream: bool) -> Optional[Union[bytes, BinaryIO]]:
+        """Return the cached body (or a decompressing stream), None if missing or stale."""
+        try:
+            if time.time() - path.stat().st_mtime >= self.cache_ttl_seconds:
+                return None
+            if stream:
+                return gzip.open(path, "rb")
+            with gzip.open(path, "rb") as f:
+                return f.read()
+        except (OSError, EOFError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f"Ignoring unreadable Overpass cache file {path}: {str(e)}")
+            return None
+
+    def _write_cache(self, path: Path, data: bytes):
+        """Write a response to the cache atomically (temp file + rename)."""
+        tmp_path = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as tmp:
+                tmp_path = tmp.name
+                with gzip.GzipFile(fileobj=tmp, mode="wb", compresslevel=6) as gz:
+                    gz.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to cache Overpass response: {str(e)}")
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
     def check_api_status(self) -> Dict[str, any]:
         """
         Check Overpass API status.
@@ -292,7 +459,6 @@ out geom;
                 self.api_url,
                 data={"data": test_query},
                 timeout=10,
-                headers={"User-Agent": "PolicePatrol-OSM-Importer/1.0"},
             )
             response.raise_for_status()
             return {
@@ -55,6 +55,11 @@ class RoutingTopology:
 
             logger.info(f"Creating topology for {segment_count} road segments...")
 
+            # Everything below runs in one transaction (single commit at the
+            # end) so the cost update, topology reset and rebuild are written
+            # to WAL once and a failure leaves the previous topology intact.
+            self._ensure_indexes()
+
             # Update costs first
             self._update_costs()
 
@@ -71,7 +76,6 @@ class RoutingTopology:
             
             # Drop existing temp table if exists
             self.db.execute(text("DROP TABLE IF EXISTS road_segment_geometry CASCADE"))
-            self.db.commit()
             
             # Create a regular (not temp) table with geometry column for pgRouting
             # This table will be used to create topology and vertices
@@ -91,7 +95,19 @@ class RoutingTopology:
                     FROM road_segment
                 """)
             )
-            self.db.commit()
+            # Without a spatial index pgr_createTopology degrades to an
+            # all-pairs endpoint search; index the working table and refresh
+            # its statistics so the planner actually uses the index.
+            self.db.execute(
+                text("""
+                    CREATE INDEX road_segment_geometry_geom_idx
+                    ON road_segment_geometry USING GIST (geom)
+                """)
+            )
+            self.db.execute(
+                text("CREATE UNIQUE INDEX road_segment_geometry_id_idx ON road_segment_geometry (id)")
+            )
+            self.db.execute(text("ANALYZE road_segment_geometry"))
             
             # Create topology using the table (this will create road_segment_geometry_vertices_pgr)
             result = self.db.execute(
@@ -145,7 +161,6 @@ class RoutingTopology:
                         SELECT * FROM road_segment_geometry_vertices_pgr
                     """)
                 )
-                self.db.commit()
             
             # Update source and target in the original table from the geometry table
             self.db.execute(
@@ -156,10 +171,10 @@ class RoutingTopology:
                     WHERE rs.id = rsg.id
                 """)
             )
-            self.db.commit()
             
             # Drop the temporary table (vertices table will remain)
             self.db.execute(text("DROP TABLE IF EXISTS road_segment_geometry CASCADE"))
+            self.db.execute(text("ANALYZE road_segment"))
             self.db.commit()
 
             if topology_result_str:
@@ -200,22 +215,40 @@ class RoutingTopology:
         except Exception:
             return False
 
+    def _ensure_indexes(self) -> None:
+        """Create the indexes topology creation and routing lookups rely on."""
+        self.db.execute(
+            text("CREATE INDEX IF NOT EXISTS idx_road_segment_geom ON road_segment USING GIST (geom)")
+        )
+        self.db.execute(
+            text("CREATE INDEX IF NOT EXISTS idx_road_segment_source ON road_segment (source)")
+        )
+        self.db.execute(
+            text("CREATE INDEX IF NOT EXISTS idx_road_segment_target ON road_segment (target)")
+        )
+        # Partial index for the connected-segment count in _validate_topology
+        self.db.execute(
+            text("""
+                CREATE INDEX IF NOT EXISTS idx_road_segment_connected ON road_segment (id)
+                WHERE source IS NOT NULL AND target IS NOT NULL
+            """)
+        )
+
     def _update_costs(self) -> None:
-        """Update cost and reverse_cost for all road segments."""
+        """Update cost and reverse_cost (meters, from length_m) for all road segments."""
         try:
             logger.info("Updating road segment costs...")
             self.db.execute(
                 text("""
                     UPDATE road_segment
-                    SET cost = ST_Length(geom::geometry),
+                    SET cost = length_m,
                         reverse_cost = CASE 
                             WHEN one_way THEN 1e9
-                            ELSE ST_Length(geom::geometry)
+                            ELSE length_m
                         END
                     WHERE cost IS NULL OR reverse_cost IS NULL
                 """)
             )
-            self.db.commit()
             logger.info("Costs updated successfully")
         except Exception as e:
             logger.error(f"Failed to update costs: {str(e)}")
@@ -230,7 +263,6 @@ class RoutingTopology:
                     SET source = NULL, target = NULL
                 """)
             )
-            self.db.commit()
             logger.info("Topology dropped (source/target columns reset)")
         except Exception as e:
             logger.error(f"Failed to drop topology: {str(e)}")
@@ -248,10 +280,10 @@ class RoutingTopology:
             stats = self.db.execute(
                 text("""
                     SELECT 
-                        COUNT(*) as total,
-                        COUNT(source) as with_source,
-                        COUNT(target) as with_target,
-                        COUNT(CASE WHEN source IS NOT NULL AND target IS NOT NULL THEN 1 END) as connected
+                        COUNT(*) AS total,
+                        COUNT(*) FILTER (WHERE source IS NOT NULL) AS with_source,
+                        COUNT(*) FILTER (WHERE target IS NOT NULL) AS with_target,
+                        COUNT(*) FILTER (WHERE source IS NOT NULL AND target IS NOT NULL) AS connected
                     FROM road_segment
                 """)
             ).first()
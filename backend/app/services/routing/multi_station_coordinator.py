@@ -6,12 +6,12 @@ from dataclasses import dataclass
 from typing import Dict, List, Optional, Set, Tuple
 from uuid import UUID
 
-from sqlalchemy import text
+import shapely
+from sqlalchemy import Row, text
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
 from app.models.police_station import PoliceStation
-from app.models.risk_cell import RiskCell
 from app.services.routing.route_optimizer import (
     RouteRequest,
     RouteResult,
@@ -32,7 +32,7 @@ class StationAssignment:
 
     station_id: UUID
     station_name: str
-    risk_cells: List[RiskCell]
+    risk_cells: List[Row]
     total_capacity: int
     assigned_load: int
 
@@ -74,7 +74,7 @@ def haversine_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> fl
     return R * c
 
 
-def get_cell_center(db: Session, cell: RiskCell) -> Tuple[float, float]:
+def get_cell_center(db: Session, cell: Row) -> Tuple[float, float]:
     """
     Get center coordinates of a risk cell.
 
@@ -85,13 +85,19 @@ def get_cell_center(db: Session, cell: RiskCell) -> Tuple[float, float]:
     Returns:
         (lat, lng) tuple
     """
+    # Rows from get_high_risk_cells carry the centroid already; decode it locally
+    centroid_wkb = getattr(cell, "centroid_wkb", None)
+    if centroid_wkb is not None:
+        point = shapely.from_wkb(bytes(centroid_wkb))
+        return (float(point.y), float(point.x))
+
     try:
         result = db.execute(
-            """
+            text("""
                 SELECT 
                     ST_Y(ST_Centroid(ST_GeomFromWKB(:geom))) as lat,
                     ST_X(ST_Centroid(ST_GeomFromWKB(:geom))) as lng
-            """,
+            """),
             {"geom": cell.geom.data},
         ).first()
 
@@ -112,7 +118,7 @@ def get_cell_center(db: Session, cell: RiskCell) -> Tuple[float, float]:
 def distribute_risk_cells(
     db: Session,
     stations: List[PoliceStation],
-    risk_cells: List[RiskCell],
+    risk_cells: List[Row],
     capacity_weight: float = None,
     distance_weight: float = None,
     risk_weight: float = None,
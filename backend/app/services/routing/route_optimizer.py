@@ -1,15 +1,21 @@
+import logging
 from dataclasses import dataclass
 from typing import List, Optional, Tuple
 from uuid import UUID
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import Row, cast, func, select, text
+from geoalchemy2 import Geometry
 import json
+import numpy as np
+import shapely
 
 from app.models.police_station import PoliceStation
 from app.models.risk_cell import RiskCell
 from app.services.utils import get_point_coordinates, get_kucukcekmece_boundary, get_kucukcekmece_bbox_from_polygon
 from app.core.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class RouteRequest:
@@ -37,6 +43,23 @@ class RouteResult:
     path: dict  # GeoJSON LineString
 
 
+EARTH_RADIUS_M = 6371000.0
+# Local equirectangular projection (meters per degree; longitude scaled by cos(lat))
+METERS_PER_DEG_LAT = 110540.0
+METERS_PER_DEG_LNG = 111320.0
+CLUSTER_RADIUS_M = 500.0
+
+
+def _path_length_m(lats: np.ndarray, lngs: np.ndarray) -> float:
+    """Haversine length of a polyline in meters (all segments in one vectorized pass)."""
+    lat = np.radians(lats)
+    dlat = np.diff(lat)
+    dlng = np.diff(np.radians(lngs))
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(dlng / 2) ** 2
+    a = np.clip(a, 0.0, 1.0)
+    return float(EARTH_RADIUS_M * (2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))).sum())
+
+
 def get_station_coordinates(db: Session, station_id: UUID) -> Tuple[float, float]:
     """Get lat/lng coordinates of a police station"""
     station = db.query(PoliceStation).filter(PoliceStation.id == station_id).first()
@@ -79,6 +102,13 @@ def get_station_coordinates_snapped(
     return (original_lat, original_lng)
 
 
+def _geom_wkb(geom) -> bytes:
+    """WKB bytes of a geometry from the ORM (WKBElement) or a raw query (hex EWKB string)."""
+    if isinstance(geom, str):
+        return bytes.fromhex(geom)
+    return bytes(geom.data)
+
+
 def get_high_risk_road_segments(
     db: Session,
     risk_threshold: float,
@@ -86,7 +116,8 @@ def get_high_risk_road_segments(
     start_time: Optional[str] = None,
     end_time: Optional[str] = None,
     limit: int = 100,
-    station_id: Optional[str] = None
+    station_id: Optional[str] = None,
+    boundary_geom=None
 ):
     """
     Get road segments with high risk scores.
@@ -100,6 +131,8 @@ def get_high_risk_road_segments(
         start_time: Optional start time for time window
         end_time: Optional end time for time window
         limit: Maximum number of segments to return
+        station_id: Optional station whose neighborhoods bound the search
+        boundary_geom: Küçükçekmece boundary if the caller already has it
     
     Returns:
         List of RoadSegment objects with risk_score >= threshold (only driveable roads)
@@ -118,68 +151,37 @@ def get_high_risk_road_segments(
         RoadSegment.road_type.in_(driveable_road_types)
     )
     
-    # Filter by station's neighborhood boundaries if station_id provided, otherwise use Küçükçekmece boundary
+    # Filter by station's neighborhood boundaries if station_id provided, otherwise use Küçükçekmece boundary.
+    # The boundary polygon is fetched once and bound as a parameter, so the
+    # neighborhood union is not recomputed inside the query.
     from app.services.utils import get_station_neighborhood_boundaries
-    boundary_geom = None
-    boundary_filter = ""
-    
+    area_geom = None
+    min_length_fraction = 0.5
+
     if station_id:
-        # Use station's neighborhood boundaries
-        boundary_geom = get_station_neighborhood_boundaries(db, station_id)
-        if boundary_geom:
-            boundary_filter = """
-                -- Center point must be within station's neighborhood boundaries
-                ST_Within(
-                    ST_Centroid(geom::geometry),
-                    (SELECT ST_Union(ab.geom::geometry)::geometry
-                     FROM administrative_boundary ab
-                     JOIN police_station ps ON ab.name = ANY(ps.neighborhoods)
-                     WHERE ps.id = :station_id::uuid
-                     AND ab.admin_level = 8)
-                )
-                AND
-                -- At least 30% of segment length must be within boundary
-                (
-                    ST_Length(
-                        ST_Intersection(
-                            geom::geometry,
-                            (SELECT ST_Union(ab.geom::geometry)::geometry
-                             FROM administrative_boundary ab
-                             JOIN police_station ps ON ab.name = ANY(ps.neighborhoods)
-                             WHERE ps.id = :station_id::uuid
-                             AND ab.admin_level = 8)
-                        )
-                    ) / NULLIF(ST_Length(geom::geometry), 0)
-                ) >= 0.3
-            """
-    
-    if not boundary_filter:
-        # Fallback to Küçükçekmece boundary
-        boundary_geom = get_kucukcekmece_boundary(db)
-        if boundary_geom:
-            boundary_filter = """
-                -- Center point must be within boundary
-                ST_Within(
-                    ST_Centroid(geom::geometry),
-                    (SELECT geom::geometry FROM administrative_boundary 
-                     WHERE name = 'Küçükçekmece' AND admin_level = 6 LIMIT 1)
-                )
+        # At least 30% of segment length must be within the station's neighborhoods
+        station_boundary = get_station_neighborhood_boundaries(db, station_id)
+        if station_boundary is not None:
+            area_geom = station_boundary
+            min_length_fraction = 0.3
+
+    if area_geom is None:
+        # Fallback to Küçükçekmece boundary; at least 50% of segment length must be within it
+        if boundary_geom is None:
+            boundary_geom = get_kucukcekmece_boundary(db)
+        area_geom = boundary_geom
+
+    if area_geom is not None:
+        query = query.filter(
+            text("""
+                -- Center point must be within the boundary
+                ST_Within(ST_Centroid(geom::geometry), ST_GeogFromWKB(:boundary)::geometry)
                 AND
-                -- At least 50% of segment length must be within boundary
                 (
-                    ST_Length(
-                        ST_Intersection(
-                            geom::geometry,
-                            (SELECT geom::geometry FROM administrative_boundary 
-                             WHERE name = 'Küçükçekmece' AND admin_level = 6 LIMIT 1)
-                        )
-                    ) / NULLIF(ST_Length(geom::geometry), 0)
-                ) >= 0.5
-            """
-    
-    if boundary_filter:
-        query = query.filter(
-            text(boundary_filter).params(station_id=station_id) if station_id else text(boundary_filter)
+                    ST_Length(ST_Intersection(geom::geometry, ST_GeogFromWKB(:boundary)::geometry))
+                    / NULLIF(ST_Length(geom::geometry), 0)
+                ) >= :min_length_fraction
+            """).params(boundary=_geom_wkb(area_geom), min_length_fraction=min_length_fraction)
         )
     
     # Filter by bbox if provided
@@ -209,13 +211,48 @@ def get_high_risk_cells(
     risk_threshold: float,
     bbox: Optional[Tuple[float, float, float, float]] = None,
     start_time: Optional[str] = None,
-    end_time: Optional[str] = None
-) -> List[RiskCell]:
-    """Get risk cells above threshold within Küçükçekmece polygon boundaries and time window"""
+    end_time: Optional[str] = None,
+    boundary_geom=None
+) -> List[Row]:
+    """
+    Get risk cells above threshold within Küçükçekmece polygon boundaries and time window.
+    Returns lightweight (id, risk_score, geom, centroid_wkb) rows instead of full RiskCell objects;
+    centroid_wkb lets callers read cell centers without another query.
+    Pass boundary_geom if the caller already fetched the Küçükçekmece boundary.
+    """
+    # Only the columns routing needs; skips ORM hydration and the identity map
+    query = _high_risk_cells_query(
+        db,
+        (
+            RiskCell.id,
+            RiskCell.risk_score,
+            RiskCell.geom,
+            func.ST_AsBinary(func.ST_Centroid(cast(RiskCell.geom, Geometry(srid=4326)))).label("centroid_wkb")
+        ),
+        risk_threshold, bbox, start_time, end_time, boundary_geom
+    )
+    return query.limit(100).all()  # Limit to top 100 risk cells
+
+
+def _high_risk_cells_query(
+    db: Session,
+    columns: tuple,
+    risk_threshold: float,
+    bbox: Optional[Tuple[float, float, float, float]] = None,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    boundary_geom=None
+):
+    """
+    Query selecting columns of risk cells above threshold, filtered by time window
+    and Küçükçekmece polygon (bbox if the polygon is missing). Not limited or executed.
+    """
     from app.services.utils import get_kucukcekmece_boundary
     from datetime import datetime
     
-    query = db.query(RiskCell).filter(RiskCell.risk_score >= risk_threshold)
+    query = db.query(*columns).filter(
+        RiskCell.risk_score >= risk_threshold
+    )
     
     # Filter by time window if provided
     if start_time and end_time:
@@ -253,18 +290,18 @@ def get_high_risk_cells(
     # Filter by polygon intersection
     # If custom bbox provided, we still need to filter by polygon
     # The bbox is only used for initial filtering, final filter is polygon
-    boundary_geom = get_kucukcekmece_boundary(db)
+    if boundary_geom is None:
+        boundary_geom = get_kucukcekmece_boundary(db)
     
     if boundary_geom:
-        # Use polygon intersection
+        # Use polygon intersection; bind the boundary WKB once instead of a per-query subquery
         query = query.filter(
             text("""
                 ST_Intersects(
                     geom,
-                    (SELECT geom FROM administrative_boundary 
-                     WHERE name = 'Küçükçekmece' AND admin_level = 6 LIMIT 1)
+                    ST_GeogFromWKB(:boundary)
                 )
-            """)
+            """).params(boundary=boundary_geom.data)
         )
     else:
         # Fallback to bbox if polygon not available
@@ -297,82 +334,211 @@ def get_high_risk_cells(
             )
         )
     
-    return query.limit(100).all()  # Limit to top 100 risk cells
+    return query
 
 
-def cluster_risk_cells(
-    db: Session,
-    risk_cells: List[RiskCell],
-    max_clusters: int = 10
+def _proximity_risk_clusters(
+    coords: np.ndarray,
+    risks: np.ndarray,
+    max_clusters: int
 ) -> List[Tuple[float, float, float]]:
     """
-    Cluster risk cells and return cluster centers with average risk.
-    Returns list of (lat, lng, avg_risk_score)
+    Greedy grouping of points within CLUSTER_RADIUS_M, leaders in input order.
+    Python fallback for the PostGIS DBSCAN clustering.
     """
-    if not risk_cells:
-        return []
-    
-    # Simple approach: group by proximity
-    # Get centroids of risk cells
-    centroids = []
-    for cell in risk_cells:
-        centroid = db.execute(
-            text("""
-                SELECT 
-                    ST_Y(ST_Centroid(ST_GeomFromWKB(:geom))) as lat,
-                    ST_X(ST_Centroid(ST_GeomFromWKB(:geom))) as lng
-            """),
-            {"geom": cell.geom.data}
-        ).first()
-        
-        if centroid:
-            centroids.append({
-                "lat": float(centroid.lat),
-                "lng": float(centroid.lng),
-                "risk": cell.risk_score
-            })
-    
-    # Simple clustering: group nearby points
     clusters = []
-    used = set()
+    # Project to local meters around the mean latitude, then pairwise distances in one pass
+    lat_ref = np.radians(coords[:, 0].mean())
+    xy = coords * np.array([METERS_PER_DEG_LAT, METERS_PER_DEG_LNG * np.cos(lat_ref)])
+    deltas = xy[:, None, :] - xy[None, :, :]
+    near = np.hypot(deltas[..., 0], deltas[..., 1]) < CLUSTER_RADIUS_M
+    used = np.zeros(len(coords), dtype=bool)
     
-    for i, point in enumerate(centroids):
-        if i in used:
+    for i in range(len(coords)):
+        if used[i]:
             continue
         
-        cluster_points = [point]
-        used.add(i)
-        
-        # Find nearby points (within 500m)
-        for j, other_point in enumerate(centroids):
-            if j in used:
-                continue
-            
-            # Calculate distance
-            dist = ((point["lat"] - other_point["lat"]) ** 2 + 
-                   (point["lng"] - other_point["lng"]) ** 2) ** 0.5 * 111000
-            
-            if dist < 500:
-                cluster_points.append(other_point)
-                used.add(j)
+        members = near[i] & ~used
+        members[i] = True
+        used |= members
         
         # Calculate cluster center and average risk
-        avg_lat = sum(p["lat"] for p in cluster_points) / len(cluster_points)
-        avg_lng = sum(p["lng"] for p in cluster_points) / len(cluster_points)
-        avg_risk = sum(p["risk"] for p in cluster_points) / len(cluster_points)
-        
-        clusters.append((avg_lat, avg_lng, avg_risk))
+        avg_lat, avg_lng = coords[members].mean(axis=0)
+        avg_risk = risks[members].mean()
+        clusters.append((float(avg_lat), float(avg_lng), float(avg_risk)))
         
         if len(clusters) >= max_clusters:
             break
     
+    return clusters
+
+
+def _risk_cell_centroids(
+    db: Session,
+    risk_cells: List[Row]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Risk cell centroids, decoded locally from centroid_wkb when the rows carry it
+    (get_high_risk_cells), otherwise fetched in a single query.
+    Returns ((N, 2) lat/lng array, (N,) risk array) in input order.
+    """
+    if all(getattr(cell, "centroid_wkb", None) is not None for cell in risk_cells):
+        points = shapely.from_wkb([bytes(cell.centroid_wkb) for cell in risk_cells])
+        coords = np.column_stack([shapely.get_y(points), shapely.get_x(points)])
+        risks = np.array([cell.risk_score for cell in risk_cells], dtype=np.float64)
+        return coords.reshape(-1, 2), risks
+    
+    rows = db.execute(
+        text("""
+            SELECT 
+                id,
+                ST_Y(ST_Centroid(geom::geometry)) as lat,
+                ST_X(ST_Centroid(geom::geometry)) as lng
+            FROM risk_cell
+            WHERE id = ANY(CAST(:ids AS uuid[]))
+        """),
+        {"ids": [str(cell.id) for cell in risk_cells]}
+    ).all()
+    centroid_by_id = {str(row.id): row for row in rows}
+    
+    # Keep the input order (the proximity fallback is order-sensitive)
+    coords = []
+    risks = []
+    for cell in risk_cells:
+        centroid = centroid_by_id.get(str(cell.id))
+        if centroid:
+            coords.append((float(centroid.lat), float(centroid.lng)))
+            risks.append(cell.risk_score)
+    
+    return (
+        np.array(coords, dtype=np.float64).reshape(-1, 2),
+        np.array(risks, dtype=np.float64)
+    )
+
+
+def _dbscan_clusters_select(cells, max_clusters: int):
+    """
+    Cluster risk cell centroids within CLUSTER_RADIUS_M using PostGIS ST_ClusterDBSCAN.
+    cells: subquery with risk_score and geom columns.
+    Selects (lat, lng, risk) averages per cluster, highest risk first.
+    """
+    centroids = select(
+        func.ST_Centroid(cast(cells.c.geom, Geometry(srid=4326))).label("centroid"),
+        cells.c.risk_score
+    ).subquery("centroids")
+    
+    with_ref = select(
+        centroids.c.centroid,
+        centroids.c.risk_score,
+        func.avg(func.ST_Y(centroids.c.centroid)).over().label("lat_ref")
+    ).subquery("with_ref")
+    
+    # Cluster in local meters (same projection as the Python fallback)
+    projected = func.ST_MakePoint(
+        func.ST_X(with_ref.c.centroid) * METERS_PER_DEG_LNG * func.cos(func.radians(with_ref.c.lat_ref)),
+        func.ST_Y(with_ref.c.centroid) * METERS_PER_DEG_LAT
+    )
+    clustered = select(
+        with_ref.c.centroid,
+        with_ref.c.risk_score,
+        func.ST_ClusterDBSCAN(projected, CLUSTER_RADIUS_M, 1).over().label("cid")
+    ).subquery("clustered")
+    
+    avg_risk = func.avg(clustered.c.risk_score)
+    return (
+        select(
+            func.avg(func.ST_Y(clustered.c.centroid)).label("lat"),
+            func.avg(func.ST_X(clustered.c.centroid)).label("lng"),
+            avg_risk.label("risk")
+        )
+        .group_by(clustered.c.cid)
+        .order_by(avg_risk.desc())
+        .limit(max_clusters)
+    )
+
+
+def _run_dbscan_clusters(
+    db: Session,
+    cells,
+    max_clusters: int
+) -> Optional[List[Tuple[float, float, float]]]:
+    """Execute _dbscan_clusters_select; returns (lat, lng, avg_risk_score) list or None on error."""
+    try:
+        # Savepoint so a failure (e.g. older PostGIS) does not abort the session for the fallback
+        with db.begin_nested():
+            rows = db.execute(_dbscan_clusters_select(cells, max_clusters)).all()
+    except Exception as e:
+        logger.warning(f"ST_ClusterDBSCAN risk clustering failed, using Python grouping: {str(e)}")
+        return None
+    
+    return [(float(row.lat), float(row.lng), float(row.risk)) for row in rows]
+
+
+def cluster_risk_cells(
+    db: Session,
+    risk_cells: List[Row],
+    max_clusters: int = 10
+) -> List[Tuple[float, float, float]]:
+    """
+    Cluster already-fetched risk cells and return cluster centers with average risk.
+    Greedy 500m proximity grouping in Python; route planning normally clusters
+    in PostGIS instead (get_high_risk_clusters) and only falls back to this.
+    Returns list of (lat, lng, avg_risk_score)
+    """
+    if not risk_cells:
+        return []
+    
+    coords, risks = _risk_cell_centroids(db, risk_cells)
+    clusters = _proximity_risk_clusters(coords, risks, max_clusters) if len(coords) else []
+    
+    if clusters:
+        logger.info(f"Clustering {len(risk_cells)} risk cells into {len(clusters)} clusters")
+    return _snap_clusters(db, clusters)
+
+
+def get_high_risk_clusters(
+    db: Session,
+    risk_threshold: float,
+    bbox: Optional[Tuple[float, float, float, float]] = None,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    boundary_geom=None,
+    max_clusters: int = 10
+) -> List[Tuple[float, float, float]]:
+    """
+    High-risk cell clusters for route planning.
+    Filtering, centroids and DBSCAN clustering run as one fused PostGIS query;
+    if that query fails, falls back to get_high_risk_cells + cluster_risk_cells.
+    Returns list of (lat, lng, avg_risk_score), snapped to the road network where possible.
+    """
+    cells = _high_risk_cells_query(
+        db,
+        (RiskCell.risk_score, RiskCell.geom),
+        risk_threshold, bbox, start_time, end_time, boundary_geom
+    ).limit(100).subquery("cells")
+    clusters = _run_dbscan_clusters(db, cells, max_clusters)
+    if clusters is not None:
+        logger.info(f"Clustered high-risk cells in PostGIS into {len(clusters)} clusters")
+        return _snap_clusters(db, clusters)
+    
+    risk_cells = get_high_risk_cells(
+        db, risk_threshold, bbox, start_time, end_time, boundary_geom=boundary_geom
+    )
+    logger.info(f"Found {len(risk_cells)} risk cells above threshold {risk_threshold}")
+    return cluster_risk_cells(db, risk_cells, max_clusters=max_clusters)
+
+
+def _snap_clusters(
+    db: Session,
+    clusters: List[Tuple[float, float, float]]
+) -> List[Tuple[float, float, float]]:
+    """
+    Snap cluster centers to the road network, keeping the original coordinates
+    for clusters that cannot be snapped.
+    """
     # Try to snap all cluster centroids to road network
     # If snap fails, use original coordinates (snap is optional)
     if clusters:
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.info(f"Clustering {len(centroids)} centroids into {len(clusters)} clusters")
-        
         cluster_coords = [(lat, lng) for lat, lng, _ in clusters]
         snapped_coords = snap_risk_cell_centroids(db, cluster_coords, max_distance_m=100.0)
         
@@ -459,12 +625,12 @@ def _snap_to_road_network(
                             ST_Y(v.the_geom::geometry) as lat,
                             ST_X(v.the_geom::geometry) as lng,
                             ST_Distance(
-                                ST_GeogFromText('POINT(:lng :lat)'),
+                                ST_SetSRID(ST_MakePoint(:lng, :lat), 4326)::geography,
                                 v.the_geom::geography
                             ) as distance_m
                         FROM road_segment_vertices_pgr v
                         WHERE ST_DWithin(
-                            ST_GeogFromText('POINT(:lng :lat)'),
+                            ST_SetSRID(ST_MakePoint(:lng, :lat), 4326)::geography,
                             v.the_geom::geography,
                             :max_distance_m
                         )
@@ -516,7 +682,7 @@ def _snap_to_road_network(
                         ST_Y(ST_StartPoint(geom::geometry)) as lat,
                         ST_X(ST_StartPoint(geom::geometry)) as lng,
                         ST_Distance(
-                            ST_GeogFromText('POINT(:lng :lat)'),
+                            ST_SetSRID(ST_MakePoint(:lng, :lat), 4326)::geography,
                             ST_StartPoint(geom::geometry)::geography
                         ) as distance_m
                     FROM road_segment
@@ -530,7 +696,7 @@ def _snap_to_road_network(
                         ST_Y(ST_EndPoint(geom::geometry)) as lat,
                         ST_X(ST_EndPoint(geom::geometry)) as lng,
                         ST_Distance(
-                            ST_GeogFromText('POINT(:lng :lat)'),
+                            ST_SetSRID(ST_MakePoint(:lng, :lat), 4326)::geography,
                             ST_EndPoint(geom::geometry)::geography
                         ) as distance_m
                     FROM road_segment
@@ -569,6 +735,142 @@ def _snap_to_road_network(
         return None
 
 
+def _pgrouting_edges_sql(db: Session, station_id: Optional[str] = None) -> str:
+    """
+    Build the pgRouting edges SQL (id, source, target, cost, reverse_cost).
+    Uses road segments within station's neighborhood boundaries if station_id provided, otherwise Küçükçekmece boundary.
+    """
+    boundary_filter = ""
+    if station_id:
+        # Check if station has neighborhoods
+        station_neighborhoods = db.execute(
+            text("""
+                SELECT neighborhoods
+                FROM police_station
+                WHERE id = CAST(:station_id AS uuid)
+            """),
+            {"station_id": station_id}
+        ).scalar()
+
+        if station_neighborhoods:
+            # Use station's neighborhood boundaries
+            boundary_filter = """
+                AND ST_Within(
+                    ST_Centroid(geom::geometry),
+                    (SELECT ST_Union(ab.geom::geometry)::geometry
+                     FROM administrative_boundary ab
+                     JOIN police_station ps ON ab.name = ANY(ps.neighborhoods)
+                     WHERE ps.id = '{station_id}'::uuid
+                     AND ab.admin_level = 8)
+                )
+                AND (
+                    ST_Length(
+                        ST_Intersection(
+                            geom::geometry,
+                            (SELECT ST_Union(ab.geom::geometry)::geometry
+                             FROM administrative_boundary ab
+                             JOIN police_station ps ON ab.name = ANY(ps.neighborhoods)
+                             WHERE ps.id = '{station_id}'::uuid
+                             AND ab.admin_level = 8)
+                        )
+                    ) / NULLIF(ST_Length(geom::geometry), 0)
+                ) >= 0.3
+            """.format(station_id=station_id)
+
+    if not boundary_filter:
+        # Fallback to Küçükçekmece boundary
+        boundary_exists = db.execute(
+            text("""
+                SELECT COUNT(*) > 0
+                FROM administrative_boundary 
+                WHERE name = 'Küçükçekmece' AND admin_level = 6
+            """)
+        ).scalar()
+
+        if boundary_exists:
+            boundary_filter = """
+                AND ST_Within(
+                    ST_Centroid(geom::geometry),
+                    (SELECT geom::geometry FROM administrative_boundary 
+                     WHERE name = 'Küçükçekmece' AND admin_level = 6 LIMIT 1)
+                )
+                AND (
+                    ST_Length(
+                        ST_Intersection(
+                            geom::geometry,
+                            (SELECT geom::geometry FROM administrative_boundary 
+                             WHERE name = 'Küçükçekmece' AND admin_level = 6 LIMIT 1)
+                        )
+                    ) / NULLIF(ST_Length(geom::geometry), 0)
+                ) >= 0.5
+            """
+
+    # Build pgRouting SQL query - filter by boundary if it exists
+    # Note: pgRouting requires the query as a string, so we build it dynamically
+    return f"""SELECT id, source, target, cost, reverse_cost 
+        FROM road_segment 
+        WHERE road_type IN ('motorway', 'trunk', 'primary', 'secondary', 'tertiary', 'residential', 'service', 'unclassified')
+        {boundary_filter}"""
+
+
+def _route_from_edges(
+    edge_geoms: List[dict],
+    total_distance: float
+) -> Optional[Tuple[List[Tuple[float, float]], float, dict]]:
+    """
+    Assemble (path_coordinates, total_distance_m, geojson_path) from ordered edge GeoJSON geometries.
+    Returns None if the edges carry no coordinates.
+    """
+    # Extract all coordinates from each edge to create detailed path
+    path_coords = []  # List of (lat, lng) tuples
+    geojson_coords = []  # List of [lng, lat] for GeoJSON
+    
+    for edge_geom in edge_geoms:
+        if edge_geom and edge_geom.get("type") == "LineString":
+            edge_coords = edge_geom.get("coordinates", [])
+            # GeoJSON is [lng, lat], convert to (lat, lng) tuples for path_coords
+            path_coords.extend([(coord[1], coord[0]) for coord in edge_coords])
+            # Add all coordinates from this edge to create detailed path
+            geojson_coords.extend(edge_coords)  # Keep as [lng, lat] for GeoJSON
+    
+    if not path_coords:
+        return None
+    
+    # Fallback: If total_distance is 0 but we have path coordinates, calculate distance from coordinates
+    # This can happen if ST_Length returns NULL or 0 for some reason
+    if total_distance == 0.0 and len(path_coords) >= 2:
+        coords = np.asarray(path_coords, dtype=np.float64)
+        calculated_distance = _path_length_m(coords[:, 0], coords[:, 1])
+        if calculated_distance > 0:
+            total_distance = calculated_distance
+            logger.info(f"Calculated distance from GeoJSON coordinates: {total_distance:.0f}m (fallback calculation)")
+    
+    # Remove duplicate consecutive points
+    if geojson_coords:
+        cleaned_geojson = [geojson_coords[0]]
+        for coord in geojson_coords[1:]:
+            if coord != cleaned_geojson[-1]:
+                cleaned_geojson.append(coord)
+        geojson_coords = cleaned_geojson
+    
+    # Create GeoJSON LineString with detailed path
+    geojson_path = {
+        "type": "LineString",
+        "coordinates": geojson_coords
+    }
+    
+    return (path_coords, total_distance, geojson_path)
+
+
+# Edge geometry oriented in travel direction: pgRouting's node is the vertex the edge is entered from
+_ORIENTED_EDGE_GEOJSON = """
+    ST_AsGeoJSON(
+        CASE WHEN di.node = r.source THEN r.geom::geometry
+             ELSE ST_Reverse(r.geom::geometry) END
+    )::json
+"""
+
+
 def _compute_route_with_pgrouting(
     db: Session,
     start_vertex: int,
@@ -583,81 +885,7 @@ def _compute_route_with_pgrouting(
     Uses road segments within station's neighborhood boundaries if station_id provided, otherwise Küçükçekmece boundary.
     """
     try:
-        # Build pgRouting query with boundary filter
-        # Use station's neighborhood boundaries if station_id provided, otherwise Küçükçekmece boundary
-        from app.services.utils import get_station_neighborhood_boundaries
-        
-        boundary_filter = ""
-        if station_id:
-            # Check if station has neighborhoods
-            station_neighborhoods = db.execute(
-                text("""
-                    SELECT neighborhoods
-                    FROM police_station
-                    WHERE id = :station_id::uuid
-                """),
-                {"station_id": station_id}
-            ).scalar()
-            
-            if station_neighborhoods:
-                # Use station's neighborhood boundaries
-                boundary_filter = """
-                    AND ST_Within(
-                        ST_Centroid(geom::geometry),
-                        (SELECT ST_Union(ab.geom::geometry)::geometry
-                         FROM administrative_boundary ab
-                         JOIN police_station ps ON ab.name = ANY(ps.neighborhoods)
-                         WHERE ps.id = '{station_id}'::uuid
-                         AND ab.admin_level = 8)
-                    )
-                    AND (
-                        ST_Length(
-                            ST_Intersection(
-                                geom::geometry,
-                                (SELECT ST_Union(ab.geom::geometry)::geometry
-                                 FROM administrative_boundary ab
-                                 JOIN police_station ps ON ab.name = ANY(ps.neighborhoods)
-                                 WHERE ps.id = '{station_id}'::uuid
-                                 AND ab.admin_level = 8)
-                            )
-                        ) / NULLIF(ST_Length(geom::geometry), 0)
-                    ) >= 0.3
-                """.format(station_id=station_id)
-        
-        if not boundary_filter:
-            # Fallback to Küçükçekmece boundary
-            boundary_exists = db.execute(
-                text("""
-                    SELECT COUNT(*) > 0
-                    FROM administrative_boundary 
-                    WHERE name = 'Küçükçekmece' AND admin_level = 6
-                """)
-            ).scalar()
-            
-            if boundary_exists:
-                boundary_filter = """
-                    AND ST_Within(
-                        ST_Centroid(geom::geometry),
-                        (SELECT geom::geometry FROM administrative_boundary 
-                         WHERE name = 'Küçükçekmece' AND admin_level = 6 LIMIT 1)
-                    )
-                    AND (
-                        ST_Length(
-                            ST_Intersection(
-                                geom::geometry,
-                                (SELECT geom::geometry FROM administrative_boundary 
-                                 WHERE name = 'Küçükçekmece' AND admin_level = 6 LIMIT 1)
-                            )
-                        ) / NULLIF(ST_Length(geom::geometry), 0)
-                    ) >= 0.5
-                """
-        
-        # Build pgRouting SQL query - filter by boundary if it exists
-        # Note: pgRouting requires the query as a string, so we build it dynamically
-        pgrouting_query = f"""SELECT id, source, target, cost, reverse_cost 
-            FROM road_segment 
-            WHERE road_type IN ('motorway', 'trunk', 'primary', 'secondary', 'tertiary', 'residential', 'service', 'unclassified')
-            {boundary_filter}"""
+        pgrouting_query = _pgrouting_edges_sql(db, station_id)
         
         # Get route with detailed edge geometries - extract all points from each edge
         # Only use driveable road segments from OSM within Küçükçekmece boundary
@@ -665,18 +893,13 @@ def _compute_route_with_pgrouting(
         result = db.execute(
             text(f"""
                 SELECT 
-                    SUM(ST_Length(r.geom::geography)) as total_distance,
-                    json_agg(
-                        json_build_object(
-                            'edge_id', r.id,
-                            'geom', ST_AsGeoJSON(r.geom)::json
-                        ) ORDER BY di.seq
-                    ) as edge_details
+                    SUM(route.length_m) as total_distance,
+                    json_agg(route.geom ORDER BY route.seq) as edge_geoms
                 FROM (
                     SELECT 
-                        r.geom,
-                        r.id,
-                        di.seq
+                        di.seq,
+                        ST_Length(r.geom) as length_m,
+                        {_ORIENTED_EDGE_GEOJSON} as geom
                     FROM pgr_dijkstra(
                         '{pgrouting_query.replace("'", "''")}',
                         :start_vertex,
@@ -684,7 +907,6 @@ def _compute_route_with_pgrouting(
                         directed := true
                     ) AS di
                     JOIN road_segment r ON di.edge = r.id
-                    ORDER BY di.seq
                 ) AS route
             """),
             {
@@ -693,69 +915,71 @@ def _compute_route_with_pgrouting(
             }
         ).first()
         
-        if not result or not result.edge_details:
-            return None
-        
-        import json
-        edge_details = result.edge_details if isinstance(result.edge_details, list) else json.loads(result.edge_details)
-        
-        # Extract all coordinates from each edge to create detailed path
-        path_coords = []  # List of (lat, lng) tuples
-        geojson_coords = []  # List of [lng, lat] for GeoJSON
-        
-        for edge_detail in edge_details:
-            edge_geom = edge_detail.get("geom", {})
-            if edge_geom.get("type") == "LineString":
-                edge_coords = edge_geom.get("coordinates", [])
-                # GeoJSON is [lng, lat], convert to (lat, lng) tuples for path_coords
-                path_coords.extend([(coord[1], coord[0]) for coord in edge_coords])
-                # Add all coordinates from this edge to create detailed path
-                geojson_coords.extend(edge_coords)  # Keep as [lng, lat] for GeoJSON
-        
-        if not path_coords:
+        if not result or not result.edge_geoms:
             return None
         
+        edge_geoms = result.edge_geoms if isinstance(result.edge_geoms, list) else json.loads(result.edge_geoms)
         total_distance = float(result.total_distance) if result.total_distance else 0.0
+        return _route_from_edges(edge_geoms, total_distance)
+    except Exception as e:
+        logger.warning(f"pgRouting route computation failed: {str(e)}")
+        return None
+
+
+def _compute_route_via_vertices_pgrouting(
+    db: Session,
+    vertices: List[int],
+    station_id: Optional[str] = None
+) -> Optional[List[Optional[Tuple[List[Tuple[float, float]], float, dict]]]]:
+    """
+    Compute all legs of a multi-stop route with a single pgr_dijkstraVia call,
+    so the edge set is built and filtered once instead of once per leg.
+    Returns one _compute_route_with_pgrouting-style result per leg (None for
+    unreachable legs), or None if the query fails.
+    """
+    try:
+        pgrouting_query = _pgrouting_edges_sql(db, station_id)
         
-        # Fallback: If total_distance is 0 but we have path coordinates, calculate distance from coordinates
-        # This can happen if ST_Length returns NULL or 0 for some reason
-        if total_distance == 0.0 and len(path_coords) >= 2:
-            import math
-            R = 6371000  # Earth radius in meters
-            calculated_distance = 0.0
-            for i in range(len(path_coords) - 1):
-                lat1, lng1 = path_coords[i]
-                lat2, lng2 = path_coords[i + 1]
-                dlat = math.radians(lat2 - lat1)
-                dlng = math.radians(lng2 - lng1)
-                a = (math.sin(dlat / 2) ** 2 +
-                     math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) *
-                     math.sin(dlng / 2) ** 2)
-                c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-                calculated_distance += R * c
-            if calculated_distance > 0:
-                total_distance = calculated_distance
-                logger.info(f"Calculated distance from GeoJSON coordinates: {total_distance:.0f}m (fallback calculation)")
-        
-        # Remove duplicate consecutive points
-        if geojson_coords:
-            cleaned_geojson = [geojson_coords[0]]
-            for coord in geojson_coords[1:]:
-                if coord != cleaned_geojson[-1]:
-                    cleaned_geojson.append(coord)
-            geojson_coords = cleaned_geojson
+        rows = db.execute(
+            text(f"""
+                SELECT 
+                    di.path_id,
+                    di.start_vid,
+                    di.end_vid,
+                    ST_Length(r.geom) as length_m,
+                    {_ORIENTED_EDGE_GEOJSON} as geom
+                FROM pgr_dijkstraVia(
+                    '{pgrouting_query.replace("'", "''")}',
+                    CAST(:vertices AS bigint[]),
+                    directed := true,
+                    strict := false,
+                    U_turn_on_edge := true
+                ) AS di
+                JOIN road_segment r ON di.edge = r.id
+                ORDER BY di.seq
+            """),
+            {"vertices": [int(v) for v in vertices]}
+        ).all()
         
-        # Create GeoJSON LineString with detailed path
-        geojson_path = {
-            "type": "LineString",
-            "coordinates": geojson_coords
-        }
+        n_legs = len(vertices) - 1
+        leg_geoms = [[] for _ in range(n_legs)]
+        leg_distances = [0.0] * n_legs
+        for row in rows:
+            leg = int(row.path_id) - 1
+            # Legs are matched by position; bail out if numbering is not what we expect
+            if not (0 <= leg < n_legs) or (int(row.start_vid), int(row.end_vid)) != (vertices[leg], vertices[leg + 1]):
+                logger.warning("Unexpected pgr_dijkstraVia leg numbering, falling back to per-leg routing")
+                return None
+            geom = row.geom if isinstance(row.geom, dict) else json.loads(row.geom)
+            leg_geoms[leg].append(geom)
+            leg_distances[leg] += float(row.length_m or 0.0)
         
-        return (path_coords, total_distance, geojson_path)
+        return [
+            _route_from_edges(geoms, distance) if geoms else None
+            for geoms, distance in zip(leg_geoms, leg_distances)
+        ]
     except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.warning(f"pgRouting route computation failed: {str(e)}")
+        logger.warning(f"pgRouting via-route computation failed: {str(e)}")
         return None
 
 
@@ -816,12 +1040,12 @@ def compute_route_via_points(
                         ST_Y(v.the_geom::geometry) as lat,
                         ST_X(v.the_geom::geometry) as lng,
                         ST_Distance(
-                            ST_GeogFromText('POINT(:lng :lat)'),
+                            ST_SetSRID(ST_MakePoint(:lng, :lat), 4326)::geography,
                             v.the_geom::geography
                         ) as distance_m
                     FROM road_segment_vertices_pgr v
                     WHERE ST_DWithin(
-                        ST_GeogFromText('POINT(:lng :lat)'),
+                        ST_SetSRID(ST_MakePoint(:lng, :lat), 4326)::geography,
                         v.the_geom::geography,
                         1000.0
                     )
@@ -915,13 +1139,23 @@ def compute_route_via_points(
         
         # Normal route computation if loop route was not created
         if not loop_route_created:
+            # When every point is on the network, route all legs in one pgr_dijkstraVia call
+            via_legs = None
+            if len(snapped_points) > 2 and all(p[2] is not None for p in snapped_points):
+                via_legs = _compute_route_via_vertices_pgrouting(
+                    db, [p[2] for p in snapped_points], station_id=station_id
+                )
+            
             for i in range(len(snapped_points) - 1):
                 point1 = snapped_points[i]
                 point2 = snapped_points[i + 1]
                 
                 # If both points are snapped to vertices, use pgRouting
                 if point1[2] is not None and point2[2] is not None:
-                    route_result = _compute_route_with_pgrouting(db, point1[2], point2[2], station_id=station_id)
+                    if via_legs is not None:
+                        route_result = via_legs[i]
+                    else:
+                        route_result = _compute_route_with_pgrouting(db, point1[2], point2[2], station_id=station_id)
                     if route_result:
                         segment_path, segment_distance, segment_geojson = route_result
                         # segment_path is (lat, lng) tuples
@@ -944,37 +1178,37 @@ def compute_route_via_points(
                         ))
                         continue
             
-            # Fallback: straight line for this segment if pgRouting fails
-            import math
-            R = 6371000  # Earth radius in meters
-            lat1, lng1 = point1[0], point1[1]
-            lat2, lng2 = point2[0], point2[1]
+                # Fallback: straight line for this segment if pgRouting fails
+                import math
+                R = 6371000  # Earth radius in meters
+                lat1, lng1 = point1[0], point1[1]
+                lat2, lng2 = point2[0], point2[1]
             
-            dlat = math.radians(lat2 - lat1)
-            dlng = math.radians(lng2 - lng1)
-            a = (math.sin(dlat / 2) ** 2 +
-                 math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) *
-                 math.sin(dlng / 2) ** 2)
-            c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-            segment_distance = R * c
-            total_distance += segment_distance
+                dlat = math.radians(lat2 - lat1)
+                dlng = math.radians(lng2 - lng1)
+                a = (math.sin(dlat / 2) ** 2 +
+                     math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) *
+                     math.sin(dlng / 2) ** 2)
+                c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+                segment_distance = R * c
+                total_distance += segment_distance
             
-            # Add straight line segment
-            full_path_coords.append((lat1, lng1))
-            full_path_coords.append((lat2, lng2))
-            full_geojson_coords.append([lng1, lat1])
-            full_geojson_coords.append([lng2, lat2])
+                # Add straight line segment
+                full_path_coords.append((lat1, lng1))
+                full_path_coords.append((lat2, lng2))
+                full_geojson_coords.append([lng1, lat1])
+                full_geojson_coords.append([lng2, lat2])
             
-            # Add waypoint with risk score if available
-            risk_score = None
-            if waypoint_risk_scores and i > 0 and (i - 1) < len(waypoint_risk_scores):
-                risk_score = waypoint_risk_scores[i - 1]
+                # Add waypoint with risk score if available
+                risk_score = None
+                if waypoint_risk_scores and i > 0 and (i - 1) < len(waypoint_risk_scores):
+                    risk_score = waypoint_risk_scores[i - 1]
             
-            route_waypoints.append(RouteWaypoint(
-                lat=lat1,
-                lng=lng1,
-                risk_score=risk_score
-            ))
+                route_waypoints.append(RouteWaypoint(
+                    lat=lat1,
+                    lng=lng1,
+                    risk_score=risk_score
+                ))
         
         # Add final point (end station)
         if snapped_points:
@@ -1014,19 +1248,9 @@ def compute_route_via_points(
         
         # Fallback: If total_distance is still 0 but we have coordinates, calculate from GeoJSON
         if total_distance == 0.0 and len(full_geojson_coords) >= 2:
-            import math
-            R = 6371000  # Earth radius in meters
-            calculated_distance = 0.0
-            for i in range(len(full_geojson_coords) - 1):
-                lng1, lat1 = full_geojson_coords[i]
-                lng2, lat2 = full_geojson_coords[i + 1]
-                dlat = math.radians(lat2 - lat1)
-                dlng = math.radians(lng2 - lng1)
-                a = (math.sin(dlat / 2) ** 2 +
-                     math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) *
-                     math.sin(dlng / 2) ** 2)
-                c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-                calculated_distance += R * c
+            # GeoJSON coordinates are [lng, lat]
+            coords = np.asarray(full_geojson_coords, dtype=np.float64)
+            calculated_distance = _path_length_m(coords[:, 1], coords[:, 0])
             if calculated_distance > 0:
                 total_distance = calculated_distance
                 logger.info(f"Calculated total distance from GeoJSON coordinates: {total_distance:.0f}m (fallback)")
@@ -1098,33 +1322,13 @@ def _compute_fallback_route(
             (start_lat, start_lng)  # Return to start
         ]
     
-    route_waypoints = []
-    total_distance = 0.0
-    
-    for i in range(len(all_points) - 1):
-        lat1, lng1 = all_points[i]
-        lat2, lng2 = all_points[i + 1]
-        
-        # Calculate distance (Haversine approximation)
-        import math
-        R = 6371000  # Earth radius in meters
-        
-        dlat = math.radians(lat2 - lat1)
-        dlng = math.radians(lng2 - lng1)
-        
-        a = (math.sin(dlat / 2) ** 2 +
-             math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) *
-             math.sin(dlng / 2) ** 2)
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        distance = R * c
-        
-        total_distance += distance
-        
-        route_waypoints.append(RouteWaypoint(
-            lat=lat1,
-            lng=lng1,
-            risk_score=None
-        ))
+    # One waypoint per straight segment start; distance is the haversine chain length
+    route_waypoints = [
+        RouteWaypoint(lat=lat, lng=lng, risk_score=None)
+        for lat, lng in all_points[:-1]
+    ]
+    points = np.asarray(all_points, dtype=np.float64)
+    total_distance = _path_length_m(points[:, 0], points[:, 1])
     
     # Add final point
     route_waypoints.append(RouteWaypoint(
@@ -1174,25 +1378,15 @@ def compute_route(
     
     # Get high-risk cells within Küçükçekmece polygon boundaries
     from app.core.config import get_settings
-    from app.services.utils import get_kucukcekmece_bbox_from_polygon, get_kucukcekmece_boundary
+    from app.services.utils import get_kucukcekmece_bbox_from_polygon, is_point_in_kucukcekmece
     settings = get_settings()
     
-    # Check if start station is within Küçükçekmece polygon
+    # Fetch the boundary once and hand it to the risk queries below
     boundary_geom = get_kucukcekmece_boundary(db)
-    if boundary_geom:
-        # Check if station is within polygon
-        # ST_Within requires geometry type, so cast geography to geometry
-        station_within = db.execute(
-            text("""
-                SELECT ST_Within(
-                    ST_GeomFromText('POINT(:lng :lat)', 4326),
-                    (SELECT geom::geometry FROM administrative_boundary 
-                     WHERE name = 'Küçükçekmece' AND admin_level = 6 LIMIT 1)
-                )
-            """),
-            {"lat": start_lat, "lng": start_lng}
-        ).scalar()
-        
+    
+    # Check if start station is within Küçükçekmece polygon (cached prepared geometry)
+    station_within = is_point_in_kucukcekmece(db, start_lat, start_lng)
+    if station_within is not None:
         if station_within:
             # Use polygon boundary (no bbox needed, polygon filter will be applied in get_high_risk_cells)
             bbox = None
@@ -1232,7 +1426,8 @@ def compute_route(
         request.start_time,
         request.end_time,
         limit=100,
-        station_id=str(request.station_id)
+        station_id=str(request.station_id),
+        boundary_geom=boundary_geom
     )
     
     logger.info(f"Found {len(high_risk_segments)} road segments with risk >= {request.risk_threshold}")
@@ -1273,18 +1468,18 @@ def compute_route(
     # Use old risk_cells approach as fallback if no road segments found
     if not waypoints:
         logger.warning("No high-risk road segments found, falling back to grid-based risk cells")
-        risk_cells = get_high_risk_cells(
-            db, 
-            request.risk_threshold, 
+        # Fetch and cluster risk cells (a single fused query when clustering runs in PostGIS)
+        risk_clusters = get_high_risk_clusters(
+            db,
+            request.risk_threshold,
             bbox,
             request.start_time,
-            request.end_time
+            request.end_time,
+            boundary_geom=boundary_geom,
+            max_clusters=10
         )
         
-        # Cluster risk cells
-        risk_clusters = cluster_risk_cells(db, risk_cells, max_clusters=10)
-        
-        logger.info(f"Found {len(risk_cells)} risk cells above threshold {request.risk_threshold}, clustered into {len(risk_clusters)} clusters")
+        logger.info(f"Risk cells above threshold {request.risk_threshold} clustered into {len(risk_clusters)} clusters")
         
         # Extract waypoints (cluster centers) - these are the risk forecast locations for patrol
         waypoints = [(lat, lng) for lat, lng, _ in risk_clusters]
@@ -1305,13 +1500,13 @@ def compute_route(
                     ST_Y(ST_Centroid(rs.geom::geometry)) as lat,
                     ST_X(ST_Centroid(rs.geom::geometry)) as lng,
                     ST_Distance(
-                        ST_GeogFromText('POINT(:lng :lat)'),
+                        ST_SetSRID(ST_MakePoint(:lng, :lat), 4326)::geography,
                         rs.geom
                     ) as distance_m
                 FROM road_segment rs
                 WHERE rs.road_type IN ('motorway', 'trunk', 'primary', 'secondary', 'tertiary', 'residential', 'service', 'unclassified')
                 AND ST_DWithin(
-                    ST_GeogFromText('POINT(:lng :lat)'),
+                    ST_SetSRID(ST_MakePoint(:lng, :lat), 4326)::geography,
                     rs.geom,
                     2000.0
                 )
@@ -1,5 +1,6 @@
 from geoalchemy2.shape import from_shape, to_shape
 from geoalchemy2 import Geography
+from geoalchemy2.elements import WKBElement, WKTElement
 from shapely.geometry import Point, LineString, Polygon
 from shapely import wkt
 from sqlalchemy import text
@@ -42,13 +43,24 @@ def geography_to_geojson(db: Session, geom, geom_type: str = "Point") -> Optiona
 
 
 def get_point_coordinates(db: Session, geom) -> Tuple[float, float]:
-    """Get lat/lng from geography point using PostGIS functions"""
+    """Get lat/lng from geography point, dispatching on the value type once"""
     if geom is None:
         return (0.0, 0.0)
     
+    # GeoAlchemy2 elements (what geography columns load as): decode in-process
+    if isinstance(geom, (WKBElement, WKTElement)):
+        shape = to_shape(geom)
+        if shape.geom_type == "Point" and not shape.is_empty:
+            return (float(shape.y), float(shape.x))
+        return (0.0, 0.0)
+    
+    # Shapely points and other objects exposing x/y
+    if hasattr(geom, 'y') and hasattr(geom, 'x'):
+        return (float(geom.y), float(geom.x))
+    
+    # Anything else (e.g. raw EWKT/hex WKB): let PostGIS decode it
+    # Note: ST_Y returns latitude, ST_X returns longitude
     try:
-        # Method 1: Use ST_Y and ST_X directly on geography
-        # Note: ST_Y returns latitude, ST_X returns longitude
         result = db.execute(
             text("""
                 SELECT 
@@ -57,23 +69,11 @@ def get_point_coordinates(db: Session, geom) -> Tuple[float, float]:
             """),
             {"geom": geom}
         ).first()
-        
-        if result and result.lat is not None and result.lng is not None:
-            return (float(result.lat), float(result.lng))
-    except Exception as e1:
-        # Fallback: Try using to_shape if geom has data attribute
-        try:
-            if hasattr(geom, 'data'):
-                shape = to_shape(geom)
-                if hasattr(shape, 'y') and hasattr(shape, 'x'):
-                    return (float(shape.y), float(shape.x))
-        except Exception as e2:
-            # Last fallback: Try direct attribute access
-            try:
-                if hasattr(geom, 'y') and hasattr(geom, 'x'):
-                    return (float(geom.y), float(geom.x))
-            except Exception:
-                pass
+    except Exception:
+        return (0.0, 0.0)
+    
+    if result and result.lat is not None and result.lng is not None:
+        return (float(result.lat), float(result.lng))
     
     return (0.0, 0.0)
 
@@ -124,7 +124,7 @@ def get_station_neighborhood_boundaries(
         text("""
             SELECT ST_Union(geom::geometry)::geography as combined_boundary
             FROM administrative_boundary
-            WHERE id = ANY(:boundary_ids::uuid[])
+            WHERE id = ANY(CAST(:boundary_ids AS uuid[]))
         """),
         {"boundary_ids": boundary_ids}
     ).first()
@@ -135,9 +135,17 @@ def get_station_neighborhood_boundaries(
     return None
 
 
+# Process-wide caches of the boundary polygon (raw geography value and prepared
+# shapely geometry). Refreshed after a TTL so re-imports done by other workers
+# are picked up.
+BOUNDARY_SHAPE_TTL_SECONDS = 600
+_boundary_geom_cache = {"geom": None, "loaded_at": 0.0}
+_boundary_shape_cache = {"shape": None, "loaded_at": 0.0}
+
+
 def get_kucukcekmece_boundary(db: Session) -> Optional[Geography]:
     """
-    Get Küçükçekmece boundary polygon from database.
+    Get Küçükçekmece boundary polygon from database (cached).
 
     Args:
         db: Database session
@@ -145,9 +153,15 @@ def get_kucukcekmece_boundary(db: Session) -> Optional[Geography]:
     Returns:
         Geography polygon or None if not found
     """
+    import time
     from app.core.config import get_settings
     from app.models.administrative_boundary import AdministrativeBoundary
 
+    now = time.monotonic()
+    geom = _boundary_geom_cache["geom"]
+    if geom is not None and now - _boundary_geom_cache["loaded_at"] < BOUNDARY_SHAPE_TTL_SECONDS:
+        return geom
+
     settings = get_settings()
     boundary = (
         db.query(AdministrativeBoundary)
@@ -159,6 +173,10 @@ def get_kucukcekmece_boundary(db: Session) -> Optional[Geography]:
     )
 
     if boundary:
+        # Only a found boundary is cached; a missing one is re-checked so a
+        # fresh import is picked up immediately
+        _boundary_geom_cache["geom"] = boundary.geom
+        _boundary_geom_cache["loaded_at"] = now
         return boundary.geom
     return None
 
@@ -167,45 +185,20 @@ def get_kucukcekmece_bbox_from_polygon(db: Session) -> Optional[Tuple[float, flo
     """
     Calculate bounding box from Küçükçekmece polygon.
 
+    The bounds come from the cached boundary geometry, so no query is issued
+    once the boundary has been loaded.
+
     Args:
         db: Database session
 
     Returns:
         Tuple of (min_lat, min_lng, max_lat, max_lng) or None if polygon not found
     """
-    boundary_geom = get_kucukcekmece_boundary(db)
-    if not boundary_geom:
-        from app.core.config import get_settings
-        settings = get_settings()
-        return settings.kucukcekmece_fallback_bbox
-
     try:
-        result = db.execute(
-            text("""
-                SELECT 
-                    ST_YMin(CAST(:geom AS geometry)) as min_lat,
-                    ST_XMin(CAST(:geom AS geometry)) as min_lng,
-                    ST_YMax(CAST(:geom AS geometry)) as max_lat,
-                    ST_XMax(CAST(:geom AS geometry)) as max_lng
-                FROM (SELECT :geom::geography as geom) as g
-            """),
-            {"geom": boundary_geom},
-        ).first()
-
-        if result and all(
-            [
-                result.min_lat is not None,
-                result.min_lng is not None,
-                result.max_lat is not None,
-                result.max_lng is not None,
-            ]
-        ):
-            return (
-                float(result.min_lat),
-                float(result.min_lng),
-                float(result.max_lat),
-                float(result.max_lng),
-            )
+        boundary_shape = get_kucukcekmece_boundary_shape(db)
+        if boundary_shape is not None and not boundary_shape.is_empty:
+            min_lng, min_lat, max_lng, max_lat = boundary_shape.bounds
+            return (float(min_lat), float(min_lng), float(max_lat), float(max_lng))
     except Exception as e:
         # Log error but don't fail
         import logging
@@ -273,19 +266,12 @@ def validate_within_boundary(
         return (True, None)
 
     try:
-        # Try to use polygon boundary first
-        boundary_geom = get_kucukcekmece_boundary(db)
+        # Try to use polygon boundary first (cached, tested in-process)
+        within = is_point_in_kucukcekmece(db, lat, lng)
 
-        if boundary_geom:
+        if within is not None:
             # Use polygon validation
-            result = db.execute(
-                text("""
-                    SELECT is_within_kucukcekmece(ST_GeogFromText(:wkt))
-                """),
-                {"wkt": f"SRID=4326;POINT({lng} {lat})"},
-            ).scalar()
-
-            if result:
+            if within:
                 return (True, None)
             else:
                 return (
@@ -315,4 +301,137 @@ def validate_within_boundary(
 
         # If validation fails due to error, allow the operation (fail open)
         # This prevents system from breaking if boundary is not loaded
-        return (True, None)
\ No newline at end of file
+        return (True, None)
+
+
+def get_kucukcekmece_boundary_shape(db: Session):
+    """
+    Get Küçükçekmece boundary as a prepared shapely geometry (cached).
+
+    Args:
+        db: Database session
+
+    Returns:
+        Shapely polygon (lon/lat) or None if boundary is not loaded
+    """
+    import time
+    import shapely
+
+    now = time.monotonic()
+    shape = _boundary_shape_cache["shape"]
+    if shape is not None and now - _boundary_shape_cache["loaded_at"] < BOUNDARY_SHAPE_TTL_SECONDS:
+        return shape
+
+    boundary_geom = get_kucukcekmece_boundary(db)
+    if boundary_geom is None:
+        return None
+
+    shape = to_shape(boundary_geom)
+    shapely.prepare(shape)
+    _boundary_shape_cache["shape"] = shape
+    _boundary_shape_cache["loaded_at"] = now
+    return shape
+
+
+def is_point_in_kucukcekmece(db: Session, lat: float, lng: float) -> Optional[bool]:
+    """
+    Test a point against the cached Küçükçekmece polygon without a DB query.
+
+    Same semantics as ST_Within (points on the boundary line are outside).
+    Points outside the polygon's envelope are rejected before the
+    prepared-geometry test.
+
+    Returns:
+        True/False, or None if the boundary is not loaded
+    """
+    import shapely
+
+    boundary_shape = get_kucukcekmece_boundary_shape(db)
+    if boundary_shape is None:
+        return None
+
+    min_lng, min_lat, max_lng, max_lat = boundary_shape.bounds
+    if not (min_lat <= lat <= max_lat and min_lng <= lng <= max_lng):
+        return False
+    return bool(shapely.contains_xy(boundary_shape, lng, lat))
+
+
+def clear_boundary_shape_cache():
+    """Drop the cached boundary geometry (call after importing a boundary)."""
+    _boundary_geom_cache["geom"] = None
+    _boundary_geom_cache["loaded_at"] = 0.0
+    _boundary_shape_cache["shape"] = None
+    _boundary_shape_cache["loaded_at"] = 0.0
+
+
+def validate_stations_within_boundary(
+    db: Session, station_ids: List
+) -> dict:
+    """
+    Load active stations and validate them against the Küçükçekmece boundary.
+
+    Station coordinates are fetched in one query and tested against the
+    cached boundary polygon in a single vectorized point-in-polygon call.
+
+    Args:
+        db: Database session
+        station_ids: Station UUIDs to validate
+
+    Returns:
+        Dict of str(station_id) -> (name, is_valid, error_message) for active stations.
+        Missing or inactive stations are absent from the result.
+    """
+    import numpy as np
+    import shapely
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    strict_validation = getattr(settings, "strict_boundary_validation", True)
+
+    rows = db.execute(
+        text("""
+            SELECT
+                s.id,
+                s.name,
+                ST_Y(s.geom::geometry) AS lat,
+                ST_X(s.geom::geometry) AS lng
+            FROM police_station s
+            WHERE s.id = ANY(CAST(:ids AS uuid[]))
+            AND s.active = TRUE
+        """),
+        {"ids": [str(station_id) for station_id in station_ids]},
+    ).fetchall()
+
+    if not rows:
+        return {}
+
+    lats = np.fromiter((row.lat for row in rows), dtype=np.float64, count=len(rows))
+    lngs = np.fromiter((row.lng for row in rows), dtype=np.float64, count=len(rows))
+
+    if not strict_validation:
+        return {str(row.id): (row.name, True, None) for row in rows}
+
+    boundary_shape = get_kucukcekmece_boundary_shape(db)
+    if boundary_shape is not None:
+        inside = shapely.contains_xy(boundary_shape, lngs, lats)
+        error_template = "Koordinatlar ({lat}, {lng}) Küçükçekmece polygon sınırları dışında"
+    else:
+        # Fallback to bbox validation (same as validate_within_boundary)
+        min_lat, min_lng, max_lat, max_lng = settings.kucukcekmece_fallback_bbox
+        inside = (lats >= min_lat) & (lats <= max_lat) & (lngs >= min_lng) & (lngs <= max_lng)
+        error_template = (
+            "Koordinatlar ({lat}, {lng}) Küçükçekmece bounding box sınırları dışında "
+            f"(sınırlar: lat [{min_lat}, {max_lat}], lng [{min_lng}, {max_lng}])"
+        )
+
+    results = {}
+    for row, is_inside, lat, lng in zip(rows, inside, lats, lngs):
+        if is_inside:
+            results[str(row.id)] = (row.name, True, None)
+        else:
+            results[str(row.id)] = (
+                row.name,
+                False,
+                error_template.format(lat=float(lat), lng=float(lng)),
+            )
+    return results
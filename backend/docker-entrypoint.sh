@@ -21,6 +21,27 @@ else
 fi
 
 # Start the main application
+# uvloop + httptools come with uvicorn[standard]
 echo "Starting FastAPI application..."
-exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
+if [ "${ENVIRONMENT:-development}" = "development" ]; then
+    # --reload is incompatible with multiple workers
+    exec uvicorn app.main:app --host 0.0.0.0 --port 8000 \
+        --loop uvloop --http httptools --reload
+else
+    # Default: one worker per core, capped at 4. Every worker holds its own
+    # DB pools, forecast cache, model copies and (without Redis) job store,
+    # so raise WEB_CONCURRENCY together with DB_MAX_CONNECTIONS.
+    # Exported so each worker sizes its DB pools to its share of DB_MAX_CONNECTIONS.
+    if [ -z "${WEB_CONCURRENCY}" ]; then
+        WEB_CONCURRENCY=$(nproc)
+        if [ "$WEB_CONCURRENCY" -gt 4 ]; then
+            WEB_CONCURRENCY=4
+        fi
+    fi
+    export WEB_CONCURRENCY
+    exec uvicorn app.main:app --host 0.0.0.0 --port 8000 \
+        --loop uvloop --http httptools \
+        --workers "$WEB_CONCURRENCY" \
+        --backlog 2048 --limit-concurrency 1024
+fi
 
@@ -1,15 +1,66 @@
+from types import SimpleNamespace
+
 import pytest
 from fastapi.testclient import TestClient
+from app.api.routes import health
+from app.db.session import get_async_db
 from app.main import app
 
 client = TestClient(app)
 
 
-def test_health_check():
-    """Test health check endpoint"""
+@pytest.fixture
+def db_check(monkeypatch):
+    """Replace the database check with a scripted one and reset the health cache"""
+    state = {"result": "ok", "calls": 0, "now": 1000.0}
+
+    async def fake_check(db):
+        state["calls"] += 1
+        return state["result"]
+
+    async def no_db():
+        yield None
+
+    monkeypatch.setattr(health, "_check_database", fake_check)
+    monkeypatch.setattr(health, "time", SimpleNamespace(monotonic=lambda: state["now"]))
+    monkeypatch.setitem(health._LAST_CHECK, "ts", 0.0)
+    monkeypatch.setitem(health._LAST_CHECK, "database", "ok")
+    app.dependency_overrides[get_async_db] = no_db
+    try:
+        yield state
+    finally:
+        app.dependency_overrides.pop(get_async_db, None)
+
+
+def test_health_check_cached(db_check):
+    """Health probes within the TTL reuse the last database check"""
+    response = client.get("/api/v1/health")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok", "database": "ok"}
+
+    db_check["result"] = "error"
+    db_check["now"] += health.HEALTH_CACHE_TTL_SECONDS / 2
+    assert client.get("/api/v1/health").json()["database"] == "ok"
+    assert db_check["calls"] == 1
+
+    db_check["now"] += health.HEALTH_CACHE_TTL_SECONDS
     response = client.get("/api/v1/health")
     assert response.status_code == 200
-    assert "status" in response.json()
+    assert response.json()["database"] == "error"
+    assert db_check["calls"] == 2
+
+
+def test_readiness_check(db_check):
+    """Readiness checks the database on every call and returns 503 when it is down"""
+    response = client.get("/api/v1/health/readyz")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok", "database": "ok"}
+
+    db_check["result"] = "error"
+    response = client.get("/api/v1/health/readyz")
+    assert response.status_code == 503
+    assert response.json() == {"status": "unavailable", "database": "error"}
+    assert db_check["calls"] == 2
 
 
 def test_list_stations():
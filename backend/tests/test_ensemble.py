@@ -0,0 +1,34 @@
+import numpy as np
+
+from app.services.forecast.ensemble import ensemble_forecast
+
+# Without trained models: SARIMAX falls back to mean + linear trend
+# ([0.4, 0.55, 0.7] here), the spatial model to the feature mean (0.5)
+KDE_SCORES = [0.2, 0.4, 0.6]
+HISTORY = np.array([0.1, 0.3, 0.5, 0.7])
+SPATIAL = np.array([[0.2, 0.4], [0.6, 0.8]])
+NO_TEMPORAL = np.empty((0, 4))
+
+
+def test_ensemble_default_weights():
+    """Default weights combine KDE 0.4, SARIMAX 0.3, spatial 0.3"""
+    forecast = ensemble_forecast(KDE_SCORES, HISTORY, SPATIAL, NO_TEMPORAL)
+
+    np.testing.assert_allclose(forecast, [0.35, 0.475, 0.6])
+
+
+def test_ensemble_custom_weights_normalized():
+    """Custom weights are normalized to sum to 1 before combining"""
+    forecast = ensemble_forecast(
+        KDE_SCORES, HISTORY, SPATIAL, NO_TEMPORAL,
+        weights={"kde": 2.0, "sarimax": 1.0, "spatial": 1.0},
+    )
+
+    np.testing.assert_allclose(forecast, [0.325, 0.4625, 0.6])
+
+
+def test_ensemble_empty_inputs_short_circuit():
+    """With no KDE scores, history or spatial features the result is [0.0]"""
+    forecast = ensemble_forecast([], np.array([]), np.empty((0, 2)), NO_TEMPORAL)
+
+    assert forecast == [0.0]
@@ -0,0 +1,180 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.routes import ml_forecast
+from app.db.session import get_async_db
+from app.main import app
+from app.services.forecast import forecast_cache
+from app.services.forecast.forecast_cache import ForecastCache, single_flight
+
+
+class FakeRedis:
+    """In-memory stand-in for the async Redis client; fails on demand"""
+
+    def __init__(self):
+        self.store = {}
+        self.fail = False
+        self.calls = 0
+
+    async def get(self, key):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("redis down")
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.store[key] = value
+
+
+class EmptyResult:
+    def all(self):
+        return []
+
+    def scalars(self):
+        return self
+
+
+class EmptySession:
+    """Async session stand-in whose queries return no rows"""
+
+    async def execute(self, *args, **kwargs):
+        return EmptyResult()
+
+
+@pytest.mark.asyncio
+async def test_cache_miss_then_hit():
+    """A stored response is served from Redis on the next lookup"""
+    redis = FakeRedis()
+    cache = ForecastCache(redis_client=redis)
+
+    assert await cache.get("k") is None
+    await cache.set("k", {"forecast": [0.5]})
+
+    assert await cache.get("k") == {"forecast": [0.5]}
+    assert "k" in redis.store
+
+
+@pytest.mark.asyncio
+async def test_redis_failure_falls_back_to_local():
+    """A Redis error stores and serves the response from the local TTL cache"""
+    redis = FakeRedis()
+    redis.fail = True
+    cache = ForecastCache(redis_client=redis)
+
+    await cache.set("k", {"forecast": 1.0})
+
+    assert await cache.get("k") == {"forecast": 1.0}
+    assert redis.store == {}
+
+
+@pytest.mark.asyncio
+async def test_redis_retried_after_retry_window(monkeypatch):
+    """After a failure Redis is skipped until REDIS_RETRY_SECONDS have passed"""
+    now = [1000.0]
+    monkeypatch.setattr(forecast_cache, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    redis = FakeRedis()
+    redis.fail = True
+    cache = ForecastCache(redis_client=redis)
+
+    await cache.set("k", {"forecast": 1.0})
+    assert redis.calls == 1
+
+    redis.fail = False
+    now[0] += forecast_cache.REDIS_RETRY_SECONDS - 1
+    await cache.set("k2", {"forecast": 2.0})
+    assert redis.calls == 1
+
+    now[0] += 1
+    await cache.set("k3", {"forecast": 3.0})
+    assert redis.calls == 2
+    assert "k3" in redis.store
+
+
+@pytest.fixture
+def empty_db_client(monkeypatch):
+    """Client whose DB returns no rows and whose forecast cache records writes"""
+    cache = ForecastCache(redis_client=FakeRedis())
+    writes = []
+    original_set = cache.set
+
+    async def recording_set(key, value):
+        writes.append(key)
+        await original_set(key, value)
+
+    monkeypatch.setattr(cache, "set", recording_set)
+    monkeypatch.setattr(ml_forecast, "get_forecast_cache", lambda: cache)
+
+    async def empty_db():
+        yield EmptySession()
+
+    app.dependency_overrides[get_async_db] = empty_db
+    try:
+        yield TestClient(app), writes
+    finally:
+        app.dependency_overrides.pop(get_async_db, None)
+
+
+def test_empty_history_responses_not_cached(empty_db_client):
+    """Empty-history responses (zero forecast, 404) are never written to the cache"""
+    client, writes = empty_db_client
+
+    response = client.get(
+        "/api/v1/ml-forecast/spatial-temporal",
+        params={"lat": 41.0, "lng": 28.8, "forecast_time": "2024-01-01T12:00:00"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"forecast": 0.0, "confidence": 0.0}
+
+    response = client.get("/api/v1/ml-forecast/timeseries")
+    assert response.status_code == 404
+
+    assert writes == []
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_result():
+    """Concurrent callers with the same key share one computation"""
+    calls = 0
+    release = asyncio.Event()
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return 42
+
+    waiters = [asyncio.ensure_future(single_flight("shared", compute)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == [42, 42, 42]
+    assert calls == 1
+    assert "shared" not in forecast_cache._inflight
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_exception():
+    """A failing computation raises the same error in every waiting caller"""
+    calls = 0
+    release = asyncio.Event()
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        raise ValueError("boom")
+
+    waiters = [asyncio.ensure_future(single_flight("failing", compute)) for _ in range(2)]
+    await asyncio.sleep(0)
+    release.set()
+
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert all(isinstance(r, ValueError) for r in results)
+    assert calls == 1
+    assert "failing" not in forecast_cache._inflight
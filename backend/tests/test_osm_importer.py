@@ -0,0 +1,35 @@
+import csv
+
+import numpy as np
+import shapely
+
+from app.services.osm.osm_importer import linestring_ewkb, road_rows_csv
+
+
+def test_linestring_ewkb_round_trip():
+    """EWKB decodes back to the exact input coordinates with SRID 4326"""
+    coords = np.array([[28.7712345678901, 41.0012345678901], [28.78, 41.01], [28.79, 41.02]])
+
+    geom = shapely.from_wkb(linestring_ewkb(coords))
+
+    assert geom.geom_type == "LineString"
+    assert shapely.get_srid(geom) == 4326
+    np.testing.assert_array_equal(shapely.get_coordinates(geom), coords)
+
+
+def test_road_rows_csv_escaping():
+    """Geometry is bytea hex, NULLs are empty fields and text with delimiters is quoted"""
+    ewkb = linestring_ewkb(np.array([[28.77, 41.0], [28.78, 41.01]]))
+    rows = [
+        (1, ewkb, "primary", 50, True),
+        (2, ewkb, 'service, "private"', None, False),
+    ]
+
+    text = road_rows_csv(rows).getvalue()
+    lines = text.splitlines()
+
+    assert lines[0] == f"1,\\x{ewkb.hex()},primary,50,True"
+    assert lines[1] == f'2,\\x{ewkb.hex()},"service, ""private""",,False'
+    parsed = list(csv.reader(text.splitlines()))
+    assert parsed[1][2] == 'service, "private"'
+    assert bytes.fromhex(parsed[0][1][2:]) == ewkb
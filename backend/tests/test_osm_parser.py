@@ -0,0 +1,109 @@
+import numpy as np
+import orjson
+
+from app.services.osm.osm_parser import OSMParser
+
+OSM_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<osm version="0.6">
+  <node id="1" lat="41.00" lon="28.77"/>
+  <node id="2" lat="41.01" lon="28.78"/>
+  <node id="3" lat="41.02" lon="28.79"/>
+  <node id="4" lat="41.50" lon="29.50"/>
+  <node id="5" lat="41.51" lon="29.51"/>
+  <way id="100">
+    <nd ref="1"/><nd ref="2"/><nd ref="3"/>
+    <tag k="highway" v="primary"/>
+    <tag k="maxspeed" v="70 km/h"/>
+  </way>
+  <way id="101">
+    <nd ref="1"/><nd ref="2"/>
+    <tag k="highway" v="residential"/>
+    <tag k="oneway" v="-1"/>
+  </way>
+  <way id="102">
+    <nd ref="4"/><nd ref="5"/>
+    <tag k="highway" v="secondary"/>
+  </way>
+  <way id="103">
+    <nd ref="1"/><nd ref="2"/>
+    <tag k="highway" v="footway"/>
+    <tag k="access" v="no"/>
+  </way>
+</osm>
+"""
+
+
+def _json_way(way_id, points, tags):
+    return {
+        "type": "way",
+        "id": way_id,
+        "geometry": [{"lat": lat, "lon": lon} if lat is not None else None for lat, lon in points],
+        "tags": tags,
+    }
+
+
+OSM_JSON = orjson.dumps({
+    "elements": [
+        _json_way(
+            100,
+            [(41.00, 28.77), (41.01, 28.78), (41.02, 28.79)],
+            {"highway": "primary", "maxspeed": "70 km/h"},
+        ),
+        _json_way(101, [(41.00, 28.77), (41.01, 28.78)], {"highway": "residential", "oneway": "-1"}),
+        _json_way(102, [(41.50, 29.50), (41.51, 29.51)], {"highway": "secondary"}),
+        _json_way(103, [(41.00, 28.77), (41.01, 28.78)], {"highway": "footway", "access": "no"}),
+    ]
+})
+
+
+def _as_tuples(segments):
+    return [
+        (s.osm_id, s.geom_coordinates.tolist(), s.road_type, s.speed_limit, s.one_way)
+        for s in segments
+    ]
+
+
+def test_json_and_xml_produce_identical_segments():
+    """The XML (node refs) and JSON ('out geom') forms of one dataset parse the same"""
+    parser = OSMParser()
+
+    from_xml = parser.parse_xml(OSM_XML)
+    from_json = parser.parse_json(OSM_JSON)
+
+    assert [s.osm_id for s in from_xml] == [100, 101, 102]
+    assert _as_tuples(from_xml) == _as_tuples(from_json)
+    assert from_xml[0].speed_limit == 70
+
+
+def test_null_geometry_points_skipped():
+    """Unresolved (null) geometry points are dropped; too-short ways are skipped"""
+    doc = orjson.dumps({
+        "elements": [
+            _json_way(200, [(41.0, 28.77), (None, None), (41.01, 28.78)], {"highway": "primary"}),
+            _json_way(201, [(41.0, 28.77), (None, None)], {"highway": "primary"}),
+        ]
+    })
+
+    segments = OSMParser().parse_json(doc)
+
+    assert [s.osm_id for s in segments] == [200]
+    np.testing.assert_array_equal(segments[0].geom_coordinates, [[28.77, 41.0], [28.78, 41.01]])
+
+
+def test_bbox_filter():
+    """Ways with no point inside the bbox are dropped unless the data is server-filtered"""
+    bbox = (40.9, 28.7, 41.1, 28.9)
+
+    filtered = OSMParser(bbox=bbox).parse_xml(OSM_XML)
+    unfiltered = OSMParser(bbox=bbox, server_filtered=True).parse_xml(OSM_XML)
+
+    assert [s.osm_id for s in filtered] == [100, 101]
+    assert [s.osm_id for s in unfiltered] == [100, 101, 102]
+
+
+def test_oneway_reverse_flips_coordinates():
+    """oneway=-1 stores the geometry in travel direction and marks it one-way"""
+    segment = next(s for s in OSMParser().parse_xml(OSM_XML) if s.osm_id == 101)
+
+    assert segment.one_way is True
+    np.testing.assert_array_equal(segment.geom_coordinates, [[28.78, 41.01], [28.77, 41.00]])
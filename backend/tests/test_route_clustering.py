@@ -0,0 +1,90 @@
+import numpy as np
+import shapely
+from collections import namedtuple
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.models.risk_cell import RiskCell
+from app.services.routing import route_optimizer
+from app.services.utils import lat_lng_to_geography
+
+CellRow = namedtuple("CellRow", "id risk_score geom centroid_wkb")
+
+
+def _offline_session():
+    """Session on an engine that is never connected (queries are only built)"""
+    return Session(bind=create_engine("postgresql+psycopg2://user@localhost/unused"))
+
+
+def test_proximity_clusters_use_projected_meters():
+    """Points ~460m apart east-west at 41°N form one cluster, ~610m apart do not"""
+    near = np.array([[41.0, 28.8], [41.0, 28.8055]])
+    far = np.array([[41.0, 28.8], [41.0, 28.8073]])
+
+    assert len(route_optimizer._proximity_risk_clusters(near, np.array([0.8, 0.6]), 10)) == 1
+    assert len(route_optimizer._proximity_risk_clusters(far, np.array([0.8, 0.6]), 10)) == 2
+
+
+def test_proximity_clusters_average_and_cap():
+    """Cluster centers/risks are member means; result is capped at max_clusters"""
+    coords = np.array([[41.0, 28.8], [41.001, 28.8], [41.05, 28.9], [41.1, 28.7]])
+    risks = np.array([0.8, 0.6, 0.9, 0.7])
+
+    clusters = route_optimizer._proximity_risk_clusters(coords, risks, 2)
+
+    assert len(clusters) == 2
+    lat, lng, risk = clusters[0]
+    assert np.isclose(lat, 41.0005) and np.isclose(lng, 28.8) and np.isclose(risk, 0.7)
+    assert np.isclose(clusters[1][2], 0.9)
+
+
+def test_risk_cell_centroids_decoded_locally():
+    """Rows carrying centroid_wkb are decoded without touching the database"""
+    cells = [
+        CellRow(1, 0.5, None, memoryview(shapely.to_wkb(shapely.Point(28.8, 41.0)))),
+        CellRow(2, 0.7, None, shapely.to_wkb(shapely.Point(28.9, 41.1))),
+    ]
+
+    coords, risks = route_optimizer._risk_cell_centroids(None, cells)
+
+    np.testing.assert_allclose(coords, [[41.0, 28.8], [41.1, 28.9]])
+    np.testing.assert_allclose(risks, [0.5, 0.7])
+
+
+def test_fused_cluster_query_shape():
+    """The fused statement filters, clusters with ST_ClusterDBSCAN and aggregates per cluster"""
+    db = _offline_session()
+    cells = route_optimizer._high_risk_cells_query(
+        db,
+        (RiskCell.risk_score, RiskCell.geom),
+        0.7,
+        boundary_geom=lat_lng_to_geography(41.0, 28.8),
+    ).limit(100).subquery("cells")
+
+    compiled = route_optimizer._dbscan_clusters_select(cells, 5).compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+
+    assert "ST_ClusterDBSCAN" in sql
+    assert "ST_GeogFromWKB" in sql
+    assert "GROUP BY clustered.cid" in sql
+    assert compiled.params["risk_score_1"] == 0.7
+    assert route_optimizer.CLUSTER_RADIUS_M in compiled.params.values()
+
+
+def test_high_risk_clusters_fall_back_to_python(monkeypatch):
+    """When the fused query fails, cells are fetched and grouped in Python"""
+    cells = [
+        CellRow(1, 0.8, None, shapely.to_wkb(shapely.Point(28.8, 41.0))),
+        CellRow(2, 0.6, None, shapely.to_wkb(shapely.Point(28.8001, 41.0))),
+    ]
+    monkeypatch.setattr(route_optimizer, "_run_dbscan_clusters", lambda db, cells, k: None)
+    monkeypatch.setattr(route_optimizer, "get_high_risk_cells", lambda *args, **kwargs: cells)
+    monkeypatch.setattr(route_optimizer, "_snap_clusters", lambda db, clusters: clusters)
+
+    clusters = route_optimizer.get_high_risk_clusters(
+        _offline_session(), 0.5, boundary_geom=lat_lng_to_geography(41.0, 28.8)
+    )
+
+    assert len(clusters) == 1
+    assert np.isclose(clusters[0][2], 0.7)
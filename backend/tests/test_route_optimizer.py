@@ -0,0 +1,120 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import shapely
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query, Session
+
+from app.services import utils
+from app.services.routing import route_optimizer
+from app.services.utils import lat_lng_to_geography
+
+STATION_ID = "00000000-0000-0000-0000-000000000001"
+
+
+def _offline_session():
+    """Session on an engine that is never connected (queries are only built)"""
+    return Session(bind=create_engine("postgresql+psycopg2://user@localhost/unused"))
+
+
+def _capture_query_all(monkeypatch):
+    """Record ORM queries instead of executing them; .all() returns no rows"""
+    captured = []
+
+    def fake_all(query):
+        captured.append(query)
+        return []
+
+    monkeypatch.setattr(Query, "all", fake_all)
+    return captured
+
+
+def test_road_segments_reuse_passed_boundary(monkeypatch):
+    """A boundary passed by the caller is used instead of fetching it again"""
+    _capture_query_all(monkeypatch)
+    calls = []
+    monkeypatch.setattr(route_optimizer, "get_kucukcekmece_boundary", lambda db: calls.append(db))
+    monkeypatch.setattr(utils, "get_station_neighborhood_boundaries", lambda db, station_id: None)
+
+    route_optimizer.get_high_risk_road_segments(
+        _offline_session(), 0.5, boundary_geom=lat_lng_to_geography(41.0, 28.8)
+    )
+    route_optimizer.get_high_risk_road_segments(
+        _offline_session(), 0.5, station_id=STATION_ID, boundary_geom=lat_lng_to_geography(41.0, 28.8)
+    )
+
+    assert calls == []
+
+
+def test_road_segment_boundary_bound_once(monkeypatch):
+    """The station's neighborhood union is bound as a parameter, not recomputed in SQL"""
+    captured = _capture_query_all(monkeypatch)
+    union_hex = shapely.to_wkb(
+        shapely.set_srid(shapely.box(28.7, 40.9, 28.9, 41.1), 4326), hex=True, include_srid=True
+    )
+    monkeypatch.setattr(utils, "get_station_neighborhood_boundaries", lambda db, station_id: union_hex)
+
+    route_optimizer.get_high_risk_road_segments(
+        _offline_session(), 0.5, station_id=STATION_ID, boundary_geom=lat_lng_to_geography(41.0, 28.8)
+    )
+
+    compiled = captured[0].statement.compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+    assert "ST_Union" not in sql and "administrative_boundary" not in sql
+    assert compiled.params["boundary"] == bytes.fromhex(union_hex)
+    assert compiled.params["min_length_fraction"] == 0.3
+
+
+class TopologySession:
+    """Session stand-in whose only query is the topology check"""
+
+    def execute(self, *args, **kwargs):
+        return SimpleNamespace(scalar=lambda: True)
+
+
+# Start station, one risk cluster, end station; each snaps to its own vertex
+VIA_POINTS = [(41.0, 28.80, 1), (41.0, 28.81, 2), (41.0, 28.82, 3)]
+
+
+def _leg(p1, p2, distance):
+    return (
+        [p1[:2], p2[:2]],
+        distance,
+        {"type": "LineString", "coordinates": [[p1[1], p1[0]], [p2[1], p2[0]]]},
+    )
+
+
+def _route_via(monkeypatch, legs):
+    snapped = iter(VIA_POINTS)
+    monkeypatch.setattr(route_optimizer, "_snap_to_road_network", lambda db, lat, lng, max_distance_m: next(snapped))
+    monkeypatch.setattr(route_optimizer, "_compute_route_via_vertices_pgrouting", lambda db, vertices, station_id=None: legs)
+    start, cluster, end = VIA_POINTS
+    return route_optimizer.compute_route_via_points(
+        TopologySession(), start[0], start[1], end[0], end[1], [cluster[:2]], 10000.0,
+        waypoint_risk_scores=[0.9],
+    )
+
+
+def test_route_via_points_all_legs_routed(monkeypatch):
+    """Routed legs are counted once: no extra straight-line leg after the loop"""
+    start, cluster, end = VIA_POINTS
+    result = _route_via(monkeypatch, [_leg(start, cluster, 1000.0), _leg(cluster, end, 1200.0)])
+
+    assert result.total_distance == pytest.approx(2200.0)
+    assert [(w.lat, w.lng, w.risk_score) for w in result.waypoints] == [
+        (41.0, 28.80, None), (41.0, 28.81, 0.9), (41.0, 28.82, None)
+    ]
+    assert result.path["coordinates"] == [[28.80, 41.0], [28.81, 41.0], [28.82, 41.0]]
+
+
+def test_route_via_points_failed_leg_falls_back(monkeypatch):
+    """A leg pgRouting cannot route is replaced by a straight line, the others are kept"""
+    start, cluster, end = VIA_POINTS
+    result = _route_via(monkeypatch, [None, _leg(cluster, end, 1200.0)])
+
+    straight = route_optimizer._path_length_m(np.array([41.0, 41.0]), np.array([28.80, 28.81]))
+    assert result.total_distance == pytest.approx(straight + 1200.0)
+    assert len(result.waypoints) == 3
+    assert result.path["coordinates"] == [[28.80, 41.0], [28.81, 41.0], [28.82, 41.0]]
@@ -36,6 +36,8 @@ CREATE TABLE IF NOT EXISTS road_segment (
     road_type VARCHAR(50),
     speed_limit INT,
     one_way BOOLEAN NOT NULL DEFAULT FALSE,
+    -- Geodesic length in meters, used as routing cost
+    length_m DOUBLE PRECISION GENERATED ALWAYS AS (ST_Length(geom)) STORED,
     -- pgRouting fields (will be populated by routing_setup.sql)
     source BIGINT,
     target BIGINT,
@@ -71,6 +73,17 @@ CREATE INDEX IF NOT EXISTS idx_road_segment_geom ON road_segment USING GIST (geo
 CREATE INDEX IF NOT EXISTS idx_risk_cell_geom ON risk_cell USING GIST (geom);
 CREATE INDEX IF NOT EXISTS idx_administrative_boundary_geom ON administrative_boundary USING GIST (geom);
 
+-- SP-GiST indexes on the geometry cast (2D bbox / point-in-polygon checks)
+CREATE INDEX IF NOT EXISTS idx_road_segment_geom_spgist ON road_segment USING SPGIST ((geom::geometry));
+CREATE INDEX IF NOT EXISTS idx_administrative_boundary_geom_spgist ON administrative_boundary USING SPGIST ((geom::geometry));
+CREATE INDEX IF NOT EXISTS idx_police_station_geom_spgist ON police_station USING SPGIST ((geom::geometry));
+
+-- Routing topology lookups
+CREATE INDEX IF NOT EXISTS idx_road_segment_source ON road_segment (source);
+CREATE INDEX IF NOT EXISTS idx_road_segment_target ON road_segment (target);
+CREATE INDEX IF NOT EXISTS idx_road_segment_connected ON road_segment (id)
+    WHERE source IS NOT NULL AND target IS NOT NULL;
+
 -- Temporal Indexes
 CREATE INDEX IF NOT EXISTS idx_crime_event_time ON crime_event (event_time);
 CREATE INDEX IF NOT EXISTS idx_risk_cell_time_window ON risk_cell USING GIST (time_window);
@@ -83,6 +96,10 @@ CREATE INDEX IF NOT EXISTS idx_crime_event_type ON crime_event (crime_type);
 CREATE INDEX IF NOT EXISTS idx_crime_event_severity ON crime_event (severity);
 CREATE INDEX IF NOT EXISTS idx_police_station_active ON police_station (active) WHERE active = TRUE;
 
+-- Covering indexes for forecast history queries (index-only scans)
+CREATE INDEX IF NOT EXISTS idx_crime_event_time_cover ON crime_event (event_time DESC) INCLUDE (severity, crime_type);
+CREATE INDEX IF NOT EXISTS idx_crime_event_type_time ON crime_event (crime_type, event_time DESC) INCLUDE (severity);
+
 -- Comments for documentation
 COMMENT ON TABLE crime_event IS 'Suç olayları - mekansal ve zamansal veriler';
 COMMENT ON TABLE police_station IS 'Polis karakolları - devriye başlangıç noktaları';
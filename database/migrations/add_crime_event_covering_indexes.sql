@@ -0,0 +1,12 @@
+-- Covering indexes for ML forecast history queries
+-- (ORDER BY event_time DESC LIMIT 1000, optionally filtered by crime_type)
+-- allow index-only scans without touching the heap.
+-- CONCURRENTLY avoids locking crime_event; run outside a transaction block.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_crime_event_time_cover
+ON crime_event (event_time DESC)
+INCLUDE (severity, crime_type);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_crime_event_type_time
+ON crime_event (crime_type, event_time DESC)
+INCLUDE (severity);
@@ -0,0 +1,18 @@
+-- Precomputed segment length in meters for routing costs.
+-- ST_Length on geography is measured on the spheroid (meters); the previous
+-- ST_Length(geom::geometry) costs were in degrees. Stored generated column:
+-- computed once per insert/geometry update instead of on every cost refresh.
+-- Adding a stored column rewrites the table; run during a maintenance window.
+
+ALTER TABLE road_segment
+ADD COLUMN IF NOT EXISTS length_m DOUBLE PRECISION GENERATED ALWAYS AS (ST_Length(geom)) STORED;
+
+COMMENT ON COLUMN road_segment.length_m IS 'Segment length in meters (geodesic), used as routing cost';
+
+-- Recompute costs in meters
+UPDATE road_segment
+SET cost = length_m,
+    reverse_cost = CASE
+        WHEN one_way THEN 1e9
+        ELSE length_m
+    END;
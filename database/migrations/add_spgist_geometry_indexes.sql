@@ -0,0 +1,14 @@
+-- SP-GiST indexes on the geometry cast of geography columns.
+-- Boundary checks cast to geometry (e.g. geom::geometry && boundary in the
+-- road segment cleanup), which the geography GiST indexes cannot serve.
+-- SP-GiST is smaller and faster than GiST for these 2D bbox/PIP tests.
+-- Requires PostGIS >= 2.5. CONCURRENTLY: run outside a transaction block.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_road_segment_geom_spgist
+ON road_segment USING SPGIST ((geom::geometry));
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_administrative_boundary_geom_spgist
+ON administrative_boundary USING SPGIST ((geom::geometry));
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_police_station_geom_spgist
+ON police_station USING SPGIST ((geom::geometry));
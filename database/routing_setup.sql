@@ -24,14 +24,21 @@ BEGIN
                    WHERE table_name='road_segment' AND column_name='reverse_cost') THEN
         ALTER TABLE road_segment ADD COLUMN reverse_cost DOUBLE PRECISION;
     END IF;
+
+    IF NOT EXISTS (SELECT 1 FROM information_schema.columns 
+                   WHERE table_name='road_segment' AND column_name='length_m') THEN
+        ALTER TABLE road_segment ADD COLUMN length_m DOUBLE PRECISION
+            GENERATED ALWAYS AS (ST_Length(geom)) STORED;
+    END IF;
 END $$;
 
 -- Geometri uzunluğuna dayalı maliyet hesapla Maliyet = mesafe metre cinsinden
+-- length_m: geography üzerinden hesaplanan (metre) saklı sütun
 UPDATE road_segment
-SET cost = ST_Length(geom::geometry),
+SET cost = length_m,
     reverse_cost = CASE 
         WHEN one_way THEN 1e9  -- Very high cost for reverse direction on one-way roads
-        ELSE ST_Length(geom::geometry)
+        ELSE length_m
     END
 WHERE cost IS NULL OR reverse_cost IS NULL;
 
@@ -46,10 +53,10 @@ RETURNS void AS $$
 BEGIN
     -- Maliyetleri yeniden hesapla
     UPDATE road_segment
-    SET cost = ST_Length(geom::geometry),
+    SET cost = length_m,
         reverse_cost = CASE 
             WHEN one_way THEN 1e9
-            ELSE ST_Length(geom::geometry)
+            ELSE length_m
         END;
     
     -- Not: pgr_createTopology manuel olarak veya zamanlanmış bir görevle çağrılmalı
@@ -6,6 +6,7 @@ import numpy as np
 from typing import Optional, Tuple
 from pathlib import Path
 import pickle
+import json
 
 
 def create_spatial_features(
@@ -117,7 +118,14 @@ def train_simple_spatial_model(
     if output_path:
         output_path.parent.mkdir(parents=True, exist_ok=True)
         with open(output_path, 'wb') as f:
-            pickle.dump(model_dict, f)
+            pickle.dump(model_dict, f, protocol=pickle.HIGHEST_PROTOCOL)
+        # Small sidecar so the API can read grid metadata without unpickling
+        grid_size = int(round(np.sqrt(model_dict['spatial_dim'])))
+        metadata = {
+            'grid_size': grid_size if grid_size * grid_size == model_dict['spatial_dim'] else None,
+            'spatial_bounds': model_dict.get('spatial_bounds'),
+        }
+        output_path.with_suffix('.meta.json').write_text(json.dumps(metadata))
     
     return model_dict
 
@@ -4,11 +4,27 @@ SARIMAX model training script for time-series forecasting
 import pandas as pd
 import numpy as np
 from statsmodels.tsa.statespace.sarimax import SARIMAX
+from statsmodels.tsa.stattools import adfuller
+import itertools
 import pickle
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 import warnings
-warnings.filterwarnings('ignore')
+
+# pmdarima is optional: stepwise order search instead of the full grid
+try:
+    from pmdarima import auto_arima
+    from pmdarima.arima import ndiffs, nsdiffs
+    PMDARIMA_AVAILABLE = True
+except ImportError:
+    PMDARIMA_AVAILABLE = False
+
+try:
+    import joblib
+    from joblib import Parallel, delayed
+    JOBLIB_AVAILABLE = True
+except ImportError:
+    JOBLIB_AVAILABLE = False
 
 
 def prepare_timeseries_data(
@@ -60,11 +76,11 @@ def prepare_timeseries_data(
         df[value_col] = df[value_col] / 5.0
 
     df[value_col] = df[value_col].clip(lower=0.0, upper=1.0)
-    df = df.set_index(time_col)
-    df = df.sort_index()
     
-    # Resample to hourly if needed
-    ts = df[value_col].resample('H').mean()
+    # Hourly means over non-empty hours only, then one reindex to an evenly spaced series for SARIMAX
+    hours = df[time_col].dt.floor('h')
+    ts = df[value_col].groupby(hours).mean()
+    ts = ts.reindex(pd.date_range(ts.index.min(), ts.index.max(), freq='h', name=time_col))
     ts = ts.ffill().fillna(0.0)
     
     return ts
@@ -75,14 +91,19 @@ def find_optimal_parameters(
     max_p: int = 3,
     max_d: int = 2,
     max_q: int = 3,
-    seasonal_period: int = 24
+    seasonal_period: int = 24,
+    n_jobs: int = -1
 ) -> Tuple[int, int, int, int, int, int, int]:
     """
     Find optimal SARIMAX parameters using AIC.
     
+    Uses pmdarima's stepwise search when installed, otherwise fits the
+    (p, q, P, Q) grid with differencing orders fixed by unit-root tests.
+    
     Args:
         ts: Time series data
         max_p, max_d, max_q: Maximum values for p, d, q parameters
+        n_jobs: Worker processes for the grid search (joblib, -1 = all cores)
     
     Returns:
         Tuple of (p, d, q, P, D, Q, s) parameters
@@ -91,35 +112,138 @@ def find_optimal_parameters(
     if seasonal_period < 1:
         seasonal_period = 1
 
-    best_aic = np.inf
-    best_params = None
+    # Convergence/frequency warnings are expected while searching; keep them out of the log
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        if PMDARIMA_AVAILABLE:
+            params = _stepwise_parameters(ts, max_p, max_d, max_q, seasonal_period)
+            if params:
+                return params
+
+        # Fix differencing orders up front with unit-root tests, then search (p, q, P, Q)
+        d_values, D_values = _differencing_orders(ts, max_d, seasonal_period)
+    
+    # Try different parameter combinations; fits are independent, so run them in parallel
+    grid = list(itertools.product(
+        range(max_p + 1), d_values, range(max_q + 1), range(2), D_values, range(2)
+    ))
+    if JOBLIB_AVAILABLE:
+        aics = Parallel(n_jobs=n_jobs, backend='loky')(
+            delayed(_fit_aic)(ts, combo, seasonal_period) for combo in grid
+        )
+    else:
+        aics = [_fit_aic(ts, combo, seasonal_period) for combo in grid]
     
-    # Try different parameter combinations
-    for p in range(max_p + 1):
-        for d in range(max_d + 1):
-            for q in range(max_q + 1):
-                for P in range(2):
-                    for D in range(2):
-                        for Q in range(2):
-                            try:
-                                model = SARIMAX(
-                                    ts,
-                                    order=(p, d, q),
-                                    seasonal_order=(P, D, Q, seasonal_period),  # 24-hour seasonality
-                                    enforce_stationarity=False,
-                                    enforce_invertibility=False
-                                )
-                                fitted_model = model.fit(disp=False, maxiter=50)
-                                
-                                if fitted_model.aic < best_aic:
-                                    best_aic = fitted_model.aic
-                                    best_params = (p, d, q, P, D, Q, seasonal_period)
-                            except:
-                                continue
+    # First combination with the lowest AIC, same as the sequential scan
+    best_params = None
+    best_aic = np.inf
+    for combo, aic in zip(grid, aics):
+        if aic is not None and aic < best_aic:
+            best_aic = aic
+            best_params = (*combo, seasonal_period)
     
     return best_params if best_params else (1, 1, 1, 0, 1, 1, seasonal_period)
 
 
+def _differencing_orders(
+    ts: pd.Series,
+    max_d: int,
+    seasonal_period: int
+) -> Tuple[List[int], List[int]]:
+    """
+    Candidate (d, D) values for the grid search.
+    
+    d comes from the ADF test (pmdarima ndiffs, or repeated statsmodels
+    adfuller). D comes from the OCSB test when pmdarima is installed;
+    otherwise both D values are searched.
+    """
+    if PMDARIMA_AVAILABLE:
+        try:
+            d = int(ndiffs(ts, test='adf', max_d=max_d))
+            D = int(nsdiffs(ts, m=seasonal_period, max_D=1, test='ocsb')) if seasonal_period > 1 else 0
+            return [d], [D]
+        except Exception:
+            pass
+    
+    d = 0
+    series = ts.to_numpy(dtype=np.float64)
+    try:
+        while d < max_d and np.ptp(series) > 0 and adfuller(series, autolag='AIC')[1] >= 0.05:
+            series = np.diff(series)
+            d += 1
+    except Exception:
+        return list(range(max_d + 1)), [0, 1]
+    return [d], [0, 1]
+
+
+def _fit_aic(
+    ts: pd.Series,
+    combo: Tuple[int, int, int, int, int, int],
+    seasonal_period: int
+) -> Optional[float]:
+    """Fit one SARIMAX grid point and return its AIC, or None if the fit fails."""
+    p, d, q, P, D, Q = combo
+    try:
+        # Scoped here rather than in the caller: the fit may run in a joblib worker
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            model = SARIMAX(
+                ts,
+                order=(p, d, q),
+                seasonal_order=(P, D, Q, seasonal_period),  # 24-hour seasonality
+                enforce_stationarity=False,
+                enforce_invertibility=False
+            )
+            fitted_model = model.fit(disp=False, maxiter=50)
+        return float(fitted_model.aic)
+    except Exception:
+        return None
+
+
+def _stepwise_parameters(
+    ts: pd.Series,
+    max_p: int,
+    max_d: int,
+    max_q: int,
+    seasonal_period: int
+) -> Optional[Tuple[int, int, int, int, int, int, int]]:
+    """
+    Hyndman-Khandakar stepwise search (pmdarima auto_arima) over the same
+    bounds as the grid search, selecting by AIC.
+    
+    Returns:
+        Tuple of (p, d, q, P, D, Q, s) parameters, or None if the search fails
+    """
+    try:
+        model = auto_arima(
+            ts,
+            start_p=0,
+            d=None,
+            start_q=0,
+            max_p=max_p,
+            max_d=max_d,
+            max_q=max_q,
+            start_P=0,
+            D=None,
+            start_Q=0,
+            max_P=1,
+            max_D=1,
+            max_Q=1,
+            seasonal=seasonal_period > 1,
+            m=seasonal_period,
+            information_criterion='aic',
+            stepwise=True,
+            suppress_warnings=True,
+            error_action='ignore',
+        )
+    except Exception:
+        return None
+
+    p, d, q = model.order
+    P, D, Q, _ = model.seasonal_order
+    return (p, d, q, P, D, Q, seasonal_period)
+
+
 def train_sarimax_model(
     data: pd.DataFrame,
     output_path: Optional[Path] = None,
@@ -153,27 +277,35 @@ def train_sarimax_model(
         seasonal_order = params[3:]
     
     # Train model
-    model = SARIMAX(
-        ts,
-        order=order,
-        seasonal_order=seasonal_order,
-        enforce_stationarity=False,
-        enforce_invertibility=False
-    )
-    
-    fitted_model = model.fit(disp=False, maxiter=100)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        model = SARIMAX(
+            ts,
+            order=order,
+            seasonal_order=seasonal_order,
+            enforce_stationarity=False,
+            enforce_invertibility=False
+        )
+        
+        fitted_model = model.fit(disp=False, maxiter=100)
     
-    # Save model
+    # Save model (joblib compresses the results' NumPy state arrays; plain pickle otherwise)
     if output_path:
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, 'wb') as f:
-            pickle.dump(fitted_model, f)
+        if JOBLIB_AVAILABLE:
+            joblib.dump(fitted_model, output_path, compress=('zlib', 3))
+        else:
+            with open(output_path, 'wb') as f:
+                pickle.dump(fitted_model, f, protocol=pickle.HIGHEST_PROTOCOL)
     
     return fitted_model
 
 
 def load_sarimax_model(model_path: Path) -> SARIMAX:
-    """Load trained SARIMAX model from file."""
+    """Load trained SARIMAX model from file (joblib or plain pickle)."""
+    if JOBLIB_AVAILABLE:
+        # joblib.load also reads plain pickles written by older versions
+        return joblib.load(model_path)
     with open(model_path, 'rb') as f:
         return pickle.load(f)
 